@@ -0,0 +1,650 @@
+import glob, json, os, platform, random, string, tempfile, time, tracemalloc
+from typing import Callable, Iterable, List, Optional, Union
+
+from encoder_interfaces import EncoderFileInterface
+from encoders import AdaptiveHuffman, ContextHuffman, Encoder, Huffman
+from node import Leaf, Inner
+
+
+# Version of the JSON results of the benchmark suite, increased when their fields change.
+RESULTS_VERSION = 1
+
+# Synthetic corpora of the benchmark suite.
+CORPORA = ("uniform", "zipf", "english", "binary")
+
+# Default corpus sizes of the benchmark suite, in bytes.
+SIZES = (1 << 10, 1 << 16, 1 << 20)
+
+# Corpora are generated in blocks of at most this size, repeated to reach larger sizes so that a gigabyte corpus is 
+# generated in about the time of a megabyte one. Repeating a block keeps its symbol frequencies.
+BLOCK_SIZE = 1 << 20
+
+# Letters in order of their frequency in English text, and their frequencies in percent.
+ENGLISH_LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+ENGLISH_FREQUENCIES = (12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.1, 6.0, 4.3, 4.0, 2.8, 2.8, 2.4, 2.4, 2.2, 2.0, 2.0, 1.9, 
+                       1.5, 1.0, 0.8, 0.2, 0.2, 0.1, 0.1)
+
+# Most frequent English words, the first ranks of the English-like corpus vocabulary.
+ENGLISH_WORDS = ("the", "of", "and", "to", "a", "in", "is", "you", "that", "it", "he", "was", "for", "on", "are", "as", 
+                 "with", "his", "they", "I", "at", "be", "this", "have", "from", "or", "one", "had", "by", "word", "but", 
+                 "not", "what", "all", "were", "we", "when", "your", "can", "said", "there", "use", "an", "each", 
+                 "which", "she", "do", "how", "their", "if")
+
+# Encoders compared by the benchmark suite, built from a corpus. Modes building token alphabets or using the string 
+# engine only apply to text corpora.
+MODES = {
+    "table": lambda data: Huffman(data),
+    "string": lambda data: Huffman(data, engine="string", unseen="fill"),
+    "limited": lambda data: Huffman(data, max_code_length=12),
+    "tokens": lambda data: Huffman(data, vocabulary_size=Huffman.VOCABULARY_SIZE),
+    "context": lambda data: ContextHuffman(data),
+    "adaptive": lambda data: AdaptiveHuffman("text" if isinstance(data, str) else "bytes"),
+}
+TEXT_MODES = ("string", "tokens")
+
+# Modes run by default. The string engine is left out, as it takes minutes per megabyte.
+DEFAULT_MODES = ("table", "limited", "tokens", "context", "adaptive")
+
+
+def load_samples(scale:int = 1) -> str:
+    """ Loads and concatenates the sample text files, repeated to reach a usable benchmark size.
+
+    Parameters
+    ----------
+    scale : int
+        Number of times the concatenated samples are repeated.
+
+    Returns
+    -------
+    str
+        The benchmark text.
+    """
+
+    current_folder = os.path.dirname(os.path.abspath(__file__))
+    text = ''
+    for path in sorted(glob.glob(os.path.join(current_folder, "samples", "*.txt"))):
+        with open(path, 'r') as file:
+            text += file.read()
+
+    return text * scale
+
+def measure(function:Callable, *args, repeat:int = 3) -> float:
+    """ Measures the best wall time of a function call over a number of repetitions.
+
+    Parameters
+    ----------
+    function : Callable
+        The function to time.
+    *args
+        The arguments passed to the function.
+    repeat : int
+        The number of repetitions.
+
+    Returns
+    -------
+    float
+        The best wall time in seconds.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def bench_encode(text:str) -> dict:
+    """ Measures the encoding throughput of every Huffman engine on the given text.
+
+    Parameters
+    ----------
+    text : str
+        The text to encode.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each engine to its throughput in MB/s.
+    """
+
+    results = {}
+    for engine in Huffman.ENGINES:
+        encoder = Huffman(text, engine=engine, unseen="fill")
+        seconds = measure(encoder.encode, text)
+        results[engine] = len(text) / seconds / 1e6
+
+    return results
+
+def bench_decode(text:str) -> dict:
+    """ Measures the decoding throughput of every Huffman engine on the given text.
+
+    Parameters
+    ----------
+    text : str
+        The text to encode then decode.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each engine to its throughput in MB/s of decoded text.
+    """
+
+    results = {}
+    for engine in Huffman.ENGINES:
+        encoder = Huffman(text, engine=engine, unseen="fill")
+        byte_content = encoder.encode(text)
+        seconds = measure(encoder.decode, byte_content)
+        results[engine] = len(text) / seconds / 1e6
+
+    return results
+
+def zipf_counts(alphabet_size:int, total:int = 1 << 24) -> dict:
+    """ Generates Zipfian symbol counts over an alphabet of integer symbols.
+
+    Parameters
+    ----------
+    alphabet_size : int
+        The number of symbols.
+    total : int
+        The count of the most frequent symbol.
+
+    Returns
+    -------
+    dict
+        A dictionary that maps each symbol to its count.
+    """
+
+    return {symbol: max(1, total // (symbol + 1)) for symbol in range(alphabet_size)}
+
+def parse_size(size:str) -> int:
+    """ Parses a size in bytes, with an optional K, M or G binary suffix, e.g. "64K" or "1G".
+
+    Parameters
+    ----------
+    size : str
+        The size to parse.
+
+    Returns
+    -------
+    int
+        The size in bytes.
+    """
+
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    size = size.strip().upper().removesuffix('B')
+    if size and size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+
+    return int(size)
+
+def generate_corpus(corpus:str, size:int, seed:int = 0) -> Union[str, bytes]:
+    """ Generates a reproducible synthetic corpus.
+
+    - uniform: printable ASCII characters drawn with equal probabilities.
+    - zipf: printable ASCII characters drawn with Zipfian probabilities, the n-th most frequent being n times less 
+    frequent than the first.
+    - english: words drawn with Zipfian probabilities from a vocabulary of common English words followed by words of 
+    letters drawn with their English frequencies, separated by spaces and punctuation.
+    - binary: bytes drawn with Zipfian probabilities over a shuffled order of the 256 values.
+
+    Parameters
+    ----------
+    corpus : str
+        The kind of corpus, one of CORPORA.
+    size : int
+        The length of the corpus in characters or bytes, all characters being ASCII.
+    seed : int
+        The seed of the random generator.
+
+    Returns
+    -------
+    Union[str, bytes]
+        The corpus, bytes for the binary corpus and a string otherwise.
+    """
+
+    if corpus not in CORPORA:
+        raise ValueError(f"Unknown corpus {corpus}, expected one of {CORPORA}.")
+
+    generator = random.Random(f"{corpus}:{seed}")
+    block_size = min(size, BLOCK_SIZE)
+    printable = string.ascii_letters + string.digits + string.punctuation + " \n"
+
+    if corpus == "uniform":
+        block = ''.join(generator.choices(printable, k=block_size))
+
+    elif corpus == "zipf":
+        alphabet = generator.sample(printable, len(printable))
+        block = ''.join(generator.choices(alphabet, weights=list(zipf_counts(len(alphabet)).values()), k=block_size))
+
+    elif corpus == "english":
+        vocabulary = list(ENGLISH_WORDS)
+        while len(vocabulary) < 5000:
+            length = generator.choices(range(1, 13), weights=(3, 17, 21, 16, 11, 9, 8, 6, 4, 3, 1, 1))[0]
+            vocabulary.append(''.join(generator.choices(ENGLISH_LETTERS, weights=ENGLISH_FREQUENCIES, k=length)))
+
+        weights = list(zipf_counts(len(vocabulary)).values())
+        separators, separator_weights = (' ', ", ", ". ", ".\n"), (85, 7, 6, 2)
+        parts, length = [], 0
+        while length < block_size:
+            # Words are drawn in batches, the random module being much faster at drawing many values at once.
+            words = generator.choices(vocabulary, weights=weights, k=4096)
+            ends = generator.choices(separators, weights=separator_weights, k=4096)
+            batch = ''.join(word + end for word, end in zip(words, ends))
+            parts.append(batch)
+            length += len(batch)
+        block = ''.join(parts)[:block_size]
+
+    else:
+        alphabet = generator.sample(range(256), 256)
+        block = bytes(generator.choices(alphabet, weights=list(zipf_counts(256).values()), k=block_size))
+
+    if block_size == 0:
+        return block
+
+    repeats, remainder = divmod(size, block_size)
+    return block * repeats + block[:remainder]
+
+def measure_peak(function:Callable, *args) -> tuple:
+    """ Measures the peak memory allocated by a function call, above the memory allocated before the call. Tracing 
+    allocations slows calls down, so this is measured apart from their time.
+
+    Parameters
+    ----------
+    function : Callable
+        The function to measure.
+    *args
+        The arguments passed to the function.
+
+    Returns
+    -------
+    tuple
+        The result of the call and its peak memory in bytes.
+    """
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = function(*args)
+        return result, tracemalloc.get_traced_memory()[1] - baseline
+
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+def bench_corpus(data:Union[str, bytes], mode:str, repeat:int = 3, memory:bool = True) -> dict:
+    """ Measures the training time, the encoding and decoding throughput, the peak memory and the compression ratio of 
+    an encoder mode on a corpus.
+
+    Parameters
+    ----------
+    data : Union[str, bytes]
+        The corpus.
+    mode : str
+        The encoder mode, one of MODES.
+    repeat : int
+        The number of repetitions of each measure, the best time being kept.
+    memory : bool
+        Whether to measure the peak memory of each stage, in an extra traced run.
+
+    Returns
+    -------
+    dict
+        The measures: seconds to build the encoder, encoding and decoding throughput in MB/s of the corpus encoded in 
+        UTF-8, peak memory in bytes of each stage (None if not measured), compressed to original size ratio and whether 
+        the decoded corpus matches the original one.
+    """
+
+    size = len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+    build = MODES[mode]
+
+    init_seconds = measure(build, data, repeat=repeat)
+    encoder = build(data)
+    encode_seconds = measure(encoder.encode, data, repeat=repeat)
+    byte_content = encoder.encode(data)
+    decode_seconds = measure(encoder.decode, byte_content, repeat=repeat)
+    decoded = encoder.decode(byte_content)
+
+    peaks = {"init_peak": None, "encode_peak": None, "decode_peak": None}
+    if memory:
+        traced_encoder, peaks["init_peak"] = measure_peak(build, data)
+        traced_content, peaks["encode_peak"] = measure_peak(traced_encoder.encode, data)
+        _, peaks["decode_peak"] = measure_peak(traced_encoder.decode, traced_content)
+
+    return {
+        "init_seconds": init_seconds,
+        "encode_mbps": size / encode_seconds / 1e6,
+        "decode_mbps": size / decode_seconds / 1e6,
+        **peaks,
+        "ratio": len(byte_content) / max(size, 1),
+        "lossless": decoded == data,
+    }
+
+def run_suite(corpora:Iterable[str] = CORPORA, sizes:Iterable[int] = SIZES, modes:Iterable[str] = DEFAULT_MODES, 
+              repeat:int = 3, seed:int = 0, memory:bool = True, report:Optional[Callable[[dict], None]] = None) -> dict:
+    """ Runs every encoder mode on every synthetic corpus and size.
+
+    Parameters
+    ----------
+    corpora : Iterable[str]
+        The corpora to generate, see generate_corpus.
+    sizes : Iterable[int]
+        The corpus sizes in bytes.
+    modes : Iterable[str]
+        The encoder modes, see MODES. Text-only modes are skipped on the binary corpus.
+    repeat : int
+        The number of repetitions of each measure.
+    seed : int
+        The seed of the corpora.
+    memory : bool
+        Whether to measure the peak memory of each stage.
+    report : Optional[Callable[[dict], None]]
+        Called with each result as soon as it is measured.
+
+    Returns
+    -------
+    dict
+        The results, along with the version of the results, the settings and the environment they were measured in, 
+        ready to be saved as JSON.
+    """
+
+    modes = list(modes)
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}, expected one of {tuple(MODES)}.")
+
+    results = []
+    for corpus in corpora:
+        for size in sizes:
+            data = generate_corpus(corpus, size, seed)
+            for mode in modes:
+                if isinstance(data, bytes) and mode in TEXT_MODES:
+                    continue
+
+                result = {"corpus": corpus, "size": size, "mode": mode, **bench_corpus(data, mode, repeat, memory)}
+                results.append(result)
+                if report is not None:
+                    report(result)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare_results(baseline:dict, current:dict, tolerance:float = 0.1) -> List[str]:
+    """ Compares the results of two runs of the suite, matching them by corpus, size and mode.
+
+    Parameters
+    ----------
+    baseline : dict
+        The results of the reference run.
+    current : dict
+        The results of the new run.
+    tolerance : float
+        The relative change of a throughput, a peak memory or the training time tolerated before it is reported, timings 
+        being noisy. Any increase of the ratio and any lost round trip is reported.
+
+    Returns
+    -------
+    List[str]
+        A description of each regression, empty if there is none.
+    """
+
+    reference = {(result["corpus"], result["size"], result["mode"]): result for result in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        key = (result["corpus"], result["size"], result["mode"])
+        if key not in reference:
+            continue
+
+        old, name = reference[key], "{} {} B {}".format(*key)
+        for field in ("encode_mbps", "decode_mbps"):
+            if result[field] < old[field] * (1 - tolerance):
+                regressions.append(f"{name}: {field} {old[field]:.2f} -> {result[field]:.2f}")
+
+        for field in ("init_seconds", "init_peak", "encode_peak", "decode_peak"):
+            if old[field] is not None and result[field] is not None and result[field] > old[field] * (1 + tolerance):
+                regressions.append(f"{name}: {field} {old[field]:.4g} -> {result[field]:.4g}")
+
+        if result["ratio"] > old["ratio"] + 1e-9:
+            regressions.append(f"{name}: ratio {old['ratio']:.4f} -> {result['ratio']:.4f}")
+
+        if old["lossless"] and not result["lossless"]:
+            regressions.append(f"{name}: decoded corpus differs from the original")
+
+    return regressions
+
+def save_results(results:dict, path:str) -> None:
+    """ Saves the results of the suite as JSON.
+
+    Parameters
+    ----------
+    results : dict
+        The results of run_suite.
+    path : str
+        The path to the JSON file.
+
+    Returns
+    -------
+    None
+    """
+
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+def load_results(path:str) -> dict:
+    """ Loads results of the suite saved as JSON.
+
+    Parameters
+    ----------
+    path : str
+        The path to the JSON file.
+
+    Returns
+    -------
+    dict
+        The results.
+    """
+
+    with open(path, 'r') as file:
+        results = json.load(file)
+
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version {results.get('version')}.")
+
+    return results
+
+def format_result(result:dict) -> str:
+    """ Formats a result of the suite as a line of text.
+
+    Parameters
+    ----------
+    result : dict
+        A result of run_suite.
+
+    Returns
+    -------
+    str
+        The formatted result.
+    """
+
+    peak = max((result[field] for field in ("init_peak", "encode_peak", "decode_peak") if result[field] is not None), 
+               default=None)
+    memory = f"{peak / 1e6:8.2f} MB" if peak is not None else "       - MB"
+    return (f"{result['corpus']:<8} {result['size']:>11d} B  {result['mode']:<8} init {result['init_seconds'] * 1e3:9.2f} ms"
+            f"  encode {result['encode_mbps']:7.2f} MB/s  decode {result['decode_mbps']:7.2f} MB/s  peak {memory}"
+            f"  ratio {result['ratio']:7.2%}{'' if result['lossless'] else '  MISMATCH'}")
+
+def legacy_build_tree(char_counts:dict) -> Inner:
+    """ Builds the Huffman tree by re-sorting the whole node list after every merge, as Huffman.init used to.
+
+    Parameters
+    ----------
+    char_counts : dict
+        A dictionary that maps symbols to their count.
+
+    Returns
+    -------
+    Inner
+        The root node of the Huffman tree.
+    """
+
+    nodes = sorted([Leaf(char=char, weight=count) for char, count in char_counts.items()], key=lambda x: x.weight)
+    while len(nodes) > 1:
+        nodes.append(Inner(first_child_node=nodes[0], second_child_node=nodes[1]))
+        nodes = sorted(nodes[2::], key=lambda x: x.weight)
+
+    return nodes[0]
+
+def bench_tree(alphabet_sizes:tuple = (256, 4096, 65536), legacy_limit:int = 4096) -> dict:
+    """ Measures the Huffman tree construction time across alphabet sizes.
+
+    Parameters
+    ----------
+    alphabet_sizes : tuple
+        The alphabet sizes to measure.
+    legacy_limit : int
+        The largest alphabet size measured with the legacy builder.
+
+    Returns
+    -------
+    dict
+        A dictionary that maps each (builder, alphabet size) pair to its time in seconds.
+    """
+
+    results = {}
+    for alphabet_size in alphabet_sizes:
+        char_counts = zipf_counts(alphabet_size)
+        results[("heap", alphabet_size)] = measure(Huffman.build_tree, char_counts)
+        if alphabet_size <= legacy_limit:
+            results[("legacy", alphabet_size)] = measure(legacy_build_tree, char_counts, repeat=1)
+
+    return results
+
+def bench_compress_workers(text:str, workers:tuple = (1, 2, 4, 8), chunk_size:int = 1 << 20) -> dict:
+    """ Measures the compression throughput of a text file for an increasing number of worker processes.
+
+    Parameters
+    ----------
+    text : str
+        The text to write to a temporary file and compress.
+    workers : tuple
+        The numbers of worker processes to measure.
+    chunk_size : int
+        The number of characters per block.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each number of workers to its throughput in MB/s.
+    """
+
+    interface = EncoderFileInterface(Huffman(text))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "input.txt")
+        save_path = os.path.join(directory, "output.bin")
+        with open(file_path, 'w') as file:
+            file.write(text)
+
+        for worker_count in workers:
+            seconds = measure(interface.compress, file_path, save_path, chunk_size, worker_count, repeat=1)
+            results[worker_count] = len(text) / seconds / 1e6
+
+    return results
+
+def bench_extract_workers(text:str, workers:tuple = (1, 2, 4, 8), chunk_size:int = 1 << 20) -> dict:
+    """ Measures the extraction throughput of a compressed text file for an increasing number of worker processes.
+
+    Parameters
+    ----------
+    text : str
+        The text to compress into a temporary file and extract.
+    workers : tuple
+        The numbers of worker processes to measure.
+    chunk_size : int
+        The number of characters per block.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each number of workers to its throughput in MB/s of extracted text.
+    """
+
+    interface = EncoderFileInterface(Huffman(text))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "input.txt")
+        compressed_path = os.path.join(directory, "compressed.bin")
+        save_path = os.path.join(directory, "output.txt")
+        with open(file_path, 'w') as file:
+            file.write(text)
+        interface.compress(file_path, compressed_path, chunk_size)
+
+        for worker_count in workers:
+            seconds = measure(interface.extract, compressed_path, save_path, chunk_size, worker_count, repeat=1)
+            results[worker_count] = len(text) / seconds / 1e6
+
+    return results
+
+def bench_length_limits(text:str, limits:tuple = (None, 15, 12, 10, 8)) -> dict:
+    """ Measures the compression ratio loss and the decoding throughput gain of length-limited codes. Codes no longer 
+    than Huffman.LOOKUP_BITS are decoded in a single table lookup.
+
+    Parameters
+    ----------
+    text : str
+        The text to train on, encode then decode.
+    limits : tuple
+        The maximum code lengths to measure, None for unbounded codes.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each limit to the longest code, the compression ratio and the decoding throughput in MB/s.
+    """
+
+    results = {}
+    for limit in limits:
+        encoder = Huffman(text, max_code_length=limit)
+        byte_content = encoder.encode(text)
+        seconds = measure(encoder.decode, byte_content)
+        results[limit] = (encoder.max_code_length, len(byte_content) / len(text.encode("utf-8")), len(text) / seconds / 1e6)
+
+    return results
+
+
+if __name__ == "__main__":
+    for scale in (10, 100):
+        text = load_samples(scale)
+        for engine, throughput in bench_encode(text).items():
+            print(f"encode  {len(text) / 1e6:8.2f} MB  {engine:<8} {throughput:8.2f} MB/s")
+        for engine, throughput in bench_decode(text).items():
+            print(f"decode  {len(text) / 1e6:8.2f} MB  {engine:<8} {throughput:8.2f} MB/s")
+
+    text = load_samples(3000)
+    for worker_count, throughput in bench_compress_workers(text, workers=(1, 2, 4, os.cpu_count() or 1)).items():
+        print(f"compress {len(text) / 1e6:7.2f} MB  {worker_count:2d} workers {throughput:8.2f} MB/s")
+    for worker_count, throughput in bench_extract_workers(text, workers=(1, 2, 4, os.cpu_count() or 1)).items():
+        print(f"extract  {len(text) / 1e6:7.2f} MB  {worker_count:2d} workers {throughput:8.2f} MB/s")
+
+    text = load_samples(100)
+    for limit, (length, ratio, throughput) in bench_length_limits(text).items():
+        print(f"limit   {str(limit or '-'):>8}  {length:2d} bits  {ratio:7.2%}  decode {throughput:8.2f} MB/s")
+
+    for (builder, alphabet_size), seconds in bench_tree().items():
+        print(f"tree    {alphabet_size:8d} symbols  {builder:<8} {seconds * 1e3:10.2f} ms")
@@ -0,0 +1,365 @@
+import argparse, glob, json, os, sys
+from typing import List, Optional
+
+from encoders import AdaptiveHuffman, ContextHuffman, Huffman
+from encoder_interfaces import EncoderFileInterface
+from file_operator import FileOperator
+from instrumentation import INSTRUMENTATION, StageTotals
+
+
+# Encoder used when none is given, the same as the one opened by the GUI at startup.
+DEFAULT_ENCODER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves", "default.huf")
+
+# Suffix appended to compressed files, and removed from them when extracted.
+COMPRESSED_SUFFIX = ".bin"
+
+# Corpora and encoder modes of the benchmark suite, mirrored from benchmark.py which is only imported to run it.
+CORPORA = ("uniform", "zipf", "english", "binary")
+MODES = ("table", "string", "limited", "tokens", "context", "adaptive")
+DEFAULT_MODES = ("table", "limited", "tokens", "context", "adaptive")
+
+
+def expand_paths(patterns:List[str]) -> List[str]:
+    """ Expands glob patterns into the sorted list of matching files, so that batch jobs also work from shells that do
+    not expand them. Patterns without wildcards are kept as is, including '-' for the standard streams.
+
+    Parameters
+    ----------
+    patterns : List[str]
+        The paths and glob patterns given on the command line.
+
+    Returns
+    -------
+    List[str]
+        The paths to process.
+    """
+
+    paths = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+            if not matches:
+                raise FileNotFoundError(f"No file matches {pattern}.")
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+
+    return paths
+
+def target_path(path:str, output:Optional[str], directory:Optional[str], extract:bool) -> str:
+    """ Returns the path to write the result of a job to. Compressed files get the compressed suffix appended, which
+    extracted files get removed.
+
+    Parameters
+    ----------
+    path : str
+        The path to the input file.
+    output : Optional[str]
+        The output path given on the command line, for single inputs.
+    directory : Optional[str]
+        The output directory given on the command line, for batch jobs. Defaults to the input directory.
+    extract : bool
+        Whether the job is an extraction.
+
+    Returns
+    -------
+    str
+        The path to the output file.
+    """
+
+    if output:
+        return output
+
+    name = os.path.basename(path)
+    if not extract:
+        name += COMPRESSED_SUFFIX
+    elif name.endswith(COMPRESSED_SUFFIX):
+        name = name[:-len(COMPRESSED_SUFFIX)]
+    else:
+        raise ValueError(f"Cannot derive the extracted name of {path}, please give an output path.")
+
+    return os.path.join(directory or os.path.dirname(path), name)
+
+def load_interface(path:str, adaptive:Optional[str] = None) -> EncoderFileInterface:
+    """ Opens an encoder from a code lengths or json file, or creates an adaptive encoder.
+
+    Parameters
+    ----------
+    path : str
+        The path to the encoder file.
+    adaptive : Optional[str]
+        The alphabet of the adaptive encoder to use instead of the encoder file, "text" or "bytes".
+
+    Returns
+    -------
+    EncoderFileInterface
+        The interface to the opened encoder.
+    """
+
+    if adaptive:
+        return EncoderFileInterface(AdaptiveHuffman(adaptive))
+
+    interface = EncoderFileInterface(Huffman())
+    interface.open_encoder(path)
+    return interface
+
+def train(args:argparse.Namespace) -> None:
+    """ Generates an encoder from a file and saves it.
+    """
+
+    if args.context and args.tokens is not None:
+        raise ValueError("Context encoders code characters or bytes, not tokens.")
+
+    if args.context:
+        interface = EncoderFileInterface(ContextHuffman())
+        interface.new_encoder(args.source, max_code_length=args.max_code_length)
+    else:
+        interface = EncoderFileInterface(Huffman())
+        interface.new_encoder(args.source, max_code_length=args.max_code_length, vocabulary_size=args.tokens)
+
+    output = args.output or os.path.splitext(os.path.basename(args.source))[0] + ".huf"
+    interface.save_encoder(output)
+    print(f"{output}: {len(interface.encoder.code_lengths)} {'tables' if args.context else 'symbols'}, "
+          f"{interface.encoder.max_code_length} bits at most, fingerprint {interface.encoder.fingerprint().hex()}",
+          file=sys.stderr)
+
+def compress(args:argparse.Namespace) -> None:
+    """ Compresses files, or the standard input into the standard output.
+    """
+
+    interface = load_interface(args.encoder, args.adaptive)
+    binary = interface.encoder.alphabet == "bytes"
+    paths = expand_paths(args.inputs)
+
+    if args.two_pass and (paths == ["-"] or args.output == "-"):
+        raise ValueError("Two-pass compression reads its input twice and needs files.")
+
+    if paths == ["-"]:
+        if not binary:
+            sys.stdin.reconfigure(encoding="utf-8", newline='')
+        source = sys.stdin.buffer if binary else sys.stdin
+        if args.output in (None, "-"):
+            interface.compress_stream(source, sys.stdout.buffer, args.chunk_size, args.workers)
+            sys.stdout.flush()
+        else:
+            with open(args.output, "wb") as target:
+                interface.compress_stream(source, target, args.chunk_size, args.workers)
+        return
+
+    if args.output and len(paths) > 1:
+        raise ValueError("An output path can only be given for a single input, use --directory for batch jobs.")
+
+    if args.output == "-":
+        with open(paths[0], "rb" if binary else 'r', encoding=None if binary else "utf-8", 
+                  newline=None if binary else '') as source:
+            interface.compress_stream(source, sys.stdout.buffer, args.chunk_size, args.workers)
+        return
+
+    if args.output:
+        interface.compress(paths[0], args.output, args.chunk_size, args.workers, args.two_pass)
+        return
+
+    report = interface.compress_batch(paths, args.directory, suffix=COMPRESSED_SUFFIX, chunk_size=args.chunk_size, 
+                                      workers=args.workers, threads=args.threads, two_pass=args.two_pass)
+    for file in report.files:
+        if file.error is None:
+            print(f"{file.path} -> {file.save_path}: {file.ratio:.1%}", file=sys.stderr)
+        else:
+            print(f"{file.path}: {file.error}", file=sys.stderr)
+
+    print(f"{len(report.files) - len(report.failures)} files, {report.original_size / 1e6:.2f} MB, {report.ratio:.1%}, "
+          f"{report.throughput:.2f} MB/s", file=sys.stderr)
+
+    if report.failures:
+        raise RuntimeError(f"{len(report.failures)} files failed to compress.")
+
+def extract(args:argparse.Namespace) -> None:
+    """ Extracts files, or the standard input into the standard output.
+    """
+
+    interface = load_interface(args.encoder, args.adaptive)
+    binary = interface.encoder.alphabet == "bytes"
+    paths = expand_paths(args.inputs)
+    if not binary:
+        sys.stdout.reconfigure(encoding="utf-8", newline='')
+    target = sys.stdout.buffer if binary else sys.stdout
+
+    if paths == ["-"]:
+        if args.output in (None, "-"):
+            interface.extract_stream(sys.stdin.buffer, target)
+            target.flush()
+        else:
+            with open(args.output, "wb" if binary else 'w', encoding=None if binary else "utf-8", 
+                      newline=None if binary else '') as file:
+                interface.extract_stream(sys.stdin.buffer, file)
+        return
+
+    if args.output and len(paths) > 1:
+        raise ValueError("An output path can only be given for a single input, use --directory for batch jobs.")
+
+    for path in paths:
+        save_path = target_path(path, args.output, args.directory, extract=True)
+        if save_path == "-":
+            with open(path, "rb") as source:
+                interface.extract_stream(source, target)
+            target.flush()
+            continue
+
+        interface.extract(path, save_path, args.chunk_size, args.workers)
+        print(f"{path} -> {save_path}", file=sys.stderr)
+
+def stats(args:argparse.Namespace) -> None:
+    """ Prints the statistics and codes of an encoder.
+    """
+
+    encoder = load_interface(args.encoder).encoder
+    print(f"alphabet     {encoder.alphabet}")
+    print(f"fingerprint  {encoder.fingerprint().hex()}")
+    if isinstance(encoder, ContextHuffman):
+        print(f"contexts     {len(encoder.contexts)}")
+        # The symbols and codes printed are those of the order-0 table.
+        encoder = encoder.order0
+    print(f"symbols      {len(encoder.code_lengths)}")
+    print(f"max length   {encoder.max_code_length}")
+
+    if args.codes:
+        for char, code in sorted(encoder.char_to_bin_index.items(), key=lambda x: (len(x[1]), x[1])):
+            print(f"{char!r:>8}  {code}")
+
+def bench(args:argparse.Namespace) -> None:
+    """ Measures the encoding and decoding throughput of the Huffman engines on the sample files, or runs the benchmark 
+    suite on synthetic corpora.
+    """
+
+    import benchmark
+
+    if args.suite:
+        report = lambda result: print(benchmark.format_result(result), file=sys.stderr)
+        results = benchmark.run_suite(args.corpora, [benchmark.parse_size(size) for size in args.sizes], args.modes, 
+                                      repeat=args.repeat, seed=args.seed, memory=not args.no_memory, report=report)
+        if args.json == "-":
+            print(json.dumps(results, indent=2))
+        elif args.json:
+            benchmark.save_results(results, args.json)
+
+        if args.baseline:
+            regressions = benchmark.compare_results(benchmark.load_results(args.baseline), results, args.tolerance)
+            for regression in regressions:
+                print(f"regression: {regression}", file=sys.stderr)
+            if regressions:
+                raise RuntimeError(f"{len(regressions)} regressions against {args.baseline}.")
+        return
+
+    text = benchmark.load_samples(args.scale)
+    for engine, throughput in benchmark.bench_encode(text).items():
+        print(f"encode  {len(text) / 1e6:8.2f} MB  {engine:<8} {throughput:8.2f} MB/s")
+    for engine, throughput in benchmark.bench_decode(text).items():
+        print(f"decode  {len(text) / 1e6:8.2f} MB  {engine:<8} {throughput:8.2f} MB/s")
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Builds the command line parser.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The parser of the command line interface.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Huffman encoding without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("train", help="generate an encoder from a file")
+    command.add_argument("source", help="text file for a character encoder, any other file for a byte encoder")
+    command.add_argument("-o", "--output", help="encoder file to save, .huf or .json")
+    command.add_argument("-l", "--max-code-length", type=int, help="maximum code length in bits")
+    command.add_argument("-k", "--tokens", type=int, metavar="SIZE", help="code the given number of most frequent words "
+                         "of a text file as single tokens")
+    command.add_argument("-c", "--context", action="store_true", help="code each symbol with a table of the symbol "
+                         "before it")
+    command.set_defaults(function=train)
+
+    for name, function, help in (("compress", compress, "compress files or the standard input"),
+                                 ("extract", extract, "extract files or the standard input")):
+        command = commands.add_parser(name, help=help)
+        command.add_argument("inputs", nargs='+', help="files or glob patterns, '-' for the standard input")
+        command.add_argument("-e", "--encoder", default=DEFAULT_ENCODER, help="encoder file, .huf or .json")
+        command.add_argument("-a", "--adaptive", choices=AdaptiveHuffman.ALPHABETS, 
+                             help="use an adaptive encoder of the given alphabet instead of an encoder file")
+        command.add_argument("-o", "--output", help="output file for a single input, '-' for the standard output")
+        command.add_argument("-d", "--directory", help="output directory for batch jobs")
+        command.add_argument("-w", "--workers", type=int, default=1, help="number of processes")
+        command.add_argument("--chunk-size", type=int, default=FileOperator.CHUNK_SIZE, help="symbols per block")
+        command.add_argument("--profile", action="store_true", help="print the time spent and the data processed by "
+                             "each stage of the jobs")
+        command.set_defaults(function=function)
+
+    commands.choices["compress"].add_argument("-t", "--threads", type=int, default=4, help="number of threads reading "
+                                              "and writing files in batch jobs")
+    commands.choices["compress"].add_argument("-2", "--two-pass", action="store_true", help="encode each file with a "
+                                              "code built from its own symbol counts, embedded in the compressed file")
+
+    command = commands.add_parser("stats", help="print the statistics of an encoder")
+    command.add_argument("-e", "--encoder", default=DEFAULT_ENCODER, help="encoder file, .huf or .json")
+    command.add_argument("--codes", action="store_true", help="also print the code of every symbol")
+    command.set_defaults(function=stats)
+
+    command = commands.add_parser("bench", help="measure the engines throughput on the sample files")
+    command.add_argument("--scale", type=int, default=10, help="number of copies of the sample files")
+    command.add_argument("-s", "--suite", action="store_true", help="run the benchmark suite on synthetic corpora "
+                         "instead, measuring training time, throughput, peak memory and ratio")
+    command.add_argument("--corpora", nargs='+', default=CORPORA, choices=CORPORA, help="synthetic corpora of the suite")
+    command.add_argument("--sizes", nargs='+', default=["1K", "64K", "1M"], help="corpus sizes of the suite, with an "
+                         "optional K, M or G suffix, up to e.g. 1G")
+    command.add_argument("--modes", nargs='+', default=DEFAULT_MODES, choices=MODES, help="encoders compared by the suite")
+    command.add_argument("--repeat", type=int, default=3, help="repetitions of each measure, the best being kept")
+    command.add_argument("--seed", type=int, default=0, help="seed of the synthetic corpora")
+    command.add_argument("--no-memory", action="store_true", help="skip the traced run measuring the peak memory")
+    command.add_argument("--json", metavar="PATH", help="file to save the suite results to, '-' for the standard output")
+    command.add_argument("--baseline", metavar="PATH", help="results of a previous run, fails on regressions against it")
+    command.add_argument("--tolerance", type=float, default=0.1, help="relative change of the timings and peak memory "
+                         "tolerated against the baseline")
+    command.set_defaults(function=bench)
+
+    return parser
+
+def main(argv:Optional[List[str]] = None) -> int:
+    """ Runs the command line interface.
+
+    Parameters
+    ----------
+    argv : Optional[List[str]]
+        The command line arguments, defaults to sys.argv.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+
+    args = build_parser().parse_args(argv)
+
+    totals = StageTotals() if getattr(args, "profile", False) else None
+    if totals is not None:
+        INSTRUMENTATION.add_listener(totals)
+
+    try:
+        args.function(args)
+
+    except Exception as e:
+        print(f"error: {str(e) or type(e).__name__}", file=sys.stderr)
+        return 1
+
+    finally:
+        if totals is not None:
+            INSTRUMENTATION.remove_listener(totals)
+            print(totals.report(), file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+import struct, zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Tuple, Union
+
+class ContainerFormatError(Exception):
+    """ Exception raised when a compressed file is not a valid container or is corrupted.
+
+    Attributes
+    ----------
+    None
+
+    Methods
+    -------
+    None
+    """
+
+    def __init__(self, message="The compressed file is not a valid container or is corrupted"):
+        """ Initializes the ContainerFormatError class.
+        """
+        super().__init__(message)
+
+@dataclass
+class Block():
+    """ Class to represent the index entry of a compressed block.
+
+    Attributes
+    ----------
+    offset : int
+        The file offset of the block header.
+    symbol_offset : int
+        The number of symbols stored in all previous blocks.
+    symbol_count : int
+        The number of symbols stored in the block.
+    byte_length : int
+        The length of the block payload in bytes.
+    pad_bits : int
+        The number of padding bits at the end of the payload.
+    crc : int
+        The CRC32 of the block payload.
+    """
+
+    offset: int
+    symbol_offset: int
+    symbol_count: int
+    byte_length: int
+    pad_bits: int
+    crc: int
+
+class Container():
+    """ Class to describe the layout of the compressed file container.
+
+    The container starts with a header holding the magic number, the format version, flags, the fingerprint of the
+    encoder that produced it and an optional embedded code table. It is followed by independent, byte aligned blocks,
+    each preceded by its symbol count, payload length, padding bits and CRC32, and terminated by an empty block. The
+    file ends with the block index and a footer holding the original length in symbols. The layout is written strictly
+    sequentially, so that containers can be streamed, while the footer allows readers to seek to any block.
+
+    Attributes
+    ----------
+    MAGIC : bytes
+        The magic number starting every container.
+    FOOTER_MAGIC : bytes
+        The magic number ending every container.
+    VERSION : int
+        The current format version.
+    BYTES_FLAG : int
+        Flag set when the blocks hold a byte alphabet rather than characters.
+    HEADER : struct.Struct
+        Magic, version, flags, fingerprint and embedded table length.
+    BLOCK : struct.Struct
+        Symbol count, payload length, padding bits and CRC32 of a block.
+    INDEX_ENTRY : struct.Struct
+        Block offset, symbol offset, symbol count, payload length, padding bits and CRC32 of an indexed block.
+    FOOTER : struct.Struct
+        Original length, index offset, block count and footer magic.
+
+    Methods
+    -------
+    estimate_size(payload_size:int, block_count:int, table_length:int = 0) -> int
+        Computes an upper bound of the container size.
+    """
+
+    MAGIC = b"HUFZ"
+    FOOTER_MAGIC = b"ZFUH"
+    VERSION = 1
+
+    BYTES_FLAG = 1
+
+    HEADER = struct.Struct(">4sBB8sI")
+    BLOCK = struct.Struct(">IIBI")
+    INDEX_ENTRY = struct.Struct(">QQIIBI")
+    FOOTER = struct.Struct(">QQI4s")
+
+    @staticmethod
+    def estimate_size(payload_size:int, block_count:int, table_length:int = 0) -> int:
+        """ Computes an upper bound of the container size from the total size of the packed blocks.
+
+        Parameters
+        ----------
+        payload_size : int
+            The total size in bytes of the packed blocks, without their padding.
+        block_count : int
+            The number of blocks.
+        table_length : int
+            The length of the code table embedded in the header.
+
+        Returns
+        -------
+        int
+            The upper bound of the container size in bytes.
+        """
+
+        block_overhead = Container.BLOCK.size + Container.INDEX_ENTRY.size + 1
+        return (Container.HEADER.size + table_length + payload_size + block_count * block_overhead 
+                + Container.BLOCK.size + Container.FOOTER.size)
+
+class ContainerWriter():
+    """ Class to serialize a container into byte chunks, independently from where they are written.
+
+    Attributes
+    ----------
+    fingerprint : bytes
+        The fingerprint of the encoder producing the blocks.
+    table : bytes
+        The code table embedded in the header.
+    blocks : List[Block]
+        The index entries of the blocks serialized so far.
+    offset : int
+        The number of bytes serialized so far.
+    symbol_offset : int
+        The number of symbols serialized so far.
+
+    Methods
+    -------
+    header() -> bytes
+        Serializes the container header.
+    block(payload:bytes, symbol_count:int, pad_bits:int) -> bytes
+        Serializes a block.
+    footer() -> bytes
+        Serializes the end block, the block index and the footer.
+    """
+
+    def __init__(self, fingerprint:bytes, table:bytes = b'', flags:int = 0):
+        """ Initializes the ContainerWriter class.
+
+        Parameters
+        ----------
+        fingerprint : bytes
+            The 8 bytes fingerprint of the encoder producing the blocks.
+        table : bytes
+            The code table embedded in the header.
+        flags : int
+            The container flags.
+
+        Returns
+        -------
+        None
+        """
+
+        self.fingerprint = fingerprint
+        self.table = table
+        self.flags = flags
+        self.blocks: List[Block] = []
+        self.offset = 0
+        self.symbol_offset = 0
+
+    def header(self) -> bytes:
+        """ Serializes the container header.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bytes
+            The serialized header.
+        """
+
+        data = Container.HEADER.pack(Container.MAGIC, Container.VERSION, self.flags, self.fingerprint, len(self.table)) + self.table
+        self.offset += len(data)
+        return data
+
+    def block(self, payload:bytes, symbol_count:int, pad_bits:int) -> bytes:
+        """ Serializes a block and records it in the block index.
+
+        Parameters
+        ----------
+        payload : bytes
+            The encoded block.
+        symbol_count : int
+            The number of symbols encoded in the block.
+        pad_bits : int
+            The number of padding bits at the end of the payload.
+
+        Returns
+        -------
+        bytes
+            The serialized block.
+        """
+
+        crc = zlib.crc32(payload)
+        self.blocks.append(Block(self.offset, self.symbol_offset, symbol_count, len(payload), pad_bits, crc))
+
+        data = Container.BLOCK.pack(symbol_count, len(payload), pad_bits, crc) + payload
+        self.offset += len(data)
+        self.symbol_offset += symbol_count
+        return data
+
+    def footer(self) -> bytes:
+        """ Serializes the end block, the block index and the footer.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bytes
+            The serialized end of the container.
+        """
+
+        end = Container.BLOCK.pack(0, 0, 0, 0)
+        index_offset = self.offset + len(end)
+
+        index = b''.join(Container.INDEX_ENTRY.pack(block.offset, block.symbol_offset, block.symbol_count,
+                                                    block.byte_length, block.pad_bits, block.crc)
+                         for block in self.blocks)
+
+        footer = Container.FOOTER.pack(self.symbol_offset, index_offset, len(self.blocks), Container.FOOTER_MAGIC)
+
+        data = end + index + footer
+        self.offset += len(data)
+        return data
+
+class BufferFile():
+    """ Class to read a bytes-like object, such as a memory mapped file, through the file object interface. Reads
+    return zero-copy memoryview slices of the buffer.
+
+    Attributes
+    ----------
+    buffer : memoryview
+        The buffer to read from.
+    position : int
+        The current position in the buffer.
+
+    Methods
+    -------
+    read(size:int = -1) -> memoryview
+        Reads up to size bytes from the current position.
+    seek(offset:int, whence:int = 0) -> int
+        Changes the current position.
+    tell() -> int
+        Returns the current position.
+    """
+
+    def __init__(self, buffer):
+        """ Initializes the BufferFile class.
+
+        Parameters
+        ----------
+        buffer
+            A bytes-like object.
+
+        Returns
+        -------
+        None
+        """
+
+        self.buffer = memoryview(buffer)
+        self.position = 0
+
+    def read(self, size:int = -1) -> memoryview:
+        """ Reads up to size bytes from the current position, or up to the end if size is negative.
+        """
+
+        end = len(self.buffer) if size < 0 else min(self.position + size, len(self.buffer))
+        data = self.buffer[self.position:end]
+        self.position = max(self.position, end)
+        return data
+
+    def seek(self, offset:int, whence:int = 0) -> int:
+        """ Changes the current position, relative to the start (0), the current position (1) or the end (2).
+        """
+
+        self.position = max(0, offset + (0, self.position, len(self.buffer))[whence])
+        return self.position
+
+    def tell(self) -> int:
+        """ Returns the current position.
+        """
+
+        return self.position
+
+class ContainerReader():
+    """ Class to read a container from a binary file object, or from a bytes-like object such as a memory mapped file
+    in which case block payloads are zero-copy memoryview slices.
+
+    Attributes
+    ----------
+    file : Union[BinaryIO, BufferFile]
+        The file object to read from.
+    version : int
+        The format version of the container.
+    flags : int
+        The container flags.
+    fingerprint : bytes
+        The fingerprint of the encoder that produced the container.
+    table : bytes
+        The code table embedded in the header.
+
+    Methods
+    -------
+    is_container(file:Union[BinaryIO, memoryview]) -> bool
+        Checks whether a file object starts with the container magic number.
+    blocks() -> Iterator[Tuple[int, bytes]]
+        Reads the blocks sequentially.
+    read_index() -> Tuple[int, List[Block]]
+        Reads the original length and the block index from the footer.
+    read_block(block:Block) -> bytes
+        Reads and validates the payload of an indexed block.
+    """
+
+    def __init__(self, file:Union[BinaryIO, memoryview]):
+        """ Initializes the ContainerReader class and reads the container header.
+
+        Parameters
+        ----------
+        file : Union[BinaryIO, memoryview]
+            The file object to read from, positioned at the start of the container, or a bytes-like object holding the
+            container.
+
+        Returns
+        -------
+        None
+        """
+
+        self.file = file if hasattr(file, "read") else BufferFile(file)
+
+        header = self.file.read(Container.HEADER.size)
+        if len(header) < Container.HEADER.size:
+            raise ContainerFormatError("The compressed file is truncated.")
+
+        magic, self.version, self.flags, self.fingerprint, table_length = Container.HEADER.unpack(header)
+        if magic != Container.MAGIC:
+            raise ContainerFormatError("The compressed file is not a container.")
+
+        if self.version > Container.VERSION:
+            raise ContainerFormatError(f"Unsupported container version {self.version}.")
+
+        self.table = bytes(self.file.read(table_length))
+
+    @staticmethod
+    def is_container(file:Union[BinaryIO, memoryview]) -> bool:
+        """ Checks whether a file object starts with the container magic number, without moving its position.
+
+        Parameters
+        ----------
+        file : Union[BinaryIO, memoryview]
+            A seekable file object or a bytes-like object.
+
+        Returns
+        -------
+        bool
+            True if the file is a container.
+        """
+
+        if not hasattr(file, "read"):
+            return bytes(file[:len(Container.MAGIC)]) == Container.MAGIC
+
+        position = file.tell()
+        magic = file.read(len(Container.MAGIC))
+        file.seek(position)
+        return magic == Container.MAGIC
+
+    @staticmethod
+    def _check(payload:bytes, byte_length:int, crc:int) -> bytes:
+        """ Validates a block payload against its recorded length and CRC32.
+        """
+
+        if len(payload) < byte_length:
+            raise ContainerFormatError("The compressed file is truncated.")
+
+        if zlib.crc32(payload) != crc:
+            raise ContainerFormatError("A compressed block failed its CRC32 check.")
+
+        return payload
+
+    def blocks(self) -> Iterator[Tuple[int, bytes]]:
+        """ Reads the blocks sequentially from the current position, validating their CRC32. Does not require a
+        seekable file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Iterator[Tuple[int, bytes]]
+            The symbol count and payload of every block.
+        """
+
+        while True:
+            header = self.file.read(Container.BLOCK.size)
+            if len(header) < Container.BLOCK.size:
+                raise ContainerFormatError("The compressed file is truncated.")
+
+            symbol_count, byte_length, _, crc = Container.BLOCK.unpack(header)
+            if symbol_count == 0 and byte_length == 0:
+                return
+
+            yield symbol_count, ContainerReader._check(self.file.read(byte_length), byte_length, crc)
+
+    def read_index(self) -> Tuple[int, List[Block]]:
+        """ Reads the original length and the block index from the footer. Requires a seekable file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Tuple[int, List[Block]]
+            The original length in symbols and the index entries of every block.
+        """
+
+        self.file.seek(-Container.FOOTER.size, 2)
+        original_length, index_offset, block_count, magic = Container.FOOTER.unpack(self.file.read(Container.FOOTER.size))
+        if magic != Container.FOOTER_MAGIC:
+            raise ContainerFormatError("The compressed file is truncated.")
+
+        self.file.seek(index_offset)
+        data = self.file.read(block_count * Container.INDEX_ENTRY.size)
+        blocks = [Block(*entry) for entry in Container.INDEX_ENTRY.iter_unpack(data)]
+
+        return original_length, blocks
+
+    def read_block(self, block:Block) -> bytes:
+        """ Reads and validates the payload of an indexed block. Requires a seekable file.
+
+        Parameters
+        ----------
+        block : Block
+            The index entry of the block.
+
+        Returns
+        -------
+        bytes
+            The block payload.
+        """
+
+        self.file.seek(block.offset + Container.BLOCK.size)
+        return ContainerReader._check(self.file.read(block.byte_length), block.byte_length, block.crc)
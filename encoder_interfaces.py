@@ -1,9 +1,257 @@
-import os
-from typing import Optional
+import asyncio, fnmatch, os, threading, time
+from collections import Counter, deque
+from contextlib import nullcontext
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 from abc import ABC, abstractmethod
 
-from encoders import Encoder
+from container import Block, Container, ContainerFormatError, ContainerReader, ContainerWriter
+from encoders import ContextHuffman, Encoder, Huffman, load_encoder
 from file_operator import FileOperator, PathNoneError
+from instrumentation import DISABLED_PROFILE, INSTRUMENTATION, Instrumentation, Profile
+from registry import EncoderRegistry
+
+
+class JobCancelledError(Exception):
+    """ Exception raised when a compression or extraction is cancelled.
+
+    Attributes
+    ----------
+    None
+
+    Methods
+    -------
+    None
+    """
+
+    def __init__(self, message="The job was cancelled"):
+        """ Initializes the JobCancelledError class.
+        """
+        super().__init__(message)
+
+# Json encoder of earlier versions, which produced raw packed files when no other one was opened.
+LEGACY_ENCODER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves", "default.json")
+
+# Encoder shared by all the blocks handled by a worker process, set once by the pool initializer.
+_worker_encoder: Optional[Encoder] = None
+
+def _init_worker(encoder:Encoder) -> None:
+    """ Initializes a worker process with the encoder shared by all its blocks.
+
+    Parameters
+    ----------
+    encoder: Encoder
+        The encoder to use in the worker process.
+
+    Returns
+    -------
+    None
+    """
+
+    global _worker_encoder
+    _worker_encoder = encoder
+
+def _pack_block(chunk:Union[str, bytes], encoder:Optional[Encoder] = None) -> Tuple[bytes, int]:
+    """ Packs a block in a worker process.
+
+    Parameters
+    ----------
+    chunk: Union[str, bytes]
+        The block to pack.
+    encoder: Optional[Encoder]
+        The encoder to pack with, by default the one the worker was initialized with.
+
+    Returns
+    -------
+    Tuple[bytes, int]
+        The packed block and its number of padding bits.
+    """
+
+    payload, pad_bits = (encoder or _worker_encoder).pack(chunk)
+    return bytes(payload), pad_bits
+
+def _unpack_block(file_path:str, block:Block) -> Union[str, bytes]:
+    """ Reads an indexed block straight from the container file and unpacks it in a worker process.
+
+    Parameters
+    ----------
+    file_path: str
+        The path to the container file.
+    block: Block
+        The index entry of the block.
+
+    Returns
+    -------
+    Union[str, bytes]
+        The decoded block.
+    """
+
+    with open(file_path, "rb") as file:
+        payload = ContainerReader(file).read_block(block)
+
+    return _unpack_payload(payload, block.symbol_count)
+
+def _unpack_payload(payload:bytes, symbol_count:int, encoder:Optional[Encoder] = None) -> Union[str, bytes]:
+    """ Unpacks a block payload in a worker process.
+
+    Parameters
+    ----------
+    payload: bytes
+        The packed block.
+    symbol_count: int
+        The number of symbols stored in the block.
+    encoder: Optional[Encoder]
+        The encoder to unpack with, by default the one the worker was initialized with.
+
+    Returns
+    -------
+    Union[str, bytes]
+        The decoded block.
+    """
+
+    encoder = encoder or _worker_encoder
+    symbols = encoder.join(encoder.unpack(payload, symbol_count))
+    if len(symbols) != symbol_count:
+        raise ContainerFormatError("A compressed block holds fewer symbols than recorded.")
+
+    return symbols
+
+def _open_symbols(path:str, mode:str, binary:bool) -> Union[TextIO, BinaryIO]:
+    """ Opens a file of symbols, as raw bytes for byte alphabets and as UTF-8 text keeping its line endings otherwise, 
+    as FileOperator does.
+
+    Parameters
+    ----------
+    path: str
+        The path to the file.
+    mode: str
+        Either 'r' or 'w'.
+    binary: bool
+        Whether the symbols are bytes.
+
+    Returns
+    -------
+    Union[TextIO, BinaryIO]
+        The opened file.
+    """
+
+    if binary:
+        return open(path, mode + 'b')
+
+    return open(path, mode, encoding="utf-8", newline='')
+
+async def _run_settled(executor:Optional[Executor], func:Callable, *args):
+    """ Runs a function in an executor and returns its result. A cancelled job still waits for the function to return
+    before the cancellation is raised, so that no thread keeps reading or writing the files the job then closes or 
+    removes.
+
+    Parameters
+    ----------
+    executor: Optional[Executor]
+        The executor, None for the default one of the event loop.
+    func: Callable
+        The function to run.
+    *args
+        The arguments of the function.
+
+    Returns
+    -------
+    Any
+        The result of the function.
+    """
+
+    future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    try:
+        return await asyncio.shield(future)
+
+    except asyncio.CancelledError:
+        # A running function cannot be interrupted, further cancellations only wait for it again.
+        while not future.done():
+            try:
+                await asyncio.wait([future])
+            except asyncio.CancelledError:
+                pass
+        raise
+
+
+@dataclass
+class FileReport:
+    """ Dataclass to represent the outcome of the compression of one file of a batch.
+
+    Attributes
+    ----------
+    path : str
+        The path to the compressed file.
+    save_path : str
+        The path to the container.
+    original_size : int
+        The size of the file in bytes.
+    compressed_size : int
+        The size of the container in bytes, 0 if the compression failed.
+    seconds : float
+        The wall time spent on the file.
+    error : Optional[str]
+        The error raised by the compression, None if it succeeded.
+    """
+
+    path: str
+    save_path: str
+    original_size: int = 0
+    compressed_size: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ratio(self) -> float:
+        """ The size of the container relative to the size of the file.
+        """
+        return self.compressed_size / max(self.original_size, 1)
+
+@dataclass
+class BatchReport:
+    """ Dataclass to represent the outcome of a batch compression.
+
+    Attributes
+    ----------
+    files : List[FileReport]
+        The report of every file, in the order of the batch.
+    seconds : float
+        The wall time of the whole batch.
+    """
+
+    files: List[FileReport]
+    seconds: float = 0.0
+
+    @property
+    def failures(self) -> List[FileReport]:
+        """ The reports of the files whose compression failed.
+        """
+        return [report for report in self.files if report.error is not None]
+
+    @property
+    def original_size(self) -> int:
+        """ The total size of the successfully compressed files in bytes.
+        """
+        return sum(report.original_size for report in self.files if report.error is None)
+
+    @property
+    def compressed_size(self) -> int:
+        """ The total size of the containers in bytes.
+        """
+        return sum(report.compressed_size for report in self.files if report.error is None)
+
+    @property
+    def ratio(self) -> float:
+        """ The total size of the containers relative to the total size of the compressed files.
+        """
+        return self.compressed_size / max(self.original_size, 1)
+
+    @property
+    def throughput(self) -> float:
+        """ The aggregate throughput of the batch in MB/s of original data.
+        """
+        return self.original_size / max(self.seconds, 1e-9) / 1e6
 
 
 class EncoderInterface(ABC):
@@ -41,32 +289,51 @@ class EncoderFileInterface(EncoderInterface):
     ----------
     encoder: Encoder
         The encoder to interface with.
+    registry: Optional[EncoderRegistry]
+        The cache of built encoders that opened encoder files and embedded codes are taken from, if any.
+    instrumentation: Instrumentation
+        The listeners of the stage events of the jobs, by default the shared INSTRUMENTATION.
+    legacy_encoder: Optional[Huffman]
+        The encoder last opened from a json file, the only kind raw packed files were produced with.
     
     Methods
     -------
-    new_encoder() -> Optional[str]
+    new_encoder(path:Optional[str], **options) -> Optional[str]
         Generates a new encoder for future compressions and extractions.
     open_encoder(path:Optional[str]) -> Optional[str]
-        Opens an encoder from a json file.
-    save_encoder() -> Optional[str]
-        Saves the currently opened encoding to a json file.
-    compress(file_path:str, save_path:str) -> None
+        Opens an encoder from a code lengths or json file.
+    save_encoder(path:Optional[str]) -> Optional[str]
+        Saves the currently opened encoding to a code lengths or json file.
+    compress(file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1, two_pass:bool = False, ...) -> None
         Compresses a file and saves it to a target file.
-    extract(file_path:str, save_path:str) -> None
+    extract(file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1, ...) -> None
         Extracts a file and saves it to a target file.
+    compress_batch(sources:Union[str, List[str]], save_directory:Optional[str] = None, ...) -> BatchReport
+        Compresses a directory or a list of files concurrently.
+    compress_stream(source:Union[TextIO, BinaryIO], target:BinaryIO, chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1) -> None
+        Compresses a stream into a target stream.
+    extract_stream(source:BinaryIO, target:Union[TextIO, BinaryIO]) -> None
+        Extracts a stream into a target stream.
     """
 
-    def __init__(self, encoder:Encoder):
+    def __init__(self, encoder:Encoder, registry:Optional[EncoderRegistry] = None, 
+                 instrumentation:Optional[Instrumentation] = None):
         self.encoder = encoder
+        self.registry = registry
+        self.instrumentation = instrumentation or INSTRUMENTATION
+        self.legacy_encoder = None
 
         # ***** ENCODING MENU ACTIONS *****
 
-    def new_encoder(self) -> Optional[str]:
+    def new_encoder(self, path:Optional[str] = None, **options) -> Optional[str]:
         """ Generates a new huffman tree and a new corresponding binary encoding for future compressions and extractions.
 
         Parameters
         ----------
-        None
+        path: Optional[str]
+            The path to the file from which to generate the encoder.
+        **options
+            Options of the encoder initialization, e.g. max_code_length.
 
         Returns
         -------
@@ -74,9 +341,11 @@ class EncoderFileInterface(EncoderInterface):
             The name of the generated encoding file.
         """
 
-        # Ask the user for a text file from which generate the new huffman tree.
+        # Ask the user for a file from which generate the new huffman tree. Text files build a character alphabet, any 
+        # other file builds a byte alphabet.
         try:
-            path = FileOperator.browse_files(title="Select File", filetypes=[("Text File", "*.txt")])
+            if path == None:
+                path = FileOperator.browse_files(title="Select File", filetypes=[("Text File", "*.txt"), ("All Files", "*.*")])
 
         except PathNoneError as e:
             return None 
@@ -85,23 +354,56 @@ class EncoderFileInterface(EncoderInterface):
             raise e 
 
         # Generate the new huffman tree.
+        profile = self.instrumentation.profile("train", path)
         try:
-            data = FileOperator.load(path)
-            self.encoder.init(data)
-            save_name = "untitled.json*"
+            with profile.stage("load"):
+                data = FileOperator.load(path, binary=path.split('.')[-1].lower() != "txt")
+            profile.add("load", len(data))
+
+            # A new encoder is built rather than the current one reinitialized, which may be shared by a registry.
+            with profile.stage("tree"):
+                encoder = self._new_encoder()
+                encoder.init(data, **options)
+            profile.add("tree", len(data))
+            self.encoder = encoder
+            save_name = "untitled.huf*"
             
             return save_name
         
         except Exception as e:
             raise e
 
+        finally:
+            profile.finish()
+
+    def _new_encoder(self) -> Encoder:
+        """ Returns an untrained encoder of the kind of the current one.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Encoder
+            The untrained encoder.
+        """
+
+        if isinstance(self.encoder, ContextHuffman):
+            return ContextHuffman()
+
+        if isinstance(self.encoder, Huffman):
+            return Huffman(engine=self.encoder.engine)
+
+        return type(self.encoder)(self.encoder.alphabet)
+
     def open_encoder(self, path:Optional[str] = None) -> Optional[str]:
-        """ Opens an encoder from a json file.
+        """ Opens an encoder from a code lengths (.huf) or json file.
 
         Parameters
         ----------
         path: Optional[str]
-            The path to the json file to open.
+            The path to the code lengths or json file to open.
 
         Returns
         -------
@@ -112,7 +414,7 @@ class EncoderFileInterface(EncoderInterface):
         # Ask the user for the huffman tree json save.
         try:
             if path == None:             
-                path = FileOperator.browse_files(title="Open File", filetypes=[("JSON File", "*.json")])
+                path = FileOperator.browse_files(title="Open File", filetypes=[("Huffman Encoder", "*.huf"), ("JSON File", "*.json")])
         
         except PathNoneError as e:
             return None 
@@ -120,26 +422,50 @@ class EncoderFileInterface(EncoderInterface):
         except Exception as e:
             raise e
 
-        # Load the save into the encoder.
+        # Load the save into the encoder, or take the shared encoder of the registry that skips building its tables.
         try:
             data = FileOperator.load(path)
 
-            save_name = data[0]
-            self.encoder.char_to_bin_index = data[1]
-            self.encoder.bin_to_char_index = data[2]
-            self.encoder.char_percentages = data[3]
+            if self.registry is not None:
+                if isinstance(data, list):
+                    save_name = data[0]
+                    self.encoder = self.registry.load_json(data)
+                    self.legacy_encoder = self.encoder
+                else:
+                    save_name = os.path.basename(path)
+                    self.encoder = self.registry.load(data)
+
+            elif isinstance(data, list):
+                save_name = data[0]
+                # Json saves only hold order-0 encoders.
+                if not isinstance(self.encoder, Huffman):
+                    self.encoder = Huffman()
+                self.encoder.char_to_bin_index = data[1]
+                self.encoder.bin_to_char_index = data[2]
+                self.encoder.char_percentages = data[3]
+                self.encoder.build_tables()
+                self.legacy_encoder = self.encoder
+
+            else:
+                save_name = os.path.basename(path)
+                # Code lengths files hold either kind of encoder, told apart by their magic.
+                encoder_class = ContextHuffman if data[:4] == ContextHuffman.CODE_LENGTHS_MAGIC else Huffman
+                if not isinstance(self.encoder, encoder_class):
+                    self.encoder = encoder_class()
+                self.encoder.load_code_lengths(*self.encoder.deserialize_code_lengths(data))
 
             return save_name
         
         except Exception as e:
             raise e
 
-    def save_encoder(self) -> Optional[str]:
-        """ Saves the currently opened encoding to a json file.
+    def save_encoder(self, path:Optional[str] = None) -> Optional[str]:
+        """ Saves the currently opened encoding to a code lengths (.huf) or json file.
 
         Parameters
         ----------
-        None
+        path: Optional[str]
+            The path to the code lengths or json file to save.
 
         Returns
         -------
@@ -147,12 +473,13 @@ class EncoderFileInterface(EncoderInterface):
             The name of the saved encoding file.
         """
 
-        # Ask the user for the directory in which to save the huffman tree json file.
+        # Ask the user for the directory in which to save the huffman encoder file.
         try:
-            path = FileOperator.browse_save_files(title="Save File As", 
-                                                  defaultextension=".json", 
-                                                  filetypes=[("JSON File", "*.json")],
-                                                  initialfile="untitled")
+            if path == None:
+                path = FileOperator.browse_save_files(title="Save File As", 
+                                                      defaultextension=".huf", 
+                                                      filetypes=[("Huffman Encoder", "*.huf"), ("JSON File", "*.json")],
+                                                      initialfile="untitled")
             
         except PathNoneError as e:
             return None
@@ -160,12 +487,16 @@ class EncoderFileInterface(EncoderInterface):
         except Exception as e:
             raise e
 
-        # Save the huffman encoding in the directory as a json file.
+        # Save the huffman encoding in the directory, as code lengths unless a json file is requested.
         try:
-            data = [os.path.basename(path),
-                    self.encoder.char_to_bin_index,
-                    self.encoder.bin_to_char_index,
-                    self.encoder.char_percentages]
+            if path.split('.')[-1].lower() == "json":
+                data = [os.path.basename(path),
+                        self.encoder.char_to_bin_index,
+                        self.encoder.bin_to_char_index,
+                        self.encoder.char_percentages]
+
+            else:
+                data = self.encoder.serialize_code_lengths(self.encoder.code_lengths, self.encoder.alphabet)
 
             FileOperator.save(path, data)
             save_name = os.path.basename(path)
@@ -177,8 +508,17 @@ class EncoderFileInterface(EncoderInterface):
 
     # ***** COMPRESS AND EXTRACT ACTIONS *****
 
-    def compress(self, file_path:str, save_path:str) -> None:
-        """ Compresses a file and saves it to a target file.
+    def compress(self, file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1, 
+                 two_pass:bool = False, progress:Optional[Callable[[int, int], None]] = None, 
+                 cancel:Optional[threading.Event] = None) -> None:
+        """ Compresses a file and saves it to a target file. The file is streamed chunk by chunk so that memory usage 
+        does not depend on the file size, and each chunk is stored as an independent block of the container. Encoders 
+        with a byte alphabet read any file as raw bytes. With several workers, blocks are encoded concurrently in a 
+        process pool and written in order.
+
+        In two-pass mode, a first pass counts the symbols of the file chunk by chunk and builds the optimal code for 
+        the file itself, whose code lengths are embedded in the container header, and the second pass encodes the file 
+        with it. Only the alphabet of the current encoder is used.
 
         Parameters
         ----------
@@ -186,6 +526,17 @@ class EncoderFileInterface(EncoderInterface):
             The path to the file to compress.
         save_path: str
             The path to the directory to save the compressed file.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+        workers: int
+            The number of processes encoding blocks.
+        two_pass: bool
+            Whether to encode the file with a code built from its own symbol counts.
+        progress: Optional[Callable[[int, int], None]]
+            Called after each chunk with the number of characters or bytes encoded so far and the size of the file.
+        cancel: Optional[threading.Event]
+            Stops the compression at the next chunk once set, raising JobCancelledError and removing the partial 
+            compressed file.
 
         Returns
         -------
@@ -199,18 +550,342 @@ class EncoderFileInterface(EncoderInterface):
         
         else:
             try:
-                # Compress file.
-                data = FileOperator.load(file_path)
-                compressed = self.encoder.encode(data)
-
-                # Save to target path.
-                FileOperator.save(save_path, compressed)
+                self._compress_file(file_path, save_path, chunk_size, workers, two_pass=two_pass, progress=progress, 
+                                    cancel=cancel)
 
             except Exception as e:
                 raise e
 
-    def extract(self, file_path:str, save_path:str) -> None:
-        """ Extracts a file and saves it to a target file.
+    def compress_batch(self, sources:Union[str, List[str]], save_directory:Optional[str] = None, pattern:str = '*', 
+                       suffix:str = ".bin", chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1, threads:int = 4, 
+                       max_in_flight:Optional[int] = None, two_pass:bool = False) -> BatchReport:
+        """ Compresses a directory or a list of files concurrently. Files are read and written by a pool of threads, 
+        while their blocks are encoded by a single process pool shared by the whole batch, so that the encoder is only 
+        sent once to each worker process. At most max_in_flight files are handled at once, which bounds memory usage. 
+        A failing file is recorded in the report without stopping the batch, as is a file whose container would 
+        overwrite the one of an earlier file, e.g. a file of the same name in another directory.
+
+        Parameters
+        ----------
+        sources: Union[str, List[str]]
+            A directory, whose files matching the pattern are compressed recursively, or a list of files.
+        save_directory: Optional[str]
+            The directory to save the containers to, keeping the structure of a source directory. Defaults to the 
+            directory of each file.
+        pattern: str
+            The glob pattern on file names selecting the files of a source directory.
+        suffix: str
+            The suffix appended to the file names to name the containers.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+        workers: int
+            The number of processes encoding blocks, blocks are encoded by the threads themselves for a single worker.
+        threads: int
+            The number of threads reading and writing files.
+        max_in_flight: Optional[int]
+            The maximum number of files handled at once, defaults to twice the number of threads.
+        two_pass: bool
+            Whether to encode each file with a code built from its own symbol counts, the code then being sent along 
+            with every block to the process pool.
+
+        Returns
+        -------
+        BatchReport
+            The report of every file, along with the aggregate size, ratio and throughput.
+        """
+
+        jobs = []
+        if isinstance(sources, str):
+            for folder, _, names in os.walk(sources):
+                for name in sorted(fnmatch.filter(names, pattern)):
+                    path = os.path.join(folder, name)
+                    target_folder = os.path.join(save_directory, os.path.relpath(folder, sources)) if save_directory else folder
+                    jobs.append((path, os.path.join(target_folder, name + suffix)))
+        else:
+            for path in sources:
+                jobs.append((path, os.path.join(save_directory or os.path.dirname(path), os.path.basename(path) + suffix)))
+
+        slots = threading.BoundedSemaphore(max_in_flight or 2 * threads)
+        start = time.perf_counter()
+
+        # With a single worker, no process pool is created and the threads encode the blocks.
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.encoder,))
+        else:
+            pool = nullcontext()
+
+        with pool as executor, ThreadPoolExecutor(max_workers=threads) as io_executor:
+            futures = []
+            targets = {}
+            for path, save_path in jobs:
+                # Concurrent writes to the same container would lose one of the files.
+                target = os.path.normcase(os.path.abspath(save_path))
+                if target in targets:
+                    future = Future()
+                    future.set_result(FileReport(path=path, save_path=save_path, 
+                                                 error=f"PathCollisionError: same target as {targets[target]}"))
+                    futures.append(future)
+                    continue
+                targets[target] = path
+
+                slots.acquire()
+                future = io_executor.submit(self._compress_job, path, save_path, chunk_size, workers, executor, two_pass)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+
+            reports = [future.result() for future in futures]
+
+        return BatchReport(files=reports, seconds=time.perf_counter() - start)
+
+    def _compress_job(self, file_path:str, save_path:str, chunk_size:int, workers:int, 
+                      executor:Optional[Executor], two_pass:bool = False) -> FileReport:
+        """ Compresses one file of a batch and reports its outcome.
+
+        Parameters
+        ----------
+        file_path: str
+            The path to the file to compress.
+        save_path: str
+            The path to save the container to.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+        workers: int
+            The number of processes of the shared pool.
+        executor: Optional[Executor]
+            The process pool shared by the batch, None to encode in the calling thread.
+        two_pass: bool
+            Whether to encode the file with a code built from its own symbol counts.
+
+        Returns
+        -------
+        FileReport
+            The outcome of the compression.
+        """
+
+        report = FileReport(path=file_path, save_path=save_path)
+        start = time.perf_counter()
+
+        writing = False
+        try:
+            report.original_size = os.path.getsize(file_path)
+            os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+            writing = True
+            self._compress_file(file_path, save_path, chunk_size, workers, executor, two_pass)
+            report.compressed_size = os.path.getsize(save_path)
+
+        except Exception as e:
+            if isinstance(e, UnicodeDecodeError):
+                report.error = "FileTypeError: not UTF-8 text, compress it with a byte encoder"
+            else:
+                report.error = f"{type(e).__name__}: {e}"
+
+            # A failed file leaves no partial container behind.
+            if writing and os.path.exists(save_path):
+                os.remove(save_path)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _compress_file(self, file_path:str, save_path:str, chunk_size:int, workers:int, 
+                       executor:Optional[Executor] = None, two_pass:bool = False, 
+                       progress:Optional[Callable[[int, int], None]] = None, cancel:Optional[threading.Event] = None) -> None:
+        """ Compresses a file and saves it to a target file. Byte alphabets read the file through a memory map, and the
+        output is pre-sized from the estimated packed size, the text length being bounded by the file size.
+
+        Parameters
+        ----------
+        file_path: str
+            The path to the file to compress.
+        save_path: str
+            The path to save the container to.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+        workers: int
+            The number of processes encoding blocks.
+        executor: Optional[Executor]
+            A process pool to reuse, by default one is created when there are several workers.
+        two_pass: bool
+            Whether to encode the file with a code built from its own symbol counts.
+        progress: Optional[Callable[[int, int], None]]
+            Called after each chunk of the encoding pass, see compress.
+        cancel: Optional[threading.Event]
+            Stops the compression at the next chunk once set.
+
+        Returns
+        -------
+        None
+        """
+
+        profile = self.instrumentation.profile("compress", file_path)
+        try:
+            if self.encoder.alphabet == "bytes":
+                with FileOperator.map_file(file_path) as data:
+                    symbol_count = len(data)
+                    # Mapped pages are only read once accessed, so their loading is mostly timed as part of encoding.
+                    read_chunks = lambda: profile.timed("load", self._chunk_view(data, chunk_size))
+                    self._write_container(save_path, read_chunks, symbol_count, chunk_size, workers, executor, two_pass, 
+                                          progress, cancel, profile)
+
+            else:
+                symbol_count = os.path.getsize(file_path)
+                # Text alphabets read any file as UTF-8 text, whatever its extension.
+                read_chunks = lambda: profile.timed("load", FileOperator.read_chunks(file_path, chunk_size, text=True))
+                self._write_container(save_path, read_chunks, symbol_count, chunk_size, workers, executor, two_pass, 
+                                      progress, cancel, profile)
+
+        finally:
+            profile.finish()
+
+    def _write_container(self, save_path:str, read_chunks:Callable[[], Iterator[Union[str, bytes]]], symbol_count:int, 
+                         chunk_size:int, workers:int, executor:Optional[Executor], two_pass:bool, 
+                         progress:Optional[Callable[[int, int], None]], cancel:Optional[threading.Event], 
+                         profile:Profile) -> None:
+        """ Compresses the chunks of a file into a container saved to a target file.
+
+        Parameters
+        ----------
+        save_path: str
+            The path to save the container to.
+        read_chunks: Callable[[], Iterator[Union[str, bytes]]]
+            Reads the file chunk by chunk, called once per pass.
+        symbol_count: int
+            The number of characters or bytes of the file, at most.
+        chunk_size: int
+            The number of characters or bytes per chunk.
+        workers: int
+            The number of processes encoding blocks.
+        executor: Optional[Executor]
+            A process pool to reuse.
+        two_pass: bool
+            Whether to encode the file with a code built from its own symbol counts.
+        progress: Optional[Callable[[int, int], None]]
+            Called after each chunk of the encoding pass.
+        cancel: Optional[threading.Event]
+            Stops the compression at the next chunk once set.
+        profile: Profile
+            The profile of the compression.
+
+        Returns
+        -------
+        None
+        """
+
+        encoder = self._train_encoder(read_chunks(), profile) if two_pass else None
+        chunks = self._track(read_chunks(), symbol_count, progress, cancel)
+        size = self._estimate_container_size(symbol_count, chunk_size, encoder)
+        container = profile.timed("pack", self._compress_chunks(chunks, workers, executor, encoder, profile))
+
+        with profile.stage("write"):
+            FileOperator.write_chunks(save_path, container, binary=True, size=size)
+        profile.add("write", profile.size("pack"))
+
+    @staticmethod
+    def _chunk_view(data:memoryview, chunk_size:int) -> Iterator[memoryview]:
+        """ Splits a memory mapped file into zero-copy chunks.
+
+        Parameters
+        ----------
+        data: memoryview
+            The memory mapped file.
+        chunk_size: int
+            The number of bytes per chunk.
+
+        Returns
+        -------
+        Iterator[memoryview]
+            The chunks of the file.
+        """
+
+        return (data[position:position+chunk_size] for position in range(0, len(data), chunk_size))
+
+    @staticmethod
+    def _track(chunks:Iterable[Union[str, bytes]], total:int, progress:Optional[Callable[[int, int], None]] = None, 
+               cancel:Optional[threading.Event] = None) -> Iterator[Union[str, bytes]]:
+        """ Reports the progress of a job after each chunk, and stops it at a chunk boundary once cancelled.
+
+        Parameters
+        ----------
+        chunks: Iterable[Union[str, bytes]]
+            The chunks of the job.
+        total: int
+            The expected number of characters or bytes of all the chunks.
+        progress: Optional[Callable[[int, int], None]]
+            Called after each chunk with the number of characters or bytes so far and the total.
+        cancel: Optional[threading.Event]
+            Raises JobCancelledError before the next chunk once set.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The chunks.
+        """
+
+        done = 0
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                raise JobCancelledError()
+
+            yield chunk
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+
+    def _train_encoder(self, chunks:Iterable[Union[str, bytes]], profile:Profile = DISABLED_PROFILE) -> Huffman:
+        """ Builds the optimal code of a file from its symbol counts, gathered chunk by chunk so that the file is never 
+        held in memory at once. Only the symbols of the file get a code, no longer than the longest code of the current 
+        encoder, e.g. as limited by its max_code_length. Token alphabets select their own vocabulary among the pieces of 
+        the file, of the size of the current vocabulary, and context encoders their own context tables.
+
+        Parameters
+        ----------
+        chunks: Iterable[Union[str, bytes]]
+            The chunks of the file.
+        profile: Profile
+            The profile of the compression, timing the histogram and tree stages.
+
+        Returns
+        -------
+        Huffman
+            The encoder of the file, in the alphabet of the current encoder.
+        """
+
+        tokens = self.encoder.alphabet == "tokens"
+        context = isinstance(self.encoder, ContextHuffman)
+        char_counts = Counter()
+        with profile.stage("histogram"):
+            for chunk in chunks:
+                if context:
+                    # Each chunk is a block, whose first symbol has no context.
+                    char_counts.update(ContextHuffman.pairs(chunk))
+                else:
+                    char_counts.update(Huffman.TOKEN_PATTERN.findall(chunk) if tokens else chunk)
+                profile.add("histogram", len(chunk))
+
+        with profile.stage("tree"):
+            if tokens:
+                char_counts = Huffman.count_tokens(char_counts, len(self.encoder.vocabulary) or Huffman.VOCABULARY_SIZE)
+
+            # An empty file still needs a code table, holding a single symbol.
+            if not char_counts:
+                symbol = '\0' if self.encoder.alphabet != "bytes" else 0
+                char_counts[(None, symbol) if context else symbol] = 0
+
+            # The codes are bounded by the current encoder, unless the file has too many symbols to fit in its lengths. 
+            # Context tables hold an extra fallback symbol.
+            symbol_count = len({symbol for _, symbol in char_counts}) + 1 if context else len(char_counts)
+            max_code_length = max(self.encoder.max_code_length, (symbol_count - 1).bit_length())
+
+            encoder = ContextHuffman() if context else Huffman()
+            encoder.init_counts(char_counts, self.encoder.alphabet, unseen=None, max_code_length=max_code_length)
+        profile.add("tree", profile.size("histogram"))
+        return encoder
+
+    def extract(self, file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE, workers:int = 1, 
+                progress:Optional[Callable[[int, int], None]] = None, cancel:Optional[threading.Event] = None) -> None:
+        """ Extracts a file and saves it to a target file. The file is streamed chunk by chunk so that memory usage 
+        does not depend on the file size. Files that are not containers are decoded as raw packed bits of earlier 
+        versions, with the json encoder that produced them. With several workers, the blocks of a container are located 
+        through its block index and decoded concurrently in a process pool, then written in order.
 
         Parameters
         ----------
@@ -218,6 +893,16 @@ class EncoderFileInterface(EncoderInterface):
             The path to the file to extract.
         save_path: str
             The path to the directory to save the extracted file.
+        chunk_size: int
+            The number of bytes read at once from raw packed files.
+        workers: int
+            The number of processes decoding blocks.
+        progress: Optional[Callable[[int, int], None]]
+            Called after each block of a container with the number of characters or bytes decoded so far and the 
+            original length.
+        cancel: Optional[threading.Event]
+            Stops the extraction at the next block once set, raising JobCancelledError and removing the partial 
+            extracted file.
 
         Returns
         -------
@@ -228,13 +913,553 @@ class EncoderFileInterface(EncoderInterface):
             raise PathNoneError
         
         else:
+            profile = self.instrumentation.profile("extract", file_path)
             try:
-                # Exract file.
-                data = FileOperator.load(file_path)
-                extracted = self.encoder.decode(data)
+                # Exract file and save to target path. The file is read through a memory map, and byte alphabet outputs
+                # are pre-sized to the original length.
+                with FileOperator.map_file(file_path) as data:
+                    if ContainerReader.is_container(data):
+                        reader = ContainerReader(data)
+                        with profile.stage("tree"):
+                            encoder = self._container_encoder(reader)
+                        binary = encoder.alphabet == "bytes"
 
-                # Save to target path.
-                FileOperator.save(save_path, extracted)
+                        original_length, index = reader.read_index()
+                        if workers <= 1:
+                            payloads = profile.timed("load", ((block.symbol_count, reader.read_block(block)) for block in index), 
+                                                     size=lambda block: len(block[1]))
+                            blocks = self._extract_blocks(payloads, encoder)
+                        else:
+                            # Workers read their own blocks, so loading is timed as part of decoding.
+                            blocks = self._extract_indexed_blocks(file_path, index, workers, encoder)
+
+                        blocks = self._track(profile.timed("decode", blocks), original_length, progress, cancel)
+                        with profile.stage("write"):
+                            FileOperator.write_chunks(save_path, blocks, binary=binary, size=original_length if binary else None, 
+                                                      text=not binary)
+
+                    else:
+                        with profile.stage("tree"):
+                            encoder = self._raw_encoder()
+                        binary = encoder.alphabet == "bytes"
+                        profile.add("load", len(data))
+                        with profile.stage("write"):
+                            FileOperator.write_chunks(save_path, profile.timed("decode", encoder.decode_stream([data])), 
+                                                      binary=binary, text=not binary)
+
+                    profile.add("write", profile.size("decode"))
 
             except Exception as e:
-                raise e
\ No newline at end of file
+                raise e
+
+            finally:
+                profile.finish()
+
+    def compress_stream(self, source:Union[TextIO, BinaryIO], target:BinaryIO, chunk_size:int = FileOperator.CHUNK_SIZE, 
+                        workers:int = 1) -> None:
+        """ Compresses a stream, e.g. the standard input, and writes the container to a target stream. The container is 
+        written sequentially so the target does not need to be seekable.
+
+        Parameters
+        ----------
+        source: Union[TextIO, BinaryIO]
+            The stream to compress, a text stream for text alphabets and a binary stream for byte alphabets.
+        target: BinaryIO
+            The binary stream to write the container to.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+        workers: int
+            The number of processes encoding blocks.
+
+        Returns
+        -------
+        None
+        """
+
+        profile = self.instrumentation.profile("compress")
+        try:
+            chunks = profile.timed("load", iter(lambda: source.read(chunk_size), source.read(0)))
+            with profile.stage("write"):
+                for data in profile.timed("pack", self._compress_chunks(chunks, workers, profile=profile)):
+                    target.write(data)
+            profile.add("write", profile.size("pack"))
+
+        finally:
+            profile.finish()
+
+    def extract_stream(self, source:BinaryIO, target:Union[TextIO, BinaryIO]) -> None:
+        """ Extracts a container read from a stream, e.g. the standard input, and writes it to a target stream. The 
+        blocks are read sequentially so the source does not need to be seekable.
+
+        Parameters
+        ----------
+        source: BinaryIO
+            The binary stream to read the container from.
+        target: Union[TextIO, BinaryIO]
+            The stream to write to, a text stream for text alphabets and a binary stream for byte alphabets.
+
+        Returns
+        -------
+        None
+        """
+
+        profile = self.instrumentation.profile("extract")
+        try:
+            reader = ContainerReader(source)
+            with profile.stage("tree"):
+                encoder = self._container_encoder(reader)
+
+            payloads = profile.timed("load", reader.blocks(), size=lambda block: len(block[1]))
+            with profile.stage("write"):
+                for chunk in profile.timed("decode", self._extract_blocks(payloads, encoder)):
+                    target.write(chunk)
+            profile.add("write", profile.size("decode"))
+
+        finally:
+            profile.finish()
+
+    def _raw_encoder(self) -> Huffman:
+        """ Returns the encoder to extract a raw packed file of earlier versions with. Raw files hold no fingerprint, and
+        were only produced by json encoders: the current encoder if it was opened from a json file, the json default 
+        encoder otherwise, as the canonical codes of the other encoders differ from its codes.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Huffman
+            The json encoder.
+        """
+
+        if self.encoder is self.legacy_encoder:
+            return self.encoder
+
+        if not os.path.exists(LEGACY_ENCODER):
+            raise ContainerFormatError("Raw packed files of earlier versions can only be extracted with the json encoder "
+                                       "that produced them.")
+
+        data = FileOperator.load(LEGACY_ENCODER)
+        if self.registry is not None:
+            return self.registry.load_json(data)
+
+        encoder = Huffman()
+        encoder.char_to_bin_index = data[1]
+        encoder.bin_to_char_index = data[2]
+        encoder.char_percentages = data[3]
+        encoder.build_tables()
+        return encoder
+
+    def _container_encoder(self, reader:ContainerReader) -> Encoder:
+        """ Returns the encoder to extract a container with: the code embedded in its header if any, the current 
+        encoder otherwise.
+
+        Parameters
+        ----------
+        reader: ContainerReader
+            The reader of the container.
+
+        Returns
+        -------
+        Encoder
+            The encoder that produced the container.
+        """
+
+        if not reader.table:
+            encoder = self.encoder
+        elif self.registry is not None:
+            encoder = self.registry.load(reader.table)
+        else:
+            encoder = load_encoder(reader.table)
+
+        if reader.fingerprint != encoder.fingerprint():
+            raise ContainerFormatError("The compressed file was produced by another encoder.")
+
+        return encoder
+
+    def _compress_chunks(self, chunks:Iterable[Union[str, bytes]], workers:int = 1, executor:Optional[Executor] = None, 
+                         encoder:Optional[Huffman] = None, profile:Profile = DISABLED_PROFILE) -> Iterator[bytes]:
+        """ Encodes each chunk as an independent block and serializes them into a container.
+
+        Parameters
+        ----------
+        chunks: Iterable[Union[str, bytes]]
+            The chunks to compress.
+        workers: int
+            The number of processes encoding blocks.
+        executor: Optional[Executor]
+            A process pool to reuse, by default one is created when there are several workers.
+        encoder: Optional[Huffman]
+            An encoder trained on the file, whose code lengths are embedded in the container header, by default the 
+            current encoder is used and no table is embedded.
+        profile: Profile
+            The profile of the compression, timing the encode stage.
+
+        Returns
+        -------
+        Iterator[bytes]
+            The serialized container.
+        """
+
+        if encoder is None:
+            writer = ContainerWriter(self.encoder.fingerprint(), flags=self._container_flags())
+        else:
+            table = encoder.serialize_code_lengths(encoder.code_lengths, encoder.alphabet)
+            writer = ContainerWriter(encoder.fingerprint(), table=table, flags=self._container_flags())
+        yield writer.header()
+
+        blocks = profile.timed("encode", self._pack_blocks(chunks, workers, executor, encoder), size=lambda block: block[0])
+        for symbol_count, payload, pad_bits in blocks:
+            yield writer.block(payload, symbol_count, pad_bits)
+
+        yield writer.footer()
+
+    def _container_flags(self) -> int:
+        """ Returns the container flags of the current encoder.
+        """
+
+        return Container.BYTES_FLAG if self.encoder.alphabet == "bytes" else 0
+
+    def _estimate_container_size(self, symbol_count:int, chunk_size:int, encoder:Optional[Huffman] = None) -> int:
+        """ Estimates the size of the container compressing a number of symbols.
+
+        Parameters
+        ----------
+        symbol_count: int
+            The number of symbols to compress.
+        chunk_size: int
+            The number of symbols per block.
+        encoder: Optional[Huffman]
+            An encoder trained on the file, whose code lengths are embedded in the container header, by default the 
+            current encoder.
+
+        Returns
+        -------
+        int
+            The estimated container size in bytes.
+        """
+
+        block_count = -(-symbol_count // chunk_size)
+        if encoder is None:
+            return Container.estimate_size(self.encoder.estimate_size(symbol_count), block_count)
+
+        table_length = len(encoder.serialize_code_lengths(encoder.code_lengths, encoder.alphabet))
+        return Container.estimate_size(encoder.estimate_size(symbol_count), block_count, table_length)
+
+    def _pack_blocks(self, chunks:Iterable[Union[str, bytes]], workers:int = 1, executor:Optional[Executor] = None, 
+                     encoder:Optional[Encoder] = None) -> Iterator[Tuple[int, bytes, int]]:
+        """ Packs each chunk as an independent block, in order. With several workers, the encoder is sent once to each 
+        process of a pool and at most two blocks per worker are in flight, which bounds memory usage.
+
+        Parameters
+        ----------
+        chunks: Iterable[Union[str, bytes]]
+            The chunks to pack.
+        workers: int
+            The number of processes encoding blocks.
+        executor: Optional[Executor]
+            A process pool whose workers were initialized with the current encoder, by default one is created when 
+            there are several workers.
+        encoder: Optional[Encoder]
+            The encoder to pack with, by default the current encoder. It is sent along with every block to a given 
+            process pool, or once to each process of a created one.
+
+        Returns
+        -------
+        Iterator[Tuple[int, bytes, int]]
+            The symbol count, payload and number of padding bits of every block.
+        """
+
+        if executor is None:
+            if workers <= 1:
+                for chunk in chunks:
+                    payload, pad_bits = (encoder or self.encoder).pack(chunk)
+                    yield len(chunk), payload, pad_bits
+                return
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(encoder or self.encoder,)) as executor:
+                yield from self._pack_blocks(chunks, workers, executor)
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            # Memory mapped chunks are copied since memoryviews cannot be sent to other processes.
+            if isinstance(chunk, memoryview):
+                chunk = bytes(chunk)
+
+            pending.append((len(chunk), executor.submit(_pack_block, chunk, encoder)))
+            if len(pending) >= 2 * workers:
+                symbol_count, future = pending.popleft()
+                yield (symbol_count, *future.result())
+
+        while pending:
+            symbol_count, future = pending.popleft()
+            yield (symbol_count, *future.result())
+
+    def _extract_blocks(self, blocks:Iterable[tuple], encoder:Optional[Encoder] = None) -> Iterator[Union[str, bytes]]:
+        """ Decodes the blocks of a container.
+
+        Parameters
+        ----------
+        blocks: Iterable[tuple]
+            The symbol count and payload of every block.
+        encoder: Optional[Encoder]
+            The encoder that produced the container, by default the current encoder.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The decoded blocks.
+        """
+
+        encoder = encoder or self.encoder
+        for symbol_count, payload in blocks:
+            # Counted once joined, since the symbols of token alphabets hold several characters.
+            symbols = encoder.join(encoder.unpack(payload, symbol_count))
+            if len(symbols) != symbol_count:
+                raise ContainerFormatError("A compressed block holds fewer symbols than recorded.")
+
+            yield symbols
+
+    def _extract_indexed_blocks(self, file_path:str, blocks:Iterable[Block], workers:int, 
+                                encoder:Optional[Encoder] = None) -> Iterator[Union[str, bytes]]:
+        """ Decodes the indexed blocks of a container concurrently, in order. Each worker reads its blocks straight from
+        the container file and at most two blocks per worker are in flight, which bounds memory usage.
+
+        Parameters
+        ----------
+        file_path: str
+            The path to the container file.
+        blocks: Iterable[Block]
+            The index entries of the blocks.
+        workers: int
+            The number of processes decoding blocks.
+        encoder: Optional[Encoder]
+            The encoder that produced the container, by default the current encoder.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The decoded blocks.
+        """
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(encoder or self.encoder,)) as executor:
+            pending = deque()
+            for block in blocks:
+                pending.append(executor.submit(_unpack_block, file_path, block))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+
+class AsyncEncoderFileInterface(EncoderInterface):
+    """ Class to represent an asynchronous interface between an asyncio application and an encoder through file 
+    operations. Files are read and written chunk by chunk in threads and blocks are encoded or decoded in an executor, 
+    so that the event loop is never blocked. Jobs can be cancelled between blocks, and at most max_jobs of them run at 
+    once, the others waiting for a slot. A cancelled job waits for its running read, write or block to finish before 
+    cleaning up.
+
+    Attributes
+    ----------
+    interface: EncoderFileInterface
+        The synchronous interface holding the encoder, used to manage encoder files.
+    encoder: Encoder
+        The encoder to interface with.
+    workers: int
+        The number of processes encoding and decoding blocks, 0 to use the default thread pool of the event loop.
+
+    Methods
+    -------
+    compress(file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE) -> None
+        Compresses a file and saves it to a target file.
+    extract(file_path:str, save_path:str) -> None
+        Extracts a file and saves it to a target file.
+    close() -> None
+        Shuts the process pool down.
+    """
+
+    def __init__(self, encoder:Encoder, max_jobs:int = 4, workers:int = 0, registry:Optional[EncoderRegistry] = None):
+        """ Initializes the AsyncEncoderFileInterface class.
+
+        Parameters
+        ----------
+        encoder: Encoder
+            The encoder to interface with.
+        max_jobs: int
+            The maximum number of files compressed or extracted at once.
+        workers: int
+            The number of processes encoding and decoding blocks, 0 to use the default thread pool of the event loop.
+        registry: Optional[EncoderRegistry]
+            The cache of built encoders that embedded codes are taken from, if any.
+
+        Returns
+        -------
+        None
+        """
+
+        self.interface = EncoderFileInterface(encoder, registry)
+        self.workers = workers
+        self._semaphore = asyncio.Semaphore(max_jobs)
+        self._executor = None
+        self._executor_encoder = None
+
+    @property
+    def encoder(self) -> Encoder:
+        """ The encoder to interface with, shared with the synchronous interface.
+        """
+        return self.interface.encoder
+
+    @encoder.setter
+    def encoder(self, encoder:Encoder) -> None:
+        self.interface.encoder = encoder
+
+    async def compress(self, file_path:str, save_path:str, chunk_size:int = FileOperator.CHUNK_SIZE) -> None:
+        """ Compresses a file and saves it to a target file as a container, one block per chunk. A cancelled or failed
+        job removes the partial target file.
+
+        Parameters
+        ----------
+        file_path: str
+            The path to the file to compress.
+        save_path: str
+            The path to the compressed file.
+        chunk_size: int
+            The number of characters or bytes read at once, and stored per block.
+
+        Returns
+        -------
+        None
+        """
+
+        async with self._semaphore:
+            encoder = self.encoder
+            executor, worker_encoder = self._block_executor(encoder)
+
+            writer = ContainerWriter(encoder.fingerprint(), flags=self.interface._container_flags())
+            source = await _run_settled(None, _open_symbols, file_path, 'r', encoder.alphabet == "bytes")
+
+            try:
+                target = await _run_settled(None, open, save_path, "wb")
+                try:
+                    await _run_settled(None, target.write, writer.header())
+                    while True:
+                        chunk = await _run_settled(None, source.read, chunk_size)
+                        if not chunk:
+                            break
+
+                        payload, pad_bits = await _run_settled(executor, _pack_block, chunk, worker_encoder)
+                        await _run_settled(None, target.write, writer.block(payload, len(chunk), pad_bits))
+
+                    await _run_settled(None, target.write, writer.footer())
+
+                except BaseException as e:
+                    target.close()
+                    os.remove(save_path)
+                    raise e
+
+                finally:
+                    target.close()
+
+            finally:
+                source.close()
+
+    async def extract(self, file_path:str, save_path:str) -> None:
+        """ Extracts a container and saves it to a target file, block by block. A cancelled or failed job removes the 
+        partial target file. Raw packed files of earlier versions are not supported.
+
+        Parameters
+        ----------
+        file_path: str
+            The path to the file to extract.
+        save_path: str
+            The path to the extracted file.
+
+        Returns
+        -------
+        None
+        """
+
+        async with self._semaphore:
+            source = await _run_settled(None, open, file_path, "rb")
+
+            try:
+                reader = await _run_settled(None, ContainerReader, source)
+                encoder = self.interface._container_encoder(reader)
+                executor, worker_encoder = self._block_executor(encoder)
+
+                target = await _run_settled(None, _open_symbols, save_path, 'w', encoder.alphabet == "bytes")
+                try:
+                    blocks = reader.blocks()
+                    while True:
+                        block = await _run_settled(None, next, blocks, None)
+                        if block is None:
+                            break
+
+                        symbol_count, payload = block
+                        symbols = await _run_settled(executor, _unpack_payload, payload, symbol_count, worker_encoder)
+                        await _run_settled(None, target.write, symbols)
+
+                except BaseException as e:
+                    target.close()
+                    os.remove(save_path)
+                    raise e
+
+                finally:
+                    target.close()
+
+            finally:
+                source.close()
+
+    def _block_executor(self, encoder:Encoder) -> Tuple[Optional[Executor], Optional[Encoder]]:
+        """ Returns the executor to encode or decode blocks with, and the encoder to send along with each block. The 
+        process pool is created with the current encoder so that it is only sent once to each process, and created 
+        again when the encoder changes. Other encoders, e.g. embedded in containers, are sent with every block.
+
+        Parameters
+        ----------
+        encoder: Encoder
+            The encoder of the job.
+
+        Returns
+        -------
+        Tuple[Optional[Executor], Optional[Encoder]]
+            The executor, None for the default one of the event loop, and the encoder to send, None for the one the 
+            processes were initialized with.
+        """
+
+        if self.workers <= 0:
+            return None, encoder
+
+        if self._executor is None or self._executor_encoder is not self.encoder:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.encoder,))
+            self._executor_encoder = self.encoder
+
+        return self._executor, None if encoder is self.encoder else encoder
+
+    def close(self) -> None:
+        """ Shuts the process pool down, if any.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_encoder = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
@@ -1,9 +1,10 @@
 from collections import Counter
-import string
+from itertools import chain, islice
+import hashlib, heapq, json, re, string, sys
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
-from node import Leaf, Inner
+from node import Node, Leaf, Inner
 
 class EncoderNoneError(Exception):
     """ Exception raised when the encoder value is None. 
@@ -60,6 +61,32 @@ class Encoder(ABC):
         """
         pass
 
+class CodeTable(dict):
+    """ Dictionary that maps characters to their (integer value, bit length) code pair, coding the characters it does 
+    not hold with the escape code followed by their raw code point.
+
+    Attributes
+    ----------
+    escape_code : Tuple[int, int]
+        The code pair of the escape symbol.
+
+    Methods
+    -------
+    None
+    """
+
+    def __init__(self, codes:dict, escape_code:Tuple[int, int]):
+        """ Initializes the CodeTable class.
+        """
+        super().__init__(codes)
+        self.escape_code = escape_code
+
+    def __missing__(self, char:str) -> Tuple[int, int]:
+        """ Returns the escape code followed by the raw code point of an unknown character.
+        """
+        value, length = self.escape_code
+        return (value << Huffman.ESCAPE_BITS) | ord(char), length + Huffman.ESCAPE_BITS
+
 class Huffman(Encoder):
     """ Class to represent a Huffman encoder.
 
@@ -71,6 +98,24 @@ class Huffman(Encoder):
         A dictionary that maps binary values to their corresponding characters.
     char_percentages : dict
         A dictionary that maps characters to their percentage of appearance in the text.
+    char_to_code : dict
+        A dictionary that maps characters to their (integer value, bit length) code pair.
+    lookup_table : list
+        The primary decoding table indexed by the next lookup_bits bits of the stream.
+    lookup_bits : int
+        The number of bits indexing the primary decoding table.
+    max_code_length : int
+        The length of the longest code.
+    engine : str
+        The engine to use, either "table" (bit accumulator and lookup tables) or "string" (legacy bit string). The string 
+        engine only handles encoders without escape code nor tokens, e.g. trained with unseen="fill".
+    code_lengths : dict
+        A dictionary that maps characters to the length of their canonical code.
+    alphabet : str
+        The kind of symbols encoded, either "text" (characters), "bytes" (integers from 0 to 255) or "tokens" (words
+        and characters).
+    vocabulary : set
+        The multi-character tokens of a token alphabet.
     root : Inner
         The root node of the Huffman tree.
     
@@ -82,31 +127,145 @@ class Huffman(Encoder):
         Converts a list type variable that contains a sequence of bytes into a string type variable that contains the corresponding bit representation.
     get_char_percentages(text:str, fill:bool=False) -> dict
         Calculates the percentage of appearance of each character in the given text file.
-    init(text:str) -> None
+    estimate_char_percentages(code_lengths:dict) -> dict
+        Estimates the percentage of appearance of each character from its code length.
+    init(text:Union[str, bytes], max_code_length:Optional[int]=None, unseen:Optional[Union[str, int]]="escape", vocabulary_size:Optional[int]=None) -> None
         Computes the Huffman tree data structure.
-    encode(text:str) -> bytearray
+    init_counts(char_counts:dict, alphabet:str="text", unseen:Optional[Union[str, int]]="escape", max_code_length:Optional[int]=None) -> None
+        Computes the Huffman tree data structure from symbol counts.
+    count_tokens(piece_counts:dict, vocabulary_size:int=VOCABULARY_SIZE) -> Counter
+        Selects the vocabulary of a token alphabet and counts the tokens of a text.
+    split_pieces(pieces:Iterable[str], vocabulary:set) -> list
+        Splits pieces of a text into tokens.
+    tokenize(text:str) -> list
+        Splits a text into the symbols of the token alphabet.
+    build_tree(char_counts:dict) -> Node
+        Builds the Huffman tree from character counts with a binary heap.
+    get_code_lengths(root:Node) -> dict
+        Computes the code length of every character in a single traversal of the Huffman tree.
+    package_merge(char_counts:dict, max_code_length:int) -> dict
+        Computes optimal code lengths bounded by a maximum length.
+    load_code_lengths(code_lengths:dict, alphabet:str="text") -> None
+        Assigns canonical codes from the code length of each character.
+    serialize_code_lengths(code_lengths:dict, alphabet:str="text") -> bytes
+        Serializes code lengths into the compact binary encoder format.
+    deserialize_code_lengths(data:bytes) -> Tuple[dict, str]
+        Parses code lengths from the compact binary encoder format.
+    from_code_lengths(data:bytes) -> Huffman
+        Creates an encoder from serialized code lengths.
+    join(chars:list) -> Union[str, bytes]
+        Joins decoded symbols into a string or bytes depending on the alphabet.
+    build_tables() -> None
+        Builds the integer code tables and the decoding lookup tables from the binary string index.
+    fingerprint() -> bytes
+        Computes a fingerprint identifying the code table.
+    estimate_size(symbol_count:int) -> int
+        Estimates the packed size of a number of symbols.
+    pack(text:Union[str, bytes]) -> Tuple[bytearray, int]
+        Packs the codes of the given text straight into a byte array.
+    unpack(byte_content:bytes, count:Optional[int]=None) -> list
+        Unpacks the characters of the given byte array through the decoding lookup tables.
+    encode_stream(chunks:Iterable[Union[str, bytes]]) -> Iterator[bytes]
+        Encodes a stream of text or byte chunks.
+    decode_stream(chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]
+        Decodes a stream of byte chunks.
+    encode(text:Union[str, bytes]) -> bytearray
         Encodes the given text file into a byte array following the Huffman Encoding method.
-    decode(byte_content:bytes) -> str
-        Decodes the given byte array into a character string following the Huffman coding method.
+    decode(byte_content:bytes) -> Union[str, bytes]
+        Decodes the given byte array into a character string or bytes following the Huffman coding method.
     """
 
-    def __init__(self, text:Optional[str]=None) -> None:
+    ENGINES = ("table", "string")
+
+    ALPHABETS = ("text", "bytes", "tokens")
+
+    # Pieces a text is split into before tokenization: words and punctuation runs with their trailing space, and 
+    # whitespace runs. Together they cover every character.
+    TOKEN_PATTERN = re.compile(r"\w+ ?|[^\w\s]+ ?|\s+")
+
+    # Default number of multi-character tokens of a token alphabet.
+    VOCABULARY_SIZE = 1024
+
+    # Number of characters packed into the bit accumulator before flushing whole bytes.
+    PACK_STEP = 128
+
+    # Width of the primary decoding lookup table, longer codes are resolved through subtables.
+    LOOKUP_BITS = 10
+
+    # Length given to lookup entries that match no code, so that they can never be consumed.
+    MISSING_CODE = 1 << 30
+
+    # Symbol coding the characters of text alphabets that were not seen in the training text, followed by their raw 
+    # code point. The empty string cannot be a character of a text, and sorts before all of them.
+    ESCAPE = ''
+    ESCAPE_BITS = 21
+
+    # Value standing for the escape symbol in serialized code lengths, above every code point.
+    ESCAPE_SYMBOL = 0xFFFFFF
+
+    # Ways of handling the symbols absent from the training text.
+    UNSEEN = ("escape", "fill")
+
+    # Compact binary encoder format: magic, version, alphabet (since version 2), symbol count, then a 3 bytes code point 
+    # or byte value and 1 byte code length per symbol. Token alphabets (since version 4) store the 1 byte length and 
+    # UTF-8 encoding of each token instead of the code point.
+    CODE_LENGTHS_MAGIC = b"HUFC"
+    CODE_LENGTHS_VERSION = 4
+
+    def __init__(self, text:Optional[Union[str, bytes]]=None, engine:str="table", max_code_length:Optional[int]=None, 
+                 unseen:Optional[Union[str, int]]="escape", vocabulary_size:Optional[int]=None) -> None:
         """Initializes the Huffman encoder.
         
         Parameters
         ----------
-        text : str
-            Text to generate the huffman tree from.
+        text : Optional[Union[str, bytes]]
+            Text or bytes to generate the huffman tree from.
+        engine : str
+            The encoding engine to use, either "table" or "string". The string engine needs an encoder without escape 
+            code nor tokens, e.g. trained with unseen="fill".
+        max_code_length : Optional[int]
+            The maximum code length when generating the huffman tree from a text, unbounded by default.
+        unseen : Optional[Union[str, int]]
+            How to handle the symbols absent from the text, see init_counts.
+        vocabulary_size : Optional[int]
+            The number of word tokens of a token alphabet, see init.
         
         Returns
         -------
         None
         """
 
+        if engine not in Huffman.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {Huffman.ENGINES}.")
+
+        self.engine = engine
         self.char_to_bin_index = None
         self.bin_to_char_index = None
+        self.char_to_code = None
+        self.code_lengths = None
+        self.char_percentages = {}
+        self.alphabet = "text"
+        self.vocabulary = set()
         if text is not None:
-            self.init(text=text)
+            self.init(text=text, max_code_length=max_code_length, unseen=unseen, vocabulary_size=vocabulary_size)
+
+    def __getstate__(self) -> dict:
+        """Returns the state to pickle when the encoder is sent to worker processes. The tree is left out since only the
+        code tables are needed once it is built, and deep trees would exceed the pickling recursion limit.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            The encoder state without the tree.
+        """
+
+        state = self.__dict__.copy()
+        state.pop("root", None)
+        return state
 
     @staticmethod
     def bit_to_byte(bin_string: str) -> bytes:
@@ -125,10 +284,10 @@ class Huffman(Encoder):
         """
 
         if len(bin_string) % 8 != 0:
-            bin_string = bin_string + '0' * (len(bin_string) % 8) 
+            bin_string = bin_string + '0' * (-len(bin_string) % 8) 
 
         byte_content = []
-        for chunk_position in range(0, len(bin_string) - 8, 8):
+        for chunk_position in range(0, len(bin_string), 8):
             chunk = bin_string[chunk_position:chunk_position+8]
             byte_content.append(int(chunk, 2)) # Converting the chunk into base 2 integer.
 
@@ -188,102 +347,2141 @@ class Huffman(Encoder):
         # Return the percentage dictionnary sorted in ascending order:
         return dict(sorted(percentage_dict.items(), key=lambda x: x[1]))
 
-    def init(self, text:str) -> None:
+    @staticmethod
+    def estimate_char_percentages(code_lengths:dict) -> dict:
+        """Estimates the percentage of appearance of each character from its code length, for encoders loaded from code 
+        lengths which do not keep the character counts. A code of n bits is optimal for a probability of about 2^-n.
+
+        Parameters
+        ----------
+        code_lengths : dict
+            A dictionary that maps characters to their code length.
+
+        Returns
+        -------
+        dict
+            A dictionnary with each character as the keys and their estimated percentage of appearance as values, 
+            sorted in ascending order.
+        """
+
+        return {char: 100 / (1 << length) for char, length in sorted(code_lengths.items(), key=lambda x: -x[1]) 
+                if char != Huffman.ESCAPE}
+
+    def init(self, text:Union[str, bytes], max_code_length:Optional[int]=None, unseen:Optional[Union[str, int]]="escape", 
+             vocabulary_size:Optional[int]=None) -> None:
         """Computes the Huffman tree data structure. For more details on the logic behind the Huffman tree, see: https://en.wikipedia.org/wiki/Huffman_coding   
+        A text string builds a character alphabet, or a token alphabet when a vocabulary size is given, any bytes-like 
+        object builds a byte alphabet.
 
         Parameters
         ----------
-        text_file : file
-            Text file to compute the huffman tree from. The file must be an opened file of the 'file' type. 
+        text : Union[str, bytes]
+            Text or bytes to compute the huffman tree from.
+        max_code_length : Optional[int]
+            The maximum code length, unbounded by default.
+        unseen : Optional[Union[str, int]]
+            How to handle the symbols absent from the text, see init_counts.
+        vocabulary_size : Optional[int]
+            The number of most frequent words and punctuation runs of a text coded as single tokens, the other 
+            characters keeping their own code. None builds a character alphabet.
 
         Returns
         -------
         None
         """
 
+        if isinstance(text, str) and vocabulary_size is not None:
+            token_counts = Huffman.count_tokens(Counter(Huffman.TOKEN_PATTERN.findall(text)), vocabulary_size)
+            self.init_counts(token_counts, "tokens", unseen=unseen, max_code_length=max_code_length)
+            return
+
+        alphabet = "text" if isinstance(text, str) else "bytes"
+        self.init_counts(Counter(text), alphabet, unseen=unseen, max_code_length=max_code_length)
+
+    def init_counts(self, char_counts:dict, alphabet:str="text", unseen:Optional[Union[str, int]]="escape", 
+                    max_code_length:Optional[int]=None) -> None:
+        """Computes the Huffman tree data structure from symbol counts, e.g. gathered chunk by chunk over a file.
+
+        Parameters
+        ----------
+        char_counts : dict
+            A dictionary that maps characters, or byte values for byte alphabets and tokens for token alphabets, to 
+            their number of appearances.
+        alphabet : str
+            The kind of symbols encoded, either "text", "bytes" or "tokens".
+        unseen : Optional[Union[str, int]]
+            How to handle the symbols absent from the counts. "escape" adds an escape symbol of count 1 to text 
+            and token alphabets, coding any unseen character as the escape code followed by its code point, and gives byte 
+            alphabets a count of 1 for every unseen byte. An integer is the count given to every unseen printable 
+            character or byte. "fill" gives them a count of 0, which used to be the only behaviour but pushes them into 
+            long codes. None only codes the counted symbols.
+        max_code_length : Optional[int]
+            The maximum code length, unbounded by default. When the Huffman tree is deeper, the code lengths are 
+            computed with the package-merge algorithm instead, keeping every code decodable in few table lookups.
+
+        Returns
+        -------
+        None
+        """
+
+        if unseen is not None and unseen not in Huffman.UNSEEN and not (isinstance(unseen, int) and unseen >= 0):
+            raise ValueError(f"Unknown handling of unseen symbols '{unseen}', expected one of {Huffman.UNSEEN} or a count.")
+
         # Huffman Tree: 
-        self.char_percentages = Huffman.get_char_percentages(text, fill=True)
-        nodes = list([Leaf(char=char, probability=self.char_percentages[char]) for char in self.char_percentages])
+        char_counts = Counter(char_counts)
+        total_char_number = max(sum(char_counts.values()), 1)
+
+        if unseen == "escape" and alphabet != "bytes":
+            char_counts[Huffman.ESCAPE] = 1
+        elif unseen is not None:
+            minimum = {"escape": 1, "fill": 0}.get(unseen, unseen)
+            for char in (string.printable if alphabet != "bytes" else range(256)):
+                char_counts.setdefault(char, minimum)
+        self.root = Huffman.build_tree(char_counts)
+
+        # Only the code lengths are kept from the tree, codes are assigned canonically.
+        code_lengths = Huffman.get_code_lengths(self.root)
+        if max_code_length is not None and max(code_lengths.values()) > max_code_length:
+            code_lengths = Huffman.package_merge(char_counts, max_code_length)
+
+        self.load_code_lengths(code_lengths, alphabet)
+
+        # The counts give the actual percentages, replacing those estimated from the code lengths.
+        self.char_percentages = {char: (count / total_char_number) * 100 for char, count in sorted(char_counts.items(), key=lambda x: x[1]) 
+                                 if char != Huffman.ESCAPE}
+
+    @staticmethod
+    def count_tokens(piece_counts:dict, vocabulary_size:int=VOCABULARY_SIZE) -> Counter:
+        """Selects the vocabulary of a token alphabet among the pieces of a text, and counts the tokens the text is 
+        split into with it. The pieces covering the most characters become tokens, the others are split into 
+        characters. Since each piece is always split the same way, the counts are derived from the piece counts 
+        without tokenizing the text again.
+
+        Parameters
+        ----------
+        piece_counts : dict
+            A dictionary that maps the pieces of the text matched by TOKEN_PATTERN to their number of appearances.
+        vocabulary_size : int
+            The maximum number of multi-character tokens.
+
+        Returns
+        -------
+        Counter
+            The number of appearances of every token and character.
+        """
+
+        candidates = [(count * len(piece), piece) for piece, count in piece_counts.items() 
+                      if count > 1 and 1 < len(piece) and len(piece.encode("utf-8")) < 256]
+        vocabulary = {piece for _, piece in heapq.nlargest(vocabulary_size, candidates)}
+
+        token_counts = Counter()
+        for piece, count in piece_counts.items():
+            for token in Huffman.split_pieces((piece,), vocabulary):
+                token_counts[token] += count
+
+        return token_counts
+
+    @staticmethod
+    def split_pieces(pieces:Iterable[str], vocabulary:set) -> list:
+        """Splits pieces of a text into tokens through a dictionary lookup per piece. Pieces of the vocabulary are kept 
+        whole, as are words of the vocabulary followed by a space, and the others fall back to their characters.
+
+        Parameters
+        ----------
+        pieces : Iterable[str]
+            The pieces of the text matched by TOKEN_PATTERN.
+        vocabulary : set
+            The multi-character tokens.
+
+        Returns
+        -------
+        list
+            The tokens and characters of the pieces.
+        """
+
+        tokens = []
+        append, extend = tokens.append, tokens.extend
+
+        for piece in pieces:
+            if piece in vocabulary:
+                append(piece)
+            elif piece[-1] == ' ' and piece[:-1] in vocabulary:
+                append(piece[:-1])
+                append(' ')
+            else:
+                extend(piece)
+
+        return tokens
+
+    def tokenize(self, text:str) -> list:
+        """Splits a text into the symbols of the token alphabet.
+
+        Parameters
+        ----------
+        text : str
+            Text string to split.
+
+        Returns
+        -------
+        list
+            The tokens and characters of the text.
+        """
+
+        return Huffman.split_pieces(Huffman.TOKEN_PATTERN.findall(text), self.vocabulary)
+
+    @staticmethod
+    def build_tree(char_counts:dict) -> Node:
+        """Builds the Huffman tree from character counts with a binary heap, repeatedly merging the two lightest nodes 
+        in O(n log n). Ties are broken by character order, then by merge order, so that the tree is deterministic.
+
+        Parameters
+        ----------
+        char_counts : dict
+            A dictionary that maps characters to their number of appearances.
+
+        Returns
+        -------
+        Node
+            The root node of the Huffman tree.
+        """
+
+        if not char_counts:
+            raise EncoderNoneError
+
+        heap = [(count, order, Leaf(char=char, weight=count)) for order, (char, count) in enumerate(sorted(char_counts.items()))]
+        heapq.heapify(heap)
+        order = len(heap)
+
+        while len(heap) > 1:
+            weight, _, first_child_node = heapq.heappop(heap)
+            other_weight, _, second_child_node = heapq.heappop(heap)
+            heapq.heappush(heap, (weight + other_weight, order, Inner(first_child_node=first_child_node, second_child_node=second_child_node)))
+            order += 1
+
+        return heap[0][2]
+
+    @staticmethod
+    def get_code_lengths(root:Node) -> dict:
+        """Computes the code length of every character in a single depth-first traversal of the Huffman tree. A tree 
+        made of a single leaf gets a 1 bit code.
+
+        Parameters
+        ----------
+        root : Node
+            The root node of the Huffman tree.
+
+        Returns
+        -------
+        dict
+            A dictionary that maps characters to their code length.
+        """
+
+        code_lengths = {}
+        stack = [(root, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+            if isinstance(node, Inner):
+                stack.append((node.second_child_node, depth + 1))
+                stack.append((node.first_child_node, depth + 1))
+            else:
+                code_lengths[node.char] = max(depth, 1)
+
+        return code_lengths
+
+    @staticmethod
+    def package_merge(char_counts:dict, max_code_length:int) -> dict:
+        """Computes optimal code lengths bounded by a maximum length with the package-merge algorithm. For more details,
+        see: https://en.wikipedia.org/wiki/Package-merge_algorithm
+
+        Symbols are sorted by count, then each of max_code_length - 1 rounds pairs up the sorted items of the previous 
+        round into packages and merges them with the symbols. The code length of a symbol is the number of times it 
+        appears in the 2n - 2 lightest items of the last round. Packages only hold references to the two items they 
+        pair, so that counting the appearances is a traversal in O(n * max_code_length).
+
+        Parameters
+        ----------
+        char_counts : dict
+            A dictionary that maps characters to their number of appearances.
+        max_code_length : int
+            The maximum code length, at least enough to give a code to every character.
+
+        Returns
+        -------
+        dict
+            A dictionary that maps characters to their code length.
+        """
+
+        if not char_counts:
+            raise EncoderNoneError
+
+        chars = sorted(char_counts)
+        if len(chars) == 1:
+            return {chars[0]: 1}
+
+        if len(chars) > 1 << max_code_length:
+            raise ValueError(f"{len(chars)} characters do not fit in codes of at most {max_code_length} bits.")
+
+        # Items are (weight, order, content) where content is a character index or a pair of items.
+        symbols = sorted((char_counts[char], index, index) for index, char in enumerate(chars))
+        items = symbols
+        for _ in range(max_code_length - 1):
+            packages = [(items[position][0] + items[position + 1][0], len(chars) + position, (items[position], items[position + 1])) 
+                        for position in range(0, len(items) - 1, 2)]
+            items = list(heapq.merge(symbols, packages))
+
+        lengths = [0] * len(chars)
+        stack = [content for _, _, content in items[:2 * len(chars) - 2]]
+        while stack:
+            content = stack.pop()
+            if isinstance(content, int):
+                lengths[content] += 1
+            else:
+                stack.append(content[0][2])
+                stack.append(content[1][2])
+
+        return {char: length for char, length in zip(chars, lengths)}
+
+    def load_code_lengths(self, code_lengths:dict, alphabet:str="text") -> None:
+        """Assigns canonical codes from the code length of each character: characters are sorted by code length then 
+        by character, and each code is the previous one incremented and shifted to the new length. The code lengths are
+        therefore enough to rebuild both the encoding and the decoding tables.
+
+        Parameters
+        ----------
+        code_lengths : dict
+            A dictionary that maps characters to their code length.
+        alphabet : str
+            The kind of symbols encoded, either "text", "bytes" or "tokens".
+
+        Returns
+        -------
+        None
+        """
 
-        while len(nodes) > 1:
-            nodes.append(Inner(first_child_node=nodes[0], second_child_node=nodes[1]))
-            nodes = sorted(nodes[2::], key=lambda x: x.probability)
-        self.root = nodes[0]
+        if not code_lengths:
+            raise EncoderNoneError
 
-        # Character to Binary index:
+        if alphabet not in Huffman.ALPHABETS:
+            raise ValueError(f"Unknown alphabet '{alphabet}', expected one of {Huffman.ALPHABETS}.")
+
+        self.alphabet = alphabet
+        self.code_lengths = dict(code_lengths)
+        self.vocabulary = {char for char in code_lengths if alphabet == "tokens" and len(char) > 1}
         self.char_to_bin_index = {}
 
-        for char in string.printable:
-            if char not in self.char_to_bin_index:
-                char_to_bin = ''
-                current_node = self.root
-                # As long as base leaf not reached:
-                while isinstance(current_node, Inner):
-                    # Follow tree down and add binary path.
-                    if char in current_node.first_child_node.chars:
-                        current_node = current_node.first_child_node
-                        char_to_bin += str(current_node.binary_id)
-                    else:
-                        current_node = current_node.second_child_node
-                        char_to_bin += str(current_node.binary_id)
-                self.char_to_bin_index[char] = char_to_bin
-    
+        code, previous_length = 0, 0
+        for char, length in sorted(self.code_lengths.items(), key=lambda x: (x[1], x[0])):
+            code <<= length - previous_length
+            self.char_to_bin_index[char] = format(code, f"0{length}b")
+            code += 1
+            previous_length = length
+
         self.bin_to_char_index = {binary: char for char, binary in self.char_to_bin_index.items()}
+        self.char_percentages = Huffman.estimate_char_percentages(self.code_lengths)
+        self.build_tables()
 
-    def encode(self, text:str) -> bytearray:
-        """Encodes the given text file into a byte array following the Huffman Encoding method. For more details on the Huffman Encoding method, see: https://en.wikipedia.org/wiki/Huffman_coding
+    @staticmethod
+    def serialize_code_lengths(code_lengths:dict, alphabet:str="text") -> bytes:
+        """Serializes code lengths into the compact binary encoder format.
 
         Parameters
         ----------
-        text : str
-            Text string to encode. The file must be an opened file of the 'file' type. 
-       
+        code_lengths : dict
+            A dictionary that maps characters to their code length.
+        alphabet : str
+            The kind of symbols encoded, either "text", "bytes" or "tokens".
+
         Returns
         -------
-        bytearray
-            The encoded text file as a sequence of bytes.
+        bytes
+            The serialized code lengths.
+        """
+
+        data = bytearray(Huffman.CODE_LENGTHS_MAGIC)
+        data.append(Huffman.CODE_LENGTHS_VERSION)
+        data.append(Huffman.ALPHABETS.index(alphabet))
+        data += len(code_lengths).to_bytes(4, 'big')
+
+        for char, length in sorted(code_lengths.items()):
+            if alphabet == "tokens":
+                # The escape symbol is the empty token.
+                token = char.encode("utf-8")
+                data.append(len(token))
+                data += token
+            elif char == Huffman.ESCAPE:
+                data += Huffman.ESCAPE_SYMBOL.to_bytes(3, 'big')
+            else:
+                data += (ord(char) if alphabet == "text" else char).to_bytes(3, 'big')
+            data.append(length)
+
+        return bytes(data)
+
+    @staticmethod
+    def deserialize_code_lengths(data:bytes) -> Tuple[dict, str]:
+        """Parses code lengths from the compact binary encoder format. Version 1 data holds text alphabets only.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        Tuple[dict, str]
+            A dictionary that maps characters to their code length, and the alphabet.
+        """
+
+        if data[:4] != Huffman.CODE_LENGTHS_MAGIC:
+            raise ValueError("The data is not a serialized Huffman encoder.")
+
+        version = data[4]
+        if version > Huffman.CODE_LENGTHS_VERSION:
+            raise ValueError(f"Unsupported Huffman encoder version {version}.")
+
+        if version == 1:
+            alphabet, start = "text", 5
+        else:
+            alphabet, start = Huffman.ALPHABETS[data[5]], 6
+
+        count = int.from_bytes(data[start:start+4], 'big')
+        start += 4
+        if len(data) < start + (2 if alphabet == "tokens" else 4) * count:
+            raise ValueError("The serialized Huffman encoder is truncated.")
+
+        code_lengths = {}
+        if alphabet == "tokens":
+            position = start
+            for _ in range(count):
+                end = position + 1 + data[position]
+                if len(data) <= end:
+                    raise ValueError("The serialized Huffman encoder is truncated.")
+                code_lengths[bytes(data[position+1:end]).decode("utf-8")] = data[end]
+                position = end + 1
+            return code_lengths, alphabet
+
+        for position in range(start, start + 4 * count, 4):
+            symbol = int.from_bytes(data[position:position+3], 'big')
+            if symbol == Huffman.ESCAPE_SYMBOL:
+                code_lengths[Huffman.ESCAPE] = data[position+3]
+            else:
+                code_lengths[chr(symbol) if alphabet == "text" else symbol] = data[position+3]
+
+        return code_lengths, alphabet
+
+    @staticmethod
+    def from_code_lengths(data:bytes) -> "Huffman":
+        """Creates an encoder from code lengths in the compact binary encoder format, e.g. embedded in a compressed 
+        file.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        Huffman
+            The encoder using the canonical codes of the code lengths.
+        """
+
+        encoder = Huffman()
+        encoder.load_code_lengths(*Huffman.deserialize_code_lengths(data))
+        return encoder
+
+    def join(self, chars:list) -> Union[str, bytes]:
+        """Joins decoded symbols into a string for text and token alphabets, or into bytes for byte alphabets.
+
+        Parameters
+        ----------
+        chars : list
+            The decoded symbols.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The joined symbols.
+        """
+
+        if self.alphabet == "bytes":
+            return bytes(chars)
+
+        return ''.join(chars)
+
+    def build_tables(self) -> None:
+        """Builds the integer code tables and the decoding lookup tables from the binary string index. Must be called whenever char_to_bin_index is 
+        assigned directly, e.g. when an encoder is loaded from a save file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
         """
 
         if not self.char_to_bin_index:
-            raise EncoderNoneError 
+            raise EncoderNoneError
 
-        bin_encoding = ''
-        for char in text:
-            bin_encoding += self.char_to_bin_index[char]
+        self.char_to_code = {char: (int(binary, 2), len(binary)) for char, binary in self.char_to_bin_index.items()}
+        if Huffman.ESCAPE in self.char_to_code:
+            self.char_to_code = CodeTable(self.char_to_code, self.char_to_code[Huffman.ESCAPE])
+        self.code_lengths = {char: length for char, (_, length) in self.char_to_code.items()}
+        self.max_code_length = max(length for _, length in self.char_to_code.values())
+        self.lookup_bits = min(self.max_code_length, Huffman.LOOKUP_BITS)
 
-        # Converting the binary data into byte arrays.
-        byte_series = Huffman.bit_to_byte(bin_encoding)
-            
-        # Returning the byte array. 
-        return byte_series
-    
-    def decode(self, byte_content:bytes) -> str:
-        """Decodes the given byte array into a character string following the Huffman coding method. For more details on the Huffman Encoding method, see: https://en.wikipedia.org/wiki/Huffman_coding
+        # Primary table indexed by the next lookup_bits bits. Codes longer than lookup_bits share a subtable, flagged 
+        # by a negative length holding the number of extra bits that index it.
+        missing = (None, Huffman.MISSING_CODE)
+        self.lookup_table = [missing] * (1 << self.lookup_bits)
+        long_codes = {}
+
+        for char, (value, length) in self.char_to_code.items():
+            if length <= self.lookup_bits:
+                shift = self.lookup_bits - length
+                start = value << shift
+                for index in range(start, start + (1 << shift)):
+                    self.lookup_table[index] = (char, length)
+            else:
+                prefix = value >> (length - self.lookup_bits)
+                long_codes.setdefault(prefix, []).append((char, value, length))
+
+        for prefix, codes in long_codes.items():
+            extra_bits = max(length for _, _, length in codes) - self.lookup_bits
+            subtable = [missing] * (1 << extra_bits)
+            for char, value, length in codes:
+                shift = self.lookup_bits + extra_bits - length
+                start = (value & ((1 << (length - self.lookup_bits)) - 1)) << shift
+                for index in range(start, start + (1 << shift)):
+                    subtable[index] = (char, length)
+            self.lookup_table[prefix] = (subtable, -extra_bits)
+
+    def fingerprint(self) -> bytes:
+        """Computes a fingerprint identifying the code table, so that compressed files can be linked to the encoder 
+        that produced them.
 
         Parameters
         ----------
-        byte_array : bytearray
-            Byte array to decode.
-       
+        None
+
         Returns
         -------
-        str
-            The decoded text string.
+        bytes
+            The first 8 bytes of the SHA-256 digest of the sorted code table.
         """
 
-        if not self.bin_to_char_index:
-            raise EncoderNoneError 
+        if not self.char_to_bin_index:
+            raise EncoderNoneError
 
-        # Converting the byte array into a binary value stored as a string. 
-        bin_string = Huffman.byte_to_bit(byte_content)
-        text = ''
-        
-        # Iterating through the binary content to extract characters following the index. 
-        left, right = 0, 1
-        while right < len(bin_string):
-            if bin_string[left:right] in self.bin_to_char_index:
-                text += self.bin_to_char_index[bin_string[left:right]] 
-                left = right
-            right += 1
-        
-        return text
\ No newline at end of file
+        table = json.dumps(sorted(self.char_to_bin_index.items()), ensure_ascii=False)
+        return hashlib.sha256(table.encode("utf-8")).digest()[:8]
+
+    def estimate_size(self, symbol_count:int) -> int:
+        """Estimates the packed size of a number of symbols from the code lengths, weighted by the character 
+        frequencies of the training text when they are known, or from the longest code otherwise.
+
+        Parameters
+        ----------
+        symbol_count : int
+            The number of symbols to pack.
+
+        Returns
+        -------
+        int
+            The estimated packed size in bytes.
+        """
+
+        if not self.char_to_code:
+            self.build_tables()
+
+        known = [(percentage, self.code_lengths[char]) for char, percentage in self.char_percentages.items() if char in self.code_lengths]
+        if known and sum(percentage for percentage, _ in known) > 0:
+            bits_per_symbol = sum(percentage * length for percentage, length in known) / sum(percentage for percentage, _ in known)
+        else:
+            bits_per_symbol = self.max_code_length
+
+        return -(-int(symbol_count * bits_per_symbol) // 8)
+
+    def pack(self, text:Union[str, bytes]) -> Tuple[bytearray, int]:
+        """Packs the codes of the given text straight into a byte array through an integer bit accumulator. The last 
+        byte is padded with zeros.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to pack.
+
+        Returns
+        -------
+        Tuple[bytearray, int]
+            The packed codes as a sequence of bytes and the number of padding bits.
+        """
+
+        if not self.char_to_code:
+            self.build_tables()
+
+        byte_series, accumulator, bit_count = self._pack(text, 0, 0)
+        if bit_count:
+            byte_series.append(accumulator << (8 - bit_count))
+            return byte_series, 8 - bit_count
+
+        return byte_series, 0
+
+    def _pack(self, text:Union[str, bytes], accumulator:int, bit_count:int) -> Tuple[bytearray, int, int]:
+        """Packs the codes of the given text after the bits left in the accumulator, flushing every complete byte.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to pack.
+        accumulator : int
+            The bits left over from a previous call.
+        bit_count : int
+            The number of bits left in the accumulator, always lower than 8.
+
+        Returns
+        -------
+        Tuple[bytearray, int, int]
+            The complete bytes, the remaining accumulator and its number of bits.
+        """
+
+        if self.alphabet == "tokens":
+            text = self.tokenize(text)
+
+        get_code = self.char_to_code.__getitem__
+        byte_series = bytearray()
+
+        for position in range(0, len(text), Huffman.PACK_STEP):
+            for value, length in map(get_code, text[position:position+Huffman.PACK_STEP]):
+                accumulator = (accumulator << length) | value
+                bit_count += length
+
+            # Flush every complete byte and keep the remaining bits in the accumulator.
+            remainder = bit_count & 7
+            byte_series += (accumulator >> remainder).to_bytes(bit_count >> 3, 'big')
+            accumulator &= (1 << remainder) - 1
+            bit_count = remainder
+
+        return byte_series, accumulator, bit_count
+
+    def encode_stream(self, chunks:Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+        """Encodes a stream of text chunks, carrying the partial byte between chunks so that the output is identical to 
+        encoding the concatenated text. Always uses the table engine.
+
+        Parameters
+        ----------
+        chunks : Iterable[Union[str, bytes]]
+            The text or byte chunks to encode.
+
+        Returns
+        -------
+        Iterator[bytes]
+            The encoded byte chunks.
+        """
+
+        if not self.char_to_bin_index:
+            raise EncoderNoneError 
+
+        if not self.char_to_code:
+            self.build_tables()
+
+        accumulator, bit_count = 0, 0
+        for chunk in chunks:
+            byte_series, accumulator, bit_count = self._pack(chunk, accumulator, bit_count)
+            if byte_series:
+                yield bytes(byte_series)
+
+        if bit_count:
+            yield bytes([accumulator << (8 - bit_count)])
+
+    def unpack(self, byte_content:bytes, count:Optional[int]=None, bit_count:Optional[int]=None) -> list:
+        """Unpacks the characters of the given byte array through the decoding lookup tables, consuming a whole code 
+        per lookup from an integer bit buffer.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to unpack.
+        count : Optional[int]
+            The number of characters to unpack. If None, unpacks until the remaining bits do not hold a full code. 
+            Token alphabets unpack whole tokens until they hold at least count characters.
+        bit_count : Optional[int]
+            The number of meaningful bits, excluding padding. If None, every bit is used.
+
+        Returns
+        -------
+        list
+            The unpacked characters, or tokens for token alphabets.
+        """
+
+        if not self.char_to_code:
+            self.build_tables()
+
+        remaining = -1 if count is None else count
+        if bit_count is None:
+            return self._unpack(byte_content, 0, 0, remaining)[0]
+
+        # The whole bytes are unpacked first, then the meaningful bits of the last byte alone.
+        byte_count, extra_bits = divmod(bit_count, 8)
+        chars, accumulator, bits, remaining = self._unpack(memoryview(byte_content)[:byte_count], 0, 0, remaining)
+        if extra_bits and (count is None or remaining > 0):
+            accumulator = (accumulator << extra_bits) | (byte_content[byte_count] >> (8 - extra_bits))
+            chars += self._unpack(b'', accumulator, bits + extra_bits, remaining)[0]
+
+        return chars
+
+    def _unpack(self, byte_content:bytes, accumulator:int, bit_count:int, remaining:int) -> Tuple[list, int, int, int]:
+        """Unpacks the characters of the given byte array after the bits left in the accumulator. Stops when the 
+        remaining bits do not hold a full code, leaving them in the accumulator for the next call.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to unpack.
+        accumulator : int
+            The bits left over from a previous call.
+        bit_count : int
+            The number of bits left in the accumulator.
+        remaining : int
+            The number of characters left to unpack, negative for no limit.
+
+        Returns
+        -------
+        Tuple[list, int, int, int]
+            The unpacked characters, the remaining accumulator, its number of bits and the number of characters left, 
+            which the last token may take below zero.
+        """
+
+        lookup_table = self.lookup_table
+        lookup_bits = self.lookup_bits
+        lookup_mask = (1 << lookup_bits) - 1
+        refill_bits = self.max_code_length
+
+        # The escape code is followed by a raw code point, which must fit in the bit buffer along with it.
+        escape = Huffman.ESCAPE if isinstance(self.char_to_code, CodeTable) else None
+        if escape is not None:
+            refill_bits += Huffman.ESCAPE_BITS
+
+        # Tokens count down the characters they hold, and may take the count past zero.
+        tokens = self.alphabet == "tokens"
+        unlimited = remaining < 0
+        if unlimited:
+            remaining = sys.maxsize
+
+        chars = []
+        append = chars.append
+        size = len(byte_content)
+        position = 0
+
+        while remaining > 0:
+            # Keep at least one full code in the bit buffer while data is left.
+            if bit_count < refill_bits and position < size:
+                chunk = byte_content[position:position+8]
+                position += 8
+                accumulator = ((accumulator & ((1 << bit_count) - 1)) << (len(chunk) << 3)) | int.from_bytes(chunk, 'big')
+                bit_count += len(chunk) << 3
+                continue
+
+            if bit_count >= lookup_bits:
+                char, length = lookup_table[(accumulator >> (bit_count - lookup_bits)) & lookup_mask]
+            else:
+                char, length = lookup_table[(accumulator << (lookup_bits - bit_count)) & lookup_mask]
+
+            if length < 0:
+                total_bits = lookup_bits - length
+                if bit_count >= total_bits:
+                    char, length = char[(accumulator >> (bit_count - total_bits)) & ((1 << -length) - 1)]
+                else:
+                    char, length = char[(accumulator << (total_bits - bit_count)) & ((1 << -length) - 1)]
+
+            # The code continues past the available bits, or only padding bits are left.
+            if length > bit_count:
+                break
+
+            bit_count -= length
+
+            if char == escape:
+                if Huffman.ESCAPE_BITS > bit_count:
+                    bit_count += length
+                    break
+                bit_count -= Huffman.ESCAPE_BITS
+                char = chr((accumulator >> bit_count) & ((1 << Huffman.ESCAPE_BITS) - 1))
+
+            append(char)
+            remaining -= len(char) if tokens else 1
+
+        # Unconsumed bytes only happen once the character limit is reached.
+        accumulator &= (1 << bit_count) - 1
+        return chars, accumulator, bit_count, -1 if unlimited else remaining
+
+    def decode_stream(self, chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]:
+        """Decodes a stream of byte chunks, carrying partial codes across chunk boundaries so that the output is 
+        identical to decoding the concatenated bytes. Always uses the table engine.
+
+        Parameters
+        ----------
+        chunks : Iterable[bytes]
+            The byte chunks to decode.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The decoded text or byte chunks.
+        """
+
+        if not self.bin_to_char_index:
+            raise EncoderNoneError 
+
+        if not self.char_to_code:
+            self.build_tables()
+
+        accumulator, bit_count = 0, 0
+        for chunk in chunks:
+            chars, accumulator, bit_count, _ = self._unpack(chunk, accumulator, bit_count, -1)
+            if chars:
+                yield self.join(chars)
+
+    def encode(self, text:Union[str, bytes]) -> bytearray:
+        """Encodes the given text file into a byte array following the Huffman Encoding method. For more details on the Huffman Encoding method, see: https://en.wikipedia.org/wiki/Huffman_coding
+        The first byte holds the number of padding bits of the last one, so that decode does not take them for codes.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to encode. 
+       
+        Returns
+        -------
+        bytearray
+            The encoded text file as a sequence of bytes.
+        """
+
+        if not self.char_to_bin_index:
+            raise EncoderNoneError 
+
+        # The legacy string engine has no escape code nor tokens.
+        if self.engine == "string" and (self.alphabet == "tokens" or Huffman.ESCAPE in self.char_to_bin_index):
+            raise ValueError("The string engine has no escape code nor tokens, train the encoder with unseen=\"fill\" "
+                             "or use the table engine.")
+
+        if self.engine == "table":
+            byte_series, pad_bits = self.pack(text)
+            return bytearray((pad_bits,)) + byte_series
+
+        bin_encoding = ''
+        for char in text:
+            bin_encoding += self.char_to_bin_index[char]
+
+        # Converting the binary data into byte arrays.
+        byte_series = Huffman.bit_to_byte(bin_encoding)
+            
+        # Returning the byte array. 
+        return bytearray((-len(bin_encoding) % 8,)) + byte_series
+    
+    def decode(self, byte_content:bytes) -> Union[str, bytes]:
+        """Decodes the given byte array into a character string following the Huffman coding method. For more details on the Huffman Encoding method, see: https://en.wikipedia.org/wiki/Huffman_coding
+
+        Parameters
+        ----------
+        byte_array : bytearray
+            Byte array to decode, as produced by encode.
+       
+        Returns
+        -------
+        Union[str, bytes]
+            The decoded text string, or bytes for byte alphabets.
+        """
+
+        if not self.bin_to_char_index:
+            raise EncoderNoneError 
+
+        if not byte_content:
+            return self.join([])
+
+        # The legacy string engine has no escape code nor tokens.
+        if self.engine == "string" and (self.alphabet == "tokens" or Huffman.ESCAPE in self.char_to_bin_index):
+            raise ValueError("The string engine has no escape code nor tokens, train the encoder with unseen=\"fill\" "
+                             "or use the table engine.")
+
+        payload = byte_content[1:]
+        bit_count = len(payload) * 8 - byte_content[0]
+
+        # The legacy decoder builds a character string, byte alphabets always go through the lookup tables.
+        if self.engine == "table" or self.alphabet != "text":
+            return self.join(self.unpack(payload, bit_count=bit_count))
+
+        # Converting the byte array into a binary value stored as a string, without the padding bits. 
+        bin_string = Huffman.byte_to_bit(payload)[:bit_count]
+        text = ''
+        
+        # Iterating through the binary content to extract characters following the index. 
+        left, right = 0, 1
+        while right <= len(bin_string):
+            if bin_string[left:right] in self.bin_to_char_index:
+                text += self.bin_to_char_index[bin_string[left:right]] 
+                left = right
+            right += 1
+        
+        return text
+
+class ContextTable(dict):
+    """ Dictionary that maps (previous symbol, symbol) pairs to the (integer value, bit length) code pair of the symbol
+    in the context of the previous one. The code of a pair is looked up in the context table of the previous symbol, 
+    or in the order-0 table after the fallback code when the context does not hold the symbol, then cached.
+
+    Attributes
+    ----------
+    order0 : dict
+        The order-0 code table, used for the contexts without a table of their own.
+    contexts : dict
+        A dictionary that maps each previous symbol to the code table of its context.
+    fallback : Union[str, int]
+        The symbol of the context tables that switches to the order-0 table.
+
+    Methods
+    -------
+    None
+    """
+
+    def __init__(self, order0:dict, contexts:dict, fallback:Union[str, int]):
+        """ Initializes the ContextTable class.
+        """
+        super().__init__()
+        self.order0 = order0
+        self.contexts = contexts
+        self.fallback = fallback
+
+    def __missing__(self, pair:tuple) -> Tuple[int, int]:
+        """ Computes and caches the code of a pair.
+        """
+        previous, char = pair
+        codes = self.contexts.get(previous)
+
+        if codes is None:
+            code = self.order0[char]
+        elif char in codes:
+            code = codes[char]
+        else:
+            value, length = codes[self.fallback]
+            order0_value, order0_length = self.order0[char]
+            code = (value << order0_length) | order0_value, length + order0_length
+
+        self[pair] = code
+        return code
+
+class ContextHuffman(Encoder):
+    """ Class to represent an order-1 context-modeled Huffman encoder: each symbol is coded with the table of the 
+    symbol before it, so that e.g. 'u' gets a short code after 'q'. Contexts seen too rarely to be worth a table of 
+    their own use the order-0 table, and so does the first symbol of each block. Context tables hold a fallback symbol 
+    followed by the order-0 code of the symbols they were not trained on.
+
+    Attributes
+    ----------
+    order0 : Huffman
+        The order-0 encoder, coding every symbol regardless of its context.
+    contexts : dict
+        A dictionary that maps each previous symbol with a table of its own to the encoder of its context.
+    code_lengths : dict
+        A dictionary that maps each previous symbol to the code lengths of its context, the order-0 code lengths being 
+        held under None.
+    pair_to_code : ContextTable
+        The table that maps (previous symbol, symbol) pairs to their code pair.
+    decoders : dict
+        A dictionary that maps each previous symbol to the (lookup table, lookup bits, lookup mask) of its context.
+    max_code_length : int
+        The length of the longest code of any table.
+    alphabet : str
+        The kind of symbols encoded, either "text" (characters) or "bytes" (integers from 0 to 255).
+    bits_per_symbol : Optional[float]
+        The average code length over the training text, unknown for encoders loaded from code lengths.
+
+    Methods
+    -------
+    pairs(text:Union[str, bytes]) -> Iterator[tuple]
+        Returns the (previous symbol, symbol) pairs of a block.
+    init(text:Union[str, bytes], max_code_length:Optional[int]=None, unseen:Optional[Union[str, int]]="escape", min_context_count:int=MIN_CONTEXT_COUNT) -> None
+        Computes the order-0 and context tables of a text.
+    init_counts(pair_counts:dict, alphabet:str="text", unseen:Optional[Union[str, int]]="escape", max_code_length:Optional[int]=None, min_context_count:int=MIN_CONTEXT_COUNT) -> None
+        Computes the order-0 and context tables from pair counts.
+    load_code_lengths(code_lengths:dict, alphabet:str="text") -> None
+        Builds the tables from the code lengths of every context.
+    serialize_code_lengths(code_lengths:dict, alphabet:str="text") -> bytes
+        Serializes the code lengths of every context.
+    deserialize_code_lengths(data:bytes) -> Tuple[dict, str]
+        Parses the code lengths of every context.
+    from_code_lengths(data:bytes) -> ContextHuffman
+        Creates an encoder from serialized code lengths.
+    join(chars:list) -> Union[str, bytes]
+        Joins decoded symbols into a string or bytes depending on the alphabet.
+    fingerprint() -> bytes
+        Computes a fingerprint identifying the code tables.
+    estimate_size(symbol_count:int) -> int
+        Estimates the packed size of a number of symbols.
+    pack(text:Union[str, bytes]) -> Tuple[bytearray, int]
+        Packs the codes of the given text straight into a byte array.
+    unpack(byte_content:bytes, count:Optional[int]=None) -> list
+        Unpacks the characters of the given byte array.
+    encode_stream(chunks:Iterable[Union[str, bytes]]) -> Iterator[bytes]
+        Encodes a stream of text or byte chunks.
+    decode_stream(chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]
+        Decodes a stream of byte chunks.
+    encode(text:Union[str, bytes]) -> bytearray
+        Encodes the given text into a byte array.
+    decode(byte_content:bytes) -> Union[str, bytes]
+        Decodes the given byte array into a character string or bytes.
+    """
+
+    ALPHABETS = ("text", "bytes")
+
+    # Number of appearances below which a context uses the order-0 table, its own table costing more to store than it 
+    # saves.
+    MIN_CONTEXT_COUNT = 64
+
+    # Symbol of the context tables standing for the order-0 code that follows it, outside of each alphabet.
+    FALLBACK = {"text": Huffman.ESCAPE, "bytes": 256}
+
+    # Compact binary encoder format: magic, version, alphabet, context count, the length and serialized order-0 code 
+    # lengths, then the 3 bytes code point or byte value, length and serialized code lengths of each context.
+    CODE_LENGTHS_MAGIC = b"HUFX"
+    CODE_LENGTHS_VERSION = 1
+
+    def __init__(self, text:Optional[Union[str, bytes]]=None, max_code_length:Optional[int]=None, 
+                 unseen:Optional[Union[str, int]]="escape", min_context_count:int=MIN_CONTEXT_COUNT) -> None:
+        """Initializes the context-modeled Huffman encoder.
+
+        Parameters
+        ----------
+        text : Optional[Union[str, bytes]]
+            Text or bytes to generate the tables from.
+        max_code_length : Optional[int]
+            The maximum code length of every table, unbounded by default.
+        unseen : Optional[Union[str, int]]
+            How the order-0 table handles the symbols absent from the text, see Huffman.init_counts.
+        min_context_count : int
+            The number of appearances from which a context gets a table of its own.
+
+        Returns
+        -------
+        None
+        """
+
+        self.order0 = None
+        self.contexts = {}
+        self.code_lengths = None
+        self.pair_to_code = None
+        self.decoders = {}
+        self.max_code_length = None
+        self.alphabet = "text"
+        self.bits_per_symbol = None
+        if text is not None:
+            self.init(text, max_code_length=max_code_length, unseen=unseen, min_context_count=min_context_count)
+
+    @staticmethod
+    def pairs(text:Union[str, bytes]) -> Iterator[tuple]:
+        """Returns the (previous symbol, symbol) pairs of a block, the first symbol having None as previous symbol.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes of the block.
+
+        Returns
+        -------
+        Iterator[tuple]
+            The pairs of the block.
+        """
+
+        return zip(chain((None,), text), text)
+
+    def init(self, text:Union[str, bytes], max_code_length:Optional[int]=None, unseen:Optional[Union[str, int]]="escape", 
+             min_context_count:int=MIN_CONTEXT_COUNT) -> None:
+        """Computes the order-0 and context tables of a text. A text string builds a character alphabet, any 
+        bytes-like object builds a byte alphabet.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text or bytes to compute the tables from.
+        max_code_length : Optional[int]
+            The maximum code length of every table, unbounded by default.
+        unseen : Optional[Union[str, int]]
+            How the order-0 table handles the symbols absent from the text, see Huffman.init_counts.
+        min_context_count : int
+            The number of appearances from which a context gets a table of its own.
+
+        Returns
+        -------
+        None
+        """
+
+        alphabet = "text" if isinstance(text, str) else "bytes"
+        self.init_counts(Counter(ContextHuffman.pairs(text)), alphabet, unseen=unseen, max_code_length=max_code_length, 
+                         min_context_count=min_context_count)
+
+    def init_counts(self, pair_counts:dict, alphabet:str="text", unseen:Optional[Union[str, int]]="escape", 
+                    max_code_length:Optional[int]=None, min_context_count:int=MIN_CONTEXT_COUNT) -> None:
+        """Computes the order-0 and context tables from pair counts, e.g. gathered block by block over a file.
+
+        Parameters
+        ----------
+        pair_counts : dict
+            A dictionary that maps (previous symbol, symbol) pairs to their number of appearances.
+        alphabet : str
+            The kind of symbols encoded, either "text" or "bytes".
+        unseen : Optional[Union[str, int]]
+            How the order-0 table handles the symbols absent from the counts, see Huffman.init_counts.
+        max_code_length : Optional[int]
+            The maximum code length of every table, unbounded by default.
+        min_context_count : int
+            The number of appearances from which a context gets a table of its own.
+
+        Returns
+        -------
+        None
+        """
+
+        if alphabet not in ContextHuffman.ALPHABETS:
+            raise ValueError(f"Unknown alphabet '{alphabet}', expected one of {ContextHuffman.ALPHABETS}.")
+
+        char_counts = Counter()
+        context_counts = {}
+        for (previous, char), count in pair_counts.items():
+            char_counts[char] += count
+            context_counts.setdefault(previous, Counter())[char] += count
+
+        order0 = Huffman()
+        order0.init_counts(char_counts, alphabet, unseen=unseen, max_code_length=max_code_length)
+        code_lengths = {None: order0.code_lengths}
+
+        fallback = ContextHuffman.FALLBACK[alphabet]
+        for previous, counts in context_counts.items():
+            if previous is not None and sum(counts.values()) >= min_context_count:
+                counts[fallback] = 1
+                context = Huffman()
+                context.init_counts(counts, alphabet, unseen=None, max_code_length=max_code_length)
+                code_lengths[previous] = context.code_lengths
+
+        self.load_code_lengths(code_lengths, alphabet)
+
+        total = sum(pair_counts.values())
+        if total:
+            self.bits_per_symbol = sum(count * self.pair_to_code[pair][1] for pair, count in pair_counts.items()) / total
+
+    def load_code_lengths(self, code_lengths:dict, alphabet:str="text") -> None:
+        """Builds the encoding and decoding tables from the code lengths of every context, each assigned canonical 
+        codes as in Huffman.load_code_lengths.
+
+        Parameters
+        ----------
+        code_lengths : dict
+            A dictionary that maps each previous symbol to the code lengths of its context, and None to the order-0 
+            code lengths.
+        alphabet : str
+            The kind of symbols encoded, either "text" or "bytes".
+
+        Returns
+        -------
+        None
+        """
+
+        if not code_lengths or None not in code_lengths:
+            raise EncoderNoneError
+
+        if alphabet not in ContextHuffman.ALPHABETS:
+            raise ValueError(f"Unknown alphabet '{alphabet}', expected one of {ContextHuffman.ALPHABETS}.")
+
+        self.alphabet = alphabet
+        self.code_lengths = dict(code_lengths)
+        self.bits_per_symbol = None
+
+        encoders = {}
+        for previous, lengths in self.code_lengths.items():
+            encoder = Huffman()
+            encoder.load_code_lengths(lengths, alphabet)
+            encoders[previous] = encoder
+
+        self.order0 = encoders.pop(None)
+        self.contexts = encoders
+        self.max_code_length = max(encoder.max_code_length for encoder in (self.order0, *self.contexts.values()))
+
+        self.pair_to_code = ContextTable(self.order0.char_to_code, 
+                                         {previous: encoder.char_to_code for previous, encoder in self.contexts.items()}, 
+                                         ContextHuffman.FALLBACK[alphabet])
+        self.decoders = {previous: (encoder.lookup_table, encoder.lookup_bits, (1 << encoder.lookup_bits) - 1) 
+                         for previous, encoder in self.contexts.items()}
+
+    @staticmethod
+    def serialize_code_lengths(code_lengths:dict, alphabet:str="text") -> bytes:
+        """Serializes the code lengths of every context into the compact binary encoder format, each table in the 
+        format of Huffman.serialize_code_lengths.
+
+        Parameters
+        ----------
+        code_lengths : dict
+            A dictionary that maps each previous symbol to the code lengths of its context, and None to the order-0 
+            code lengths.
+        alphabet : str
+            The kind of symbols encoded, either "text" or "bytes".
+
+        Returns
+        -------
+        bytes
+            The serialized code lengths.
+        """
+
+        data = bytearray(ContextHuffman.CODE_LENGTHS_MAGIC)
+        data.append(ContextHuffman.CODE_LENGTHS_VERSION)
+        data.append(ContextHuffman.ALPHABETS.index(alphabet))
+        data += (len(code_lengths) - 1).to_bytes(4, 'big')
+
+        table = Huffman.serialize_code_lengths(code_lengths[None], alphabet)
+        data += len(table).to_bytes(4, 'big') + table
+
+        for previous, lengths in sorted((item for item in code_lengths.items() if item[0] is not None)):
+            table = Huffman.serialize_code_lengths(lengths, alphabet)
+            data += (ord(previous) if alphabet == "text" else previous).to_bytes(3, 'big')
+            data += len(table).to_bytes(4, 'big') + table
+
+        return bytes(data)
+
+    @staticmethod
+    def deserialize_code_lengths(data:bytes) -> Tuple[dict, str]:
+        """Parses the code lengths of every context from the compact binary encoder format.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        Tuple[dict, str]
+            A dictionary that maps each previous symbol to the code lengths of its context and None to the order-0 
+            code lengths, and the alphabet.
+        """
+
+        if data[:4] != ContextHuffman.CODE_LENGTHS_MAGIC:
+            raise ValueError("The data is not a serialized context Huffman encoder.")
+
+        if data[4] > ContextHuffman.CODE_LENGTHS_VERSION:
+            raise ValueError(f"Unsupported context Huffman encoder version {data[4]}.")
+
+        alphabet = ContextHuffman.ALPHABETS[data[5]]
+        count = int.from_bytes(data[6:10], 'big')
+
+        length = int.from_bytes(data[10:14], 'big')
+        code_lengths = {None: Huffman.deserialize_code_lengths(data[14:14+length])[0]}
+        position = 14 + length
+
+        for _ in range(count):
+            if len(data) < position + 7:
+                raise ValueError("The serialized context Huffman encoder is truncated.")
+            symbol = int.from_bytes(data[position:position+3], 'big')
+            length = int.from_bytes(data[position+3:position+7], 'big')
+            table = data[position+7:position+7+length]
+            code_lengths[chr(symbol) if alphabet == "text" else symbol] = Huffman.deserialize_code_lengths(table)[0]
+            position += 7 + length
+
+        return code_lengths, alphabet
+
+    @staticmethod
+    def from_code_lengths(data:bytes) -> "ContextHuffman":
+        """Creates an encoder from code lengths in the compact binary encoder format, e.g. embedded in a compressed 
+        file.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        ContextHuffman
+            The encoder using the canonical codes of the code lengths.
+        """
+
+        encoder = ContextHuffman()
+        encoder.load_code_lengths(*ContextHuffman.deserialize_code_lengths(data))
+        return encoder
+
+    def join(self, chars:list) -> Union[str, bytes]:
+        """Joins decoded symbols into a string for text alphabets, or into bytes for byte alphabets.
+
+        Parameters
+        ----------
+        chars : list
+            The decoded symbols.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The joined symbols.
+        """
+
+        if self.alphabet == "bytes":
+            return bytes(chars)
+
+        return ''.join(chars)
+
+    def fingerprint(self) -> bytes:
+        """Computes a fingerprint identifying the code tables, so that compressed files can be linked to the encoder 
+        that produced them.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bytes
+            The first 8 bytes of the SHA-256 digest of the serialized code lengths.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        return hashlib.sha256(ContextHuffman.serialize_code_lengths(self.code_lengths, self.alphabet)).digest()[:8]
+
+    def estimate_size(self, symbol_count:int) -> int:
+        """Estimates the packed size of a number of symbols from the average code length over the training text when 
+        it is known, or from the order-0 table otherwise.
+
+        Parameters
+        ----------
+        symbol_count : int
+            The number of symbols to pack.
+
+        Returns
+        -------
+        int
+            The estimated packed size in bytes.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        if self.bits_per_symbol is None:
+            return self.order0.estimate_size(symbol_count)
+
+        return -(-int(symbol_count * self.bits_per_symbol) // 8)
+
+    def pack(self, text:Union[str, bytes]) -> Tuple[bytearray, int]:
+        """Packs the codes of the given text straight into a byte array through an integer bit accumulator, the first 
+        symbol being coded with the order-0 table. The last byte is padded with zeros.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to pack.
+
+        Returns
+        -------
+        Tuple[bytearray, int]
+            The packed codes as a sequence of bytes and the number of padding bits.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        byte_series, accumulator, bit_count = self._pack(text, 0, 0, None)
+        if bit_count:
+            byte_series.append(accumulator << (8 - bit_count))
+            return byte_series, 8 - bit_count
+
+        return byte_series, 0
+
+    def _pack(self, text:Union[str, bytes], accumulator:int, bit_count:int, previous:Optional[Union[str, int]]) -> Tuple[bytearray, int, int]:
+        """Packs the codes of the given text after the bits left in the accumulator, flushing every complete byte. The 
+        codes are looked up by (previous symbol, symbol) pair, so that switching tables costs no more than order-0.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to pack.
+        accumulator : int
+            The bits left over from a previous call.
+        bit_count : int
+            The number of bits left in the accumulator, always lower than 8.
+        previous : Optional[Union[str, int]]
+            The symbol before the text, None at the start of a block.
+
+        Returns
+        -------
+        Tuple[bytearray, int, int]
+            The complete bytes, the remaining accumulator and its number of bits.
+        """
+
+        get_code = self.pair_to_code.__getitem__
+        pairs = zip(chain((previous,), text), text)
+        byte_series = bytearray()
+
+        for _ in range(0, len(text), Huffman.PACK_STEP):
+            for value, length in map(get_code, islice(pairs, Huffman.PACK_STEP)):
+                accumulator = (accumulator << length) | value
+                bit_count += length
+
+            # Flush every complete byte and keep the remaining bits in the accumulator.
+            remainder = bit_count & 7
+            byte_series += (accumulator >> remainder).to_bytes(bit_count >> 3, 'big')
+            accumulator &= (1 << remainder) - 1
+            bit_count = remainder
+
+        return byte_series, accumulator, bit_count
+
+    def encode_stream(self, chunks:Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+        """Encodes a stream of text chunks, carrying the partial byte and the context between chunks so that the 
+        output is identical to encoding the concatenated text.
+
+        Parameters
+        ----------
+        chunks : Iterable[Union[str, bytes]]
+            The text or byte chunks to encode.
+
+        Returns
+        -------
+        Iterator[bytes]
+            The encoded byte chunks.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        accumulator, bit_count, previous = 0, 0, None
+        for chunk in chunks:
+            byte_series, accumulator, bit_count = self._pack(chunk, accumulator, bit_count, previous)
+            if len(chunk):
+                previous = chunk[-1]
+            if byte_series:
+                yield bytes(byte_series)
+
+        if bit_count:
+            yield bytes([accumulator << (8 - bit_count)])
+
+    def unpack(self, byte_content:bytes, count:Optional[int]=None, bit_count:Optional[int]=None) -> list:
+        """Unpacks the characters of the given byte array, switching to the decoding lookup table of the context of 
+        each decoded symbol.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to unpack.
+        count : Optional[int]
+            The number of characters to unpack. If None, unpacks until the remaining bits do not hold a full code.
+        bit_count : Optional[int]
+            The number of meaningful bits, excluding padding. If None, every bit is used.
+
+        Returns
+        -------
+        list
+            The unpacked characters.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        remaining = -1 if count is None else count
+        if bit_count is None:
+            return self._unpack(byte_content, 0, 0, remaining, None)[0]
+
+        # The whole bytes are unpacked first, then the meaningful bits of the last byte alone.
+        byte_count, extra_bits = divmod(bit_count, 8)
+        chars, accumulator, bits, remaining, previous = self._unpack(memoryview(byte_content)[:byte_count], 0, 0, 
+                                                                     remaining, None)
+        if extra_bits and (count is None or remaining > 0):
+            accumulator = (accumulator << extra_bits) | (byte_content[byte_count] >> (8 - extra_bits))
+            chars += self._unpack(b'', accumulator, bits + extra_bits, remaining, previous)[0]
+
+        return chars
+
+    def _unpack(self, byte_content:bytes, accumulator:int, bit_count:int, remaining:int, 
+                previous:Optional[Union[str, int]]) -> Tuple[list, int, int, int, Optional[Union[str, int]]]:
+        """Unpacks the characters of the given byte array after the bits left in the accumulator, as 
+        Huffman._unpack. A fallback symbol decoded from a context table is followed by a code of the order-0 table, 
+        itself possibly followed by a raw code point.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to unpack.
+        accumulator : int
+            The bits left over from a previous call.
+        bit_count : int
+            The number of bits left in the accumulator.
+        remaining : int
+            The number of characters left to unpack, negative for no limit.
+        previous : Optional[Union[str, int]]
+            The symbol before the byte array, None at the start of a block.
+
+        Returns
+        -------
+        Tuple[list, int, int, int, Optional[Union[str, int]]]
+            The unpacked characters, the remaining accumulator, its number of bits, the number of characters left and 
+            the last symbol.
+        """
+
+        decoders = self.decoders
+        order0 = (self.order0.lookup_table, self.order0.lookup_bits, (1 << self.order0.lookup_bits) - 1)
+        fallback = ContextHuffman.FALLBACK[self.alphabet]
+
+        # A symbol takes at most a fallback code, an order-0 code and a raw code point.
+        escape = Huffman.ESCAPE if isinstance(self.order0.char_to_code, CodeTable) else None
+        refill_bits = 2 * self.max_code_length + (Huffman.ESCAPE_BITS if escape is not None else 0)
+
+        unlimited = remaining < 0
+        if unlimited:
+            remaining = sys.maxsize
+
+        chars = []
+        append = chars.append
+        size = len(byte_content)
+        position = 0
+        decoder = decoders.get(previous, order0)
+
+        while remaining > 0:
+            # Keep at least one full symbol in the bit buffer while data is left.
+            if bit_count < refill_bits and position < size:
+                chunk = byte_content[position:position+8]
+                position += 8
+                accumulator = ((accumulator & ((1 << bit_count) - 1)) << (len(chunk) << 3)) | int.from_bytes(chunk, 'big')
+                bit_count += len(chunk) << 3
+                continue
+
+            symbol_bits = bit_count
+            lookup_table, lookup_bits, lookup_mask = decoder
+            if bit_count >= lookup_bits:
+                char, length = lookup_table[(accumulator >> (bit_count - lookup_bits)) & lookup_mask]
+            else:
+                char, length = lookup_table[(accumulator << (lookup_bits - bit_count)) & lookup_mask]
+
+            if length < 0:
+                total_bits = lookup_bits - length
+                if bit_count >= total_bits:
+                    char, length = char[(accumulator >> (bit_count - total_bits)) & ((1 << -length) - 1)]
+                else:
+                    char, length = char[(accumulator << (total_bits - bit_count)) & ((1 << -length) - 1)]
+
+            # The code continues past the available bits, or only padding bits are left.
+            if length > bit_count:
+                break
+
+            if char == fallback and decoder is not order0:
+                # The symbol follows the fallback code in the order-0 table, and is only consumed along with it.
+                bit_count -= length
+                lookup_table, lookup_bits, lookup_mask = decoder = order0
+                if bit_count >= lookup_bits:
+                    char, length = lookup_table[(accumulator >> (bit_count - lookup_bits)) & lookup_mask]
+                else:
+                    char, length = lookup_table[(accumulator << (lookup_bits - bit_count)) & lookup_mask]
+
+                if length < 0:
+                    total_bits = lookup_bits - length
+                    if bit_count >= total_bits:
+                        char, length = char[(accumulator >> (bit_count - total_bits)) & ((1 << -length) - 1)]
+                    else:
+                        char, length = char[(accumulator << (total_bits - bit_count)) & ((1 << -length) - 1)]
+
+                if length > bit_count:
+                    bit_count = symbol_bits
+                    break
+
+            bit_count -= length
+
+            if char == escape and decoder is order0:
+                if Huffman.ESCAPE_BITS > bit_count:
+                    bit_count = symbol_bits
+                    break
+                bit_count -= Huffman.ESCAPE_BITS
+                char = chr((accumulator >> bit_count) & ((1 << Huffman.ESCAPE_BITS) - 1))
+
+            append(char)
+            remaining -= 1
+            decoder = decoders.get(char, order0)
+
+        # Unconsumed bytes only happen once the character limit is reached.
+        accumulator &= (1 << bit_count) - 1
+        return chars, accumulator, bit_count, -1 if unlimited else remaining, chars[-1] if chars else previous
+
+    def decode_stream(self, chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]:
+        """Decodes a stream of byte chunks, carrying partial codes and the context across chunk boundaries so that the 
+        output is identical to decoding the concatenated bytes.
+
+        Parameters
+        ----------
+        chunks : Iterable[bytes]
+            The byte chunks to decode.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The decoded text or byte chunks.
+        """
+
+        if not self.code_lengths:
+            raise EncoderNoneError
+
+        accumulator, bit_count, previous = 0, 0, None
+        for chunk in chunks:
+            chars, accumulator, bit_count, _, previous = self._unpack(chunk, accumulator, bit_count, -1, previous)
+            if chars:
+                yield self.join(chars)
+
+    def encode(self, text:Union[str, bytes]) -> bytearray:
+        """Encodes the given text into a byte array, the first byte holding the number of padding bits of the last one.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to encode.
+
+        Returns
+        -------
+        bytearray
+            The encoded text as a sequence of bytes.
+        """
+
+        byte_series, pad_bits = self.pack(text)
+        return bytearray((pad_bits,)) + byte_series
+
+    def decode(self, byte_content:bytes) -> Union[str, bytes]:
+        """Decodes the given byte array, as produced by encode, into a character string, or bytes for byte alphabets.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to decode.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The decoded text string or bytes.
+        """
+
+        if not byte_content:
+            return self.join([])
+
+        payload = byte_content[1:]
+        return self.join(self.unpack(payload, bit_count=len(payload) * 8 - byte_content[0]))
+
+class AdaptiveTree():
+    """ Class to represent the Huffman tree of an adaptive encoder, updated after every symbol with the FGK algorithm. 
+    For more details on adaptive Huffman coding, see: https://en.wikipedia.org/wiki/Adaptive_Huffman_coding
+
+    The tree is stored in flat arrays indexed by node, the root being node 0. Nodes are also ranked by non-increasing 
+    weight with siblings adjacent (the sibling property), and the first rank of each weight is kept so that the leader 
+    of a block of equal weights is found in constant time. Unseen symbols are coded by the escape node, of weight 0, 
+    followed by their raw value.
+
+    Attributes
+    ----------
+    weights : list
+        The weight of every node.
+    parents : list
+        The parent of every node, -1 for the root.
+    lefts : list
+        The left (bit 0) child of every node, -1 for leaves.
+    rights : list
+        The right (bit 1) child of every node, -1 for leaves.
+    symbols : list
+        The symbol of every leaf, None for the escape node and inner nodes.
+    order : list
+        The nodes by rank, i.e. by non-increasing weight.
+    ranks : list
+        The rank of every node.
+    leaders : dict
+        A dictionary that maps each weight to the first rank holding it.
+    leaves : dict
+        A dictionary that maps each seen symbol to its leaf.
+    escape : int
+        The escape node.
+
+    Methods
+    -------
+    code(node:int) -> Tuple[int, int]
+        Returns the (integer value, bit length) code pair of a node.
+    add(symbol:Union[str, int]) -> int
+        Splits the escape node to add a leaf for an unseen symbol.
+    update(node:int) -> None
+        Increments the weight of a leaf and of its ancestors, restoring the sibling property.
+    """
+
+    def __init__(self):
+        """ Initializes the AdaptiveTree class with a single escape node.
+        """
+
+        self.weights = [0]
+        self.parents = [-1]
+        self.lefts = [-1]
+        self.rights = [-1]
+        self.symbols = [None]
+        self.order = [0]
+        self.ranks = [0]
+        self.leaders = {0: 0}
+        self.leaves = {}
+        self.escape = 0
+
+    def code(self, node:int) -> Tuple[int, int]:
+        """ Returns the code of a node by walking up to the root.
+
+        Parameters
+        ----------
+        node : int
+            The node to get the code of.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The (integer value, bit length) code pair.
+        """
+
+        parents, rights = self.parents, self.rights
+        value, length = 0, 0
+        parent = parents[node]
+        while parent != -1:
+            if rights[parent] == node:
+                value |= 1 << length
+            length += 1
+            node, parent = parent, parents[parent]
+
+        return value, length
+
+    def add(self, symbol:Union[str, int]) -> int:
+        """ Splits the escape node into an inner node holding a new escape node and a leaf for an unseen symbol. Both
+        take the lowest ranks, the escape node having the lowest.
+
+        Parameters
+        ----------
+        symbol : Union[str, int]
+            The unseen symbol.
+
+        Returns
+        -------
+        int
+            The leaf of the symbol, of weight 0.
+        """
+
+        node = self.escape
+        leaf, escape = len(self.weights), len(self.weights) + 1
+        rank = self.ranks[node]
+
+        self.weights += [0, 0]
+        self.parents += [node, node]
+        self.lefts += [-1, -1]
+        self.rights += [-1, -1]
+        self.symbols += [symbol, None]
+        self.order += [leaf, escape]
+        self.ranks += [rank + 1, rank + 2]
+
+        self.lefts[node], self.rights[node] = escape, leaf
+        self.leaves[symbol] = leaf
+        self.escape = escape
+        return leaf
+
+    def update(self, node:int) -> None:
+        """ Increments the weight of a leaf and of its ancestors. Each node is first swapped with the leader of its 
+        block, so that incrementing it keeps the nodes ordered by weight. The parent of the sibling of the escape node 
+        has the same weight as that sibling and may lead its block, in which case both are moved together.
+
+        Parameters
+        ----------
+        node : int
+            The leaf whose symbol was coded.
+
+        Returns
+        -------
+        None
+        """
+
+        parents, order, weights, leaders = self.parents, self.order, self.weights, self.leaders
+        escape_parent = parents[self.escape]
+        last_rank = len(order) - 1
+
+        while node != -1:
+            parent = parents[node]
+            weight = weights[node]
+            rank = leaders[weight]
+
+            if parent == escape_parent and order[rank] == parent:
+                if order[rank + 1] == node:
+                    # The node follows its parent: both move to the next block in place.
+                    self._increment(rank)
+                    self._increment(rank + 1)
+                    node = parents[parent]
+                    continue
+
+                # The node takes the place of its parent, which takes the place of the next node of the block, 
+                # which becomes the sibling of the escape node. All three have the same weight.
+                self._swap(node, order[rank + 1])
+                self._swap(node, parent)
+
+            elif order[rank] != node:
+                self._swap(node, order[rank])
+
+            # Inlined increment of the leader of the block, which becomes the last node of the next block.
+            weights[node] = weight + 1
+            if weight + 1 not in leaders:
+                leaders[weight + 1] = rank
+            if rank < last_rank and weights[order[rank + 1]] == weight:
+                leaders[weight] = rank + 1
+            else:
+                del leaders[weight]
+
+            node = parents[node]
+
+    def _swap(self, first:int, second:int) -> None:
+        """ Exchanges the positions of two nodes and of their subtrees, neither being an ancestor of the other.
+        """
+
+        parents, lefts, rights, order, ranks = self.parents, self.lefts, self.rights, self.order, self.ranks
+
+        first_rank, second_rank = ranks[first], ranks[second]
+        order[first_rank], order[second_rank] = second, first
+        ranks[first], ranks[second] = second_rank, first_rank
+
+        first_parent, second_parent = parents[first], parents[second]
+        if first_parent == second_parent:
+            lefts[first_parent], rights[first_parent] = rights[first_parent], lefts[first_parent]
+            return
+
+        if lefts[first_parent] == first:
+            lefts[first_parent] = second
+        else:
+            rights[first_parent] = second
+
+        if lefts[second_parent] == second:
+            lefts[second_parent] = first
+        else:
+            rights[second_parent] = first
+
+        parents[first], parents[second] = second_parent, first_parent
+
+    def _increment(self, rank:int) -> None:
+        """ Increments the weight of the leader of a block, which becomes the last node of the next block.
+        """
+
+        weights, leaders = self.weights, self.leaders
+
+        node = self.order[rank]
+        weight = weights[node]
+        weights[node] = weight + 1
+
+        if weight + 1 not in leaders:
+            leaders[weight + 1] = rank
+
+        if rank + 1 < len(self.order) and weights[self.order[rank + 1]] == weight:
+            leaders[weight] = rank + 1
+        else:
+            del leaders[weight]
+
+class AdaptiveHuffman(Encoder):
+    """ Class to represent an adaptive Huffman encoder, which needs no training text nor stored code table: the encoder
+    and the decoder build the same tree as symbols go, starting from an empty tree where every symbol is unseen. Any 
+    character or byte can be encoded.
+
+    Each call to pack starts from an empty tree, so that the blocks of a container remain independent and can be 
+    packed concurrently.
+
+    Attributes
+    ----------
+    alphabet : str
+        The kind of symbols encoded, either "text" (characters) or "bytes" (integers from 0 to 255).
+
+    Methods
+    -------
+    init(text:Optional[Union[str, bytes]]=None) -> None
+        Selects the alphabet from the type of a sample.
+    join(chars:list) -> Union[str, bytes]
+        Joins decoded symbols into a string or bytes depending on the alphabet.
+    fingerprint() -> bytes
+        Computes a fingerprint identifying the encoder.
+    estimate_size(symbol_count:int) -> int
+        Estimates the packed size of a number of symbols.
+    pack(text:Union[str, bytes]) -> Tuple[bytearray, int]
+        Packs the given text into a byte array, updating the tree after every symbol.
+    unpack(byte_content:bytes, count:Optional[int]=None, bit_count:Optional[int]=None) -> list
+        Unpacks the symbols of the given byte array, updating the tree after every symbol.
+    decode_stream(chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]
+        Decodes a stream of byte chunks.
+    encode(text:Union[str, bytes]) -> bytes
+        Encodes the given text into bytes.
+    decode(byte_content:bytes) -> Union[str, bytes]
+        Decodes the given bytes into a character string or bytes.
+    """
+
+    ALPHABETS = ("text", "bytes")
+
+    # Number of bits of the raw value following the escape code, enough for any byte or Unicode code point.
+    SYMBOL_BITS = {"text": 21, "bytes": 8}
+
+    def __init__(self, alphabet:str="text") -> None:
+        """ Initializes the AdaptiveHuffman class.
+
+        Parameters
+        ----------
+        alphabet : str
+            The kind of symbols to encode, either "text" or "bytes".
+
+        Returns
+        -------
+        None
+        """
+
+        if alphabet not in AdaptiveHuffman.ALPHABETS:
+            raise ValueError(f"Unknown alphabet {alphabet}, expected one of {AdaptiveHuffman.ALPHABETS}.")
+
+        self.alphabet = alphabet
+
+    def init(self, text:Optional[Union[str, bytes]]=None) -> None:
+        """ Selects the alphabet from the type of a sample, a string for characters and bytes otherwise. No training is
+        needed.
+
+        Parameters
+        ----------
+        text : Optional[Union[str, bytes]]
+            A sample of the data to encode.
+
+        Returns
+        -------
+        None
+        """
+
+        if text is not None:
+            self.alphabet = "text" if isinstance(text, str) else "bytes"
+
+    def join(self, chars:list) -> Union[str, bytes]:
+        """Joins decoded symbols into a string for text alphabets or into bytes for byte alphabets.
+
+        Parameters
+        ----------
+        chars : list
+            The decoded characters or byte values.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The joined symbols.
+        """
+
+        if self.alphabet == "bytes":
+            return bytes(chars)
+
+        return ''.join(chars)
+
+    def fingerprint(self) -> bytes:
+        """Computes a fingerprint identifying the encoder, which only depends on its alphabet.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bytes
+            The first 8 bytes of the SHA-256 digest of the encoder kind and alphabet.
+        """
+
+        return hashlib.sha256(f"adaptive-huffman:{self.alphabet}".encode("utf-8")).digest()[:8]
+
+    def estimate_size(self, symbol_count:int) -> int:
+        """Estimates the packed size of a number of symbols, as one byte per symbol since no statistics are known 
+        beforehand.
+
+        Parameters
+        ----------
+        symbol_count : int
+            The number of symbols to pack.
+
+        Returns
+        -------
+        int
+            The estimated packed size in bytes.
+        """
+
+        return symbol_count
+
+    def pack(self, text:Union[str, bytes]) -> Tuple[bytearray, int]:
+        """Packs the given text into a byte array through an integer bit accumulator, starting from an empty tree and 
+        updating it after every symbol. The last byte is padded with zeros.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to pack.
+
+        Returns
+        -------
+        Tuple[bytearray, int]
+            The packed codes as a sequence of bytes and the number of padding bits.
+        """
+
+        tree = AdaptiveTree()
+        leaves = tree.leaves
+        symbol_bits = AdaptiveHuffman.SYMBOL_BITS[self.alphabet]
+        raw = ord if self.alphabet == "text" else int
+
+        byte_series = bytearray()
+        accumulator, bit_count = 0, 0
+
+        for position in range(0, len(text), Huffman.PACK_STEP):
+            for char in text[position:position+Huffman.PACK_STEP]:
+                node = leaves.get(char)
+                if node is None:
+                    value, length = tree.code(tree.escape)
+                    accumulator = (((accumulator << length) | value) << symbol_bits) | raw(char)
+                    bit_count += length + symbol_bits
+                    node = tree.add(char)
+                else:
+                    value, length = tree.code(node)
+                    accumulator = (accumulator << length) | value
+                    bit_count += length
+
+                tree.update(node)
+
+            # Flush every complete byte and keep the remaining bits in the accumulator.
+            remainder = bit_count & 7
+            byte_series += (accumulator >> remainder).to_bytes(bit_count >> 3, 'big')
+            accumulator &= (1 << remainder) - 1
+            bit_count = remainder
+
+        if bit_count:
+            byte_series.append(accumulator << (8 - bit_count))
+            return byte_series, 8 - bit_count
+
+        return byte_series, 0
+
+    def unpack(self, byte_content:bytes, count:Optional[int]=None, bit_count:Optional[int]=None) -> list:
+        """Unpacks the symbols of the given byte array bit by bit, starting from an empty tree and updating it after 
+        every symbol.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Byte array to unpack.
+        count : Optional[int]
+            The number of symbols to unpack. If None, unpacks until the bits run out.
+        bit_count : Optional[int]
+            The number of meaningful bits, excluding padding. If None, every bit is used.
+
+        Returns
+        -------
+        list
+            The unpacked symbols.
+        """
+
+        tree = AdaptiveTree()
+        lefts, rights, symbols = tree.lefts, tree.rights, tree.symbols
+        symbol_bits = AdaptiveHuffman.SYMBOL_BITS[self.alphabet]
+        raw = chr if self.alphabet == "text" else int
+
+        remaining = -1 if count is None else count
+        bits_left = len(byte_content) * 8 if bit_count is None else bit_count
+        chars = []
+
+        # The first symbol is always unseen, its raw value is read straight away.
+        node, raw_bits, raw_value = 0, symbol_bits, 0
+
+        for byte in byte_content:
+            for shift in range(7, -1, -1):
+                if not remaining or not bits_left:
+                    return chars
+                bits_left -= 1
+                bit = (byte >> shift) & 1
+
+                if raw_bits:
+                    raw_value = (raw_value << 1) | bit
+                    raw_bits -= 1
+                    if raw_bits:
+                        continue
+                    char = raw(raw_value)
+                    raw_value = 0
+                    node = tree.add(char)
+
+                else:
+                    node = rights[node] if bit else lefts[node]
+                    if lefts[node] != -1:
+                        continue
+                    if node == tree.escape:
+                        raw_bits = symbol_bits
+                        continue
+                    char = symbols[node]
+
+                chars.append(char)
+                remaining -= 1
+                tree.update(node)
+                node = 0
+
+        return chars
+
+    def decode_stream(self, chunks:Iterable[bytes]) -> Iterator[Union[str, bytes]]:
+        """Decodes a stream of byte chunks produced by encode. The stream is gathered first since its padding is only 
+        known from its first byte and its length.
+
+        Parameters
+        ----------
+        chunks : Iterable[bytes]
+            The byte chunks to decode.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The decoded text or bytes.
+        """
+
+        yield self.decode(b''.join(bytes(chunk) for chunk in chunks))
+
+    def encode(self, text:Union[str, bytes]) -> bytes:
+        """Encodes the given text into bytes, the first byte holding the number of padding bits of the last one.
+
+        Parameters
+        ----------
+        text : Union[str, bytes]
+            Text string or bytes to encode.
+
+        Returns
+        -------
+        bytes
+            The encoded text.
+        """
+
+        byte_series, pad_bits = self.pack(text)
+        return bytes([pad_bits]) + byte_series
+
+    def decode(self, byte_content:bytes) -> Union[str, bytes]:
+        """Decodes the given bytes, as produced by encode, into a character string or bytes.
+
+        Parameters
+        ----------
+        byte_content : bytes
+            Bytes to decode.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The decoded text string, or bytes for byte alphabets.
+        """
+
+        if not byte_content:
+            return self.join([])
+
+        payload = byte_content[1:]
+        return self.join(self.unpack(payload, bit_count=len(payload) * 8 - byte_content[0]))
+
+
+def load_encoder(data:bytes) -> Encoder:
+    """Creates an encoder from code lengths in any of the compact binary encoder formats, told apart by their magic.
+
+    Parameters
+    ----------
+    data : bytes
+        The serialized code lengths.
+
+    Returns
+    -------
+    Encoder
+        The Huffman or context Huffman encoder using the canonical codes of the code lengths.
+    """
+
+    if data[:4] == ContextHuffman.CODE_LENGTHS_MAGIC:
+        return ContextHuffman.from_code_lengths(data)
+
+    return Huffman.from_code_lengths(data)
@@ -1,6 +1,6 @@
-from tkinter import filedialog
-import json, os
-from typing import Optional, Union
+import json, mmap, os
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Union
 
 class PathNoneError(Exception):
     """ Exception raised when a path is of type None.
@@ -36,6 +36,98 @@ class FileTypeError(Exception):
         """
         super().__init__(message)
 
+class MappedWriter():
+    """ Class to write a file through a memory map pre-sized to its expected length, avoiding intermediate write 
+    buffers. The map grows if the expected length is exceeded, and the file is truncated to the written length when 
+    closed.
+
+    Attributes
+    ----------
+    file : BinaryIO
+        The underlying file.
+    size : int
+        The current size of the file and of its memory map.
+    offset : int
+        The number of bytes written.
+
+    Methods
+    -------
+    write(data:bytes) -> int
+        Writes data at the current offset.
+    close() -> None
+        Truncates the file to the written length and closes it.
+    """
+
+    def __init__(self, path:str, size:int):
+        """ Initializes the MappedWriter class.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file to write.
+        size : int
+            The expected length of the file in bytes.
+
+        Returns
+        -------
+        None
+        """
+
+        self.file = open(path, "w+b")
+        self.size = max(size, 1)
+        self.offset = 0
+        self.file.truncate(self.size)
+        self.mapped = mmap.mmap(self.file.fileno(), self.size)
+
+    def write(self, data:bytes) -> int:
+        """ Writes data at the current offset, growing the file if needed.
+
+        Parameters
+        ----------
+        data : bytes
+            The data to write.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+        """
+
+        end = self.offset + len(data)
+        if end > self.size:
+            # Remapping rather than mmap.resize, which is not supported on every platform.
+            self.mapped.close()
+            self.size = max(end, 2 * self.size)
+            self.file.truncate(self.size)
+            self.mapped = mmap.mmap(self.file.fileno(), self.size)
+
+        self.mapped[self.offset:end] = data
+        self.offset = end
+        return len(data)
+
+    def close(self) -> None:
+        """ Truncates the file to the written length and closes it.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        self.mapped.flush()
+        self.mapped.close()
+        self.file.truncate(self.offset)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
 class FileOperator:
     """ Class to handle file operations such as saving, loading, and browsing files.
 
@@ -51,12 +143,21 @@ class FileOperator:
         Get an input from the user to select a file.
     browse_directories(title:str = '') -> Optional[str]
         Get an input from the user to select a folder.
-    save(path:str, data:Union[str, bytes, list]) -> None
+    save(path:str, data:Union[str, bytes, list], binary:bool = False) -> None
         Saves a given data into a specified file.
-    load(path:str) -> Union[str, bytes, list]  
+    load(path:str, binary:bool = False) -> Union[str, bytes, list]  
         Load data from a specified file.
+    read_chunks(path:str, chunk_size:int = CHUNK_SIZE, binary:bool = False, text:bool = False) -> Iterator[Union[str, bytes]]
+        Reads a specified file chunk by chunk.
+    write_chunks(path:str, chunks:Iterable[Union[str, bytes]], binary:bool = False, size:Optional[int] = None, text:bool = False) -> None
+        Writes a stream of chunks into a specified file.
+    map_file(path:str) -> Iterator[memoryview]
+        Maps a specified file into memory.
     """
 
+    # Default number of characters or bytes held in memory at once when streaming files.
+    CHUNK_SIZE = 1 << 20
+
     @staticmethod
     def browse_files(title:str = '', filetypes:list = []) -> Optional[str]:
         """ Get an input from the user to select a file.
@@ -74,6 +175,9 @@ class FileOperator:
             The path to the file selected by the user.
         """
 
+        # Imported on use so that headless callers never load Tk.
+        from tkinter import filedialog
+
         try:
             path = filedialog.askopenfilename(title=title, filetypes=filetypes)
 
@@ -106,6 +210,8 @@ class FileOperator:
             The path to the file selected by the user.
         """
 
+        from tkinter import filedialog
+
         try:
             path = filedialog.asksaveasfilename(title=title, 
                                                 defaultextension=defaultextension, 
@@ -134,6 +240,8 @@ class FileOperator:
             The path to the folder selected by the user.
         """
 
+        from tkinter import filedialog
+
         try:
             path = filedialog.askdirectory(title=title)
 
@@ -146,7 +254,7 @@ class FileOperator:
             raise e
 
     @staticmethod
-    def save(path:str, data:Union[str, bytes, list]) -> None:
+    def save(path:str, data:Union[str, bytes, list], binary:bool = False) -> None:
         """ Saves a given data into a specified file.
 
         Parameters
@@ -155,6 +263,8 @@ class FileOperator:
             Text string to represents a path to the file to save the data to.
         data : Union[str, bytes, list]
             Data to be saved.
+        binary : bool
+            Whether to save raw bytes whatever the file extension.
             
 
         Returns
@@ -166,12 +276,12 @@ class FileOperator:
 
             file_extension = path.split('.')[-1].lower()
 
-            if file_extension == "txt":
-                with open(path, 'w') as file:
+            if binary or file_extension in ("bin", "huf"):
+                with open(path, "wb") as file:
                     file.write(data)
 
-            elif file_extension == "bin":
-                with open(path, "wb") as file:
+            elif file_extension == "txt":
+                with open(path, 'w') as file:
                     file.write(data)
 
             elif file_extension == "json":
@@ -185,13 +295,15 @@ class FileOperator:
             raise e
 
     @staticmethod
-    def load(path:str) -> Union[str, bytes, list]:
+    def load(path:str, binary:bool = False) -> Union[str, bytes, list]:
         """ Load data from a specified file.
 
         Parameters
         ----------
         path : str
             Text string to represents a path to the file to load the data from.
+        binary : bool
+            Whether to load raw bytes whatever the file extension.
 
         Returns
         -------
@@ -205,12 +317,12 @@ class FileOperator:
             data = None
             file_extension = path.split('.')[-1].lower()
 
-            if file_extension == "txt":
-                with open(path, 'r') as file:
+            if binary or file_extension in ("bin", "huf"):
+                with open(path, "rb") as file:
                     data = file.read()
 
-            elif file_extension == "bin":
-                with open(path, "rb") as file:
+            elif file_extension == "txt":
+                with open(path, 'r') as file:
                     data = file.read()
 
             elif file_extension == "json":
@@ -224,3 +336,147 @@ class FileOperator:
         
         except Exception as e:
             raise e
+
+    @staticmethod
+    def read_chunks(path:str, chunk_size:int = CHUNK_SIZE, binary:bool = False, text:bool = False) -> Iterator[Union[str, bytes]]:
+        """ Reads a specified file chunk by chunk, so that only one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        path : str
+            Text string to represents a path to the file to read the data from.
+        chunk_size : int
+            The number of characters (text files) or bytes (binary files) per chunk.
+        binary : bool
+            Whether to read raw bytes whatever the file extension.
+        text : bool
+            Whether to read UTF-8 text whatever the file extension, keeping its line endings.
+
+        Returns
+        -------
+        Iterator[Union[str, bytes]]
+            The chunks read from the file.
+        """
+
+        if not os.path.exists(path):
+            raise FileNotFoundError()
+
+        file_extension = path.split('.')[-1].lower()
+        encoding = newline = None
+
+        if binary or (file_extension == "bin" and not text):
+            mode = "rb"
+
+        elif text:
+            # Line endings are kept as they are, so that extraction gives back the exact file.
+            mode, encoding, newline = 'r', "utf-8", ''
+
+        elif file_extension == "txt":
+            mode = 'r'
+
+        else:
+            raise FileTypeError()
+
+        with open(path, mode, encoding=encoding, newline=newline) as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @staticmethod
+    def write_chunks(path:str, chunks:Iterable[Union[str, bytes]], binary:bool = False, size:Optional[int] = None, 
+                     text:bool = False) -> None:
+        """ Writes a stream of chunks into a specified file through a buffered writer, or through a memory map when the
+        length of binary data is known in advance. The file is removed if an error is raised while it is written, e.g.
+        by the chunks, so that no partial file is left behind.
+
+        Parameters
+        ----------
+        path : str
+            Text string to represents a path to the file to save the data to.
+        chunks : Iterable[Union[str, bytes]]
+            The chunks to be saved.
+        binary : bool
+            Whether to write raw bytes whatever the file extension.
+        size : Optional[int]
+            The expected length in bytes of binary data, used to pre-size a memory mapped output.
+        text : bool
+            Whether to write UTF-8 text whatever the file extension, keeping its line endings.
+
+        Returns
+        -------
+        None
+        """
+
+        try:
+            file_extension = path.split('.')[-1].lower()
+            encoding = newline = None
+
+            if binary or (file_extension == "bin" and not text):
+                mode = "wb"
+
+            elif text:
+                mode, encoding, newline = 'w', "utf-8", ''
+
+            elif file_extension == "txt":
+                mode = 'w'
+
+            else:
+                raise FileTypeError()
+
+            if size is not None and mode == "wb":
+                writer = MappedWriter(path, size)
+            else:
+                writer = open(path, mode, encoding=encoding, newline=newline)
+
+            try:
+                with writer as file:
+                    for chunk in chunks:
+                        file.write(chunk)
+
+            except BaseException as e:
+                os.remove(path)
+                raise e
+
+        except Exception as e:
+            raise e
+
+    @staticmethod
+    @contextmanager
+    def map_file(path:str) -> Iterator[memoryview]:
+        """ Maps a specified file into memory for reading, so that it can be processed as a zero-copy memoryview 
+        instead of being loaded.
+
+        Parameters
+        ----------
+        path : str
+            Text string to represents a path to the file to map.
+
+        Returns
+        -------
+        Iterator[memoryview]
+            A context manager giving a read-only view of the file.
+        """
+
+        if not os.path.exists(path):
+            raise FileNotFoundError()
+
+        with open(path, "rb") as file:
+            # Empty files cannot be mapped.
+            if os.fstat(file.fileno()).st_size == 0:
+                yield memoryview(b'')
+                return
+
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                yield view
+
+            finally:
+                # Slices still referenced elsewhere, e.g. by a traceback, keep the map alive until they are collected.
+                try:
+                    view.release()
+                    mapped.close()
+                except BufferError:
+                    pass
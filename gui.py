@@ -1,10 +1,10 @@
-import os, logging, sys
+import copy, os, logging, queue, sys, threading, time
 from typing import Optional
 import tkinter as tk
 from tkinter import messagebox, ttk
 
-from encoders import Huffman, EncoderNoneError
-from encoder_interfaces import EncoderFileInterface
+from encoders import ContextHuffman, Huffman, EncoderNoneError
+from encoder_interfaces import EncoderFileInterface, JobCancelledError
 from file_operator import FileOperator, FileTypeError, PathNoneError
 
 
@@ -33,6 +33,20 @@ class EncoderGUI():
         The listbox to display the characters of the encoding.
     info : tk.Label
         The label to display the character information.
+    job_queue : queue.Queue
+        The pending jobs, each a kind, an interface to a copy of the encoder, a source and a target path.
+    job_results : queue.Queue
+        The finished jobs and their errors, reported by the worker thread.
+    current_job : Optional[tuple]
+        The job run by the worker thread.
+    progress : tuple
+        The characters or bytes processed by the current job, its total and its start time.
+    cancel_event : threading.Event
+        Cancels the current job at its next chunk once set.
+    shutdown_event : threading.Event
+        Stops the worker thread before its next job once set, dropping the pending jobs.
+    worker : threading.Thread
+        The thread running the jobs, so that the window stays responsive.
     
     Methods
     -------
@@ -64,8 +78,24 @@ class EncoderGUI():
         Handles event calls for the compression of a file.
     extract_handler() -> None
         Handles event calls for the extraction of a file.
+    queue_job(kind:str, file_path:str, save_path:str) -> None
+        Queues a compression or extraction for the worker thread.
+    cancel_handler() -> None
+        Handles event calls for the cancellation of the current job.
+    poll_jobs_handler() -> None
+        Reports the progress and results of the jobs, polled from the main thread.
+    report_job(kind:str, file_path:str, error:Optional[Exception]) -> None
+        Shows the result of a finished job.
+    update_jobs() -> None
+        Updates the progress and queue of the jobs.
+    job_menu() -> None
+        Sets all the widgets for the progress and queue of the jobs.
+    run_jobs() -> None
+        Runs the queued jobs one after the other, in the worker thread.
     display_character_info_handler(event:tk.Event) -> None
         Updates the character information frame of the statistics window when selecting a specific character.
+    stats_encoder() -> Optional[Huffman]
+        Returns the encoder whose codes are displayed by the statistics window.
     reset_menu() -> None
         Resets entries to all menus to none.
     run() -> None
@@ -73,6 +103,9 @@ class EncoderGUI():
     
     """
 
+    # Milliseconds between two updates of the job progress.
+    POLL_INTERVAL = 100
+
     def __init__(self, encoder:Huffman):
         """ Initialises the GUI for the encoder.
         
@@ -108,7 +141,7 @@ class EncoderGUI():
             self.save_name = tk.StringVar(self.root, "None")
             try:
                 current_folder = os.path.dirname(os.path.abspath(__file__))
-                default_path = os.path.join(current_folder, "saves", "default.json")
+                default_path = os.path.join(current_folder, "saves", "default.huf")
                 save_name = self.file_manager.open_encoder(default_path)
                 self.save_name.set(save_name)
             
@@ -136,6 +169,19 @@ class EncoderGUI():
             self.top_menu()
             self.compression_menu()
             self.extraction_menu()
+            self.job_menu()
+
+            # Jobs run in a worker thread, which Tk widgets must not be touched from: its progress and results are
+            # polled from the main thread.
+            self.job_queue = queue.Queue()
+            self.job_results = queue.Queue()
+            self.current_job = None
+            self.progress = (0, 0, 0.0)
+            self.cancel_event = threading.Event()
+            self.shutdown_event = threading.Event()
+            self.worker = threading.Thread(target=self.run_jobs, daemon=True)
+            self.worker.start()
+            self.root.after(self.POLL_INTERVAL, self.poll_jobs_handler)
 
             # Setting up logging.
             try:
@@ -242,7 +288,7 @@ class EncoderGUI():
             file_path_entry = tk.Entry(compression_tab, textvariable=self.compression_file_path, width=50)
             file_path_entry.config(state="readonly")
 
-            browse_file_button = tk.Button(compression_tab, text="Select File", command=lambda: self.compression_file_path.set(self.browse_files_handler(filetypes=[("Text Files", "*.txt")])))
+            browse_file_button = tk.Button(compression_tab, text="Select File", command=lambda: self.compression_file_path.set(self.browse_files_handler(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])))
 
             
             # COMPRESSION FOLDER ENTRY AND BROWSER
@@ -307,7 +353,7 @@ class EncoderGUI():
             save_path_entry.config(state="readonly")
 
             defaultname = os.path.splitext(os.path.basename(self.extraction_file_path.get()))[0]
-            browse_save_button = tk.Button(extraction_tab, text="Save As", command=lambda: self.extraction_target_path.set(self.browse_saves_handler(filetypes=[("Text Files", "*.txt")], 
+            browse_save_button = tk.Button(extraction_tab, text="Save As", command=lambda: self.extraction_target_path.set(self.browse_saves_handler(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")], 
                                                                                                                      defaultextension=".txt", 
                                                                                                                      defaultname=defaultname)))
             
@@ -327,6 +373,42 @@ class EncoderGUI():
             messagebox.showerror(title="Error", message="The UI error occured. Please see log files for details.")
             logging.error(msg=str(e), exc_info=True)
 
+    def job_menu(self) -> None:
+        """ Sets all the widgets for the progress of the current job and the queue of pending jobs, below the tabs.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        try:
+            job_frame = tk.Frame(self.root)
+            job_frame.pack(fill='x', padx=10, pady=10)
+
+            # PROGRESS OF THE CURRENT JOB
+            self.job_label = tk.Label(job_frame, text="No job running", anchor="w")
+            self.job_progress = ttk.Progressbar(job_frame, mode="determinate", maximum=1.0)
+            self.cancel_button = tk.Button(job_frame, text="Cancel", command=self.cancel_handler, state="disabled")
+
+            # PENDING JOBS
+            queue_label = tk.Label(job_frame, text="Queue", anchor="w")
+            self.job_listbox = tk.Listbox(job_frame, height=4)
+
+            self.job_label.grid(row=0, column=0, sticky="we")
+            self.job_progress.grid(row=1, column=0, sticky="we", pady=5)
+            self.cancel_button.grid(row=1, column=1, padx=10)
+            queue_label.grid(row=2, column=0, sticky="we")
+            self.job_listbox.grid(row=3, column=0, columnspan=2, sticky="we")
+            job_frame.columnconfigure(0, weight=1)
+
+        except Exception as e:
+            messagebox.showerror(title="Error", message="An UI error occured. Please see log files for details.")
+            logging.error(msg=str(e), exc_info=True)
+
 
 
     # ***** SETTINGS MENUS *****
@@ -344,8 +426,9 @@ class EncoderGUI():
         """
 
         try:
-            # Displaying the stats and encoding.
-            if self.file_manager.encoder.char_to_bin_index == None:
+            # Displaying the stats and encoding. Context encoders display their order-0 table.
+            encoder = self.stats_encoder()
+            if encoder is None or encoder.char_to_bin_index == None:
                 messagebox.showinfo(title="Information", 
                                     message="No encoder detected. Please open or create an encoder to see its details.")
                 return None
@@ -363,7 +446,7 @@ class EncoderGUI():
                 self.listbox = tk.Listbox(left_frame, height=15, selectmode=tk.SINGLE)
                 self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-                items = [i for i in list(self.file_manager.encoder.char_to_bin_index.keys())]
+                items = [i for i in list(encoder.char_to_bin_index.keys())]
                 for i in items:
                     self.listbox.insert(tk.END, i)
 
@@ -442,7 +525,7 @@ class EncoderGUI():
         None
         """
 
-        if self.save_name.get() == "untitled.json*":
+        if self.save_name.get() == "untitled.huf*":
             save_changes = tk.messagebox.askyesnocancel("Save Encoder", "Do you want to save the encoder before exiting? Loosing your encoder might mean you will not be able to extract any compressed file.")
 
             if save_changes is None:
@@ -595,12 +678,7 @@ class EncoderGUI():
         None
         """
         try:
-            self.file_manager.compress(self.compression_file_path.get(), self.compression_target_path.get())
-            self.reset_menu()
-            messagebox.showinfo(title="Information", message="File successfully compressed.")
-        
-        except EncoderNoneError as e:
-            messagebox.showinfo(title="Information", message="You must open or create an encoder to compress a file. Please see the help menu for more information.")
+            self.queue_job("compress", self.compression_file_path.get(), self.compression_target_path.get())
         
         except PathNoneError as e:
             messagebox.showerror(title="Error", message="Please provide a file to compress and a save file.")
@@ -622,13 +700,7 @@ class EncoderGUI():
         """
 
         try:
-            self.file_manager.extract(self.extraction_file_path.get(), self.extraction_target_path.get())
-            self.reset_menu()
-            messagebox.showinfo(title="Information", message="File successfully extracted.")
-        
-        except EncoderNoneError as e:
-            messagebox.showinfo(title="Information", message="You must open or create the encoder that was used to compress the extracted file. Please see the help menu for more information.")
-            logging.error(msg=str(e), exc_info=True)
+            self.queue_job("extract", self.extraction_file_path.get(), self.extraction_target_path.get())
 
         except PathNoneError as e:
             messagebox.showerror(title="Error", message="Please provide a file to extract and a save file.")
@@ -637,6 +709,194 @@ class EncoderGUI():
             messagebox.showerror(title="Error", message="An error occured during extraction. Please see log files for details.")
             logging.error(msg=str(e), exc_info=True)
 
+    def queue_job(self, kind:str, file_path:str, save_path:str) -> None:
+        """ Queues a compression or extraction for the worker thread, with a copy of the current encoder so that opening
+        another encoder does not change the pending jobs.
+
+        Parameters
+        ----------
+        kind : str
+            "compress" or "extract".
+        file_path : str
+            The path to the file to process.
+        save_path : str
+            The path to the file to write.
+
+        Returns
+        -------
+        None
+        """
+
+        if not file_path or not save_path:
+            raise PathNoneError
+
+        interface = EncoderFileInterface(copy.deepcopy(self.file_manager.encoder))
+        self.job_queue.put((kind, interface, file_path, save_path))
+        self.reset_menu()
+        self.update_jobs()
+
+    def cancel_handler(self) -> None:
+        """ Handles event calls for the cancellation of the current job, which stops at its next chunk.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        self.cancel_event.set()
+        self.cancel_button.config(state="disabled")
+
+    def poll_jobs_handler(self) -> None:
+        """ Reports the results of the finished jobs and the progress of the current one, then polls again.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        try:
+            while True:
+                try:
+                    (kind, _, file_path, _), error = self.job_results.get_nowait()
+                except queue.Empty:
+                    break
+                self.report_job(kind, file_path, error)
+
+            self.update_jobs()
+
+        except Exception as e:
+            logging.error(msg=str(e), exc_info=True)
+
+        finally:
+            self.root.after(self.POLL_INTERVAL, self.poll_jobs_handler)
+
+    def report_job(self, kind:str, file_path:str, error:Optional[Exception]) -> None:
+        """ Shows the result of a finished job.
+
+        Parameters
+        ----------
+        kind : str
+            "compress" or "extract".
+        file_path : str
+            The path to the processed file.
+        error : Optional[Exception]
+            The error raised by the job, None if it succeeded.
+
+        Returns
+        -------
+        None
+        """
+
+        name = os.path.basename(file_path)
+
+        if error is None:
+            messagebox.showinfo(title="Information", message=f"{name} successfully {kind}ed.")
+
+        elif isinstance(error, JobCancelledError):
+            messagebox.showinfo(title="Information", message=f"The {'compression' if kind == 'compress' else 'extraction'} of {name} was cancelled.")
+
+        elif isinstance(error, EncoderNoneError):
+            if kind == "compress":
+                messagebox.showinfo(title="Information", message="You must open or create an encoder to compress a file. Please see the help menu for more information.")
+            else:
+                messagebox.showinfo(title="Information", message="You must open or create the encoder that was used to compress the extracted file. Please see the help menu for more information.")
+                logging.error(msg=str(error), exc_info=error)
+
+        else:
+            messagebox.showerror(title="Error", message=f"An error occured during {'compression' if kind == 'compress' else 'extraction'}. Please see log files for details.")
+            logging.error(msg=str(error), exc_info=error)
+
+    def update_jobs(self) -> None:
+        """ Updates the progress bar, the throughput and remaining time of the current job, and the queue of jobs.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        job = self.current_job
+        if job is None:
+            self.job_label.config(text="No job running")
+            self.job_progress.config(value=0)
+            self.cancel_button.config(state="disabled")
+
+        else:
+            kind, _, file_path, _ = job
+            done, total, start = self.progress
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            speed = done / elapsed
+            eta = f"{(total - done) / speed:.0f} s" if speed else "unknown"
+            self.job_label.config(text=f"{kind.capitalize()} {os.path.basename(file_path)}: {done / 1e6:.2f} / "
+                                       f"{total / 1e6:.2f} MB, {speed / 1e6:.2f} MB/s, ETA {eta}")
+            self.job_progress.config(value=done / total if total else 0)
+            if not self.cancel_event.is_set():
+                self.cancel_button.config(state="normal")
+
+        # Pending jobs, read without taking them off the queue.
+        jobs = [("Running", job)] + [("Pending", pending) for pending in list(self.job_queue.queue)]
+        items = [f"{state}: {pending[0]} {os.path.basename(pending[2])}" for state, pending in jobs if pending is not None]
+        if list(self.job_listbox.get(0, tk.END)) != items:
+            self.job_listbox.delete(0, tk.END)
+            for item in items:
+                self.job_listbox.insert(tk.END, item)
+
+    def run_jobs(self) -> None:
+        """ Runs the queued jobs one after the other until a None job is queued or the application shuts down. Runs in 
+        the worker thread, reporting through the progress attribute and the results queue only.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        while True:
+            job = self.job_queue.get()
+            if job is None:
+                return
+
+            kind, interface, file_path, save_path = job
+            self.cancel_event.clear()
+
+            # Checked once the cancellation is cleared, so that a shutdown either stops here or cancels the job.
+            if self.shutdown_event.is_set():
+                return
+
+            start = time.perf_counter()
+            self.progress = (0, 0, start)
+            self.current_job = job
+
+            def progress(done:int, total:int) -> None:
+                self.progress = (done, total, start)
+
+            try:
+                if kind == "compress":
+                    interface.compress(file_path, save_path, progress=progress, cancel=self.cancel_event)
+                else:
+                    interface.extract(file_path, save_path, progress=progress, cancel=self.cancel_event)
+                error = None
+
+            except Exception as e:
+                error = e
+
+            self.current_job = None
+            self.job_results.put((job, error))
+
     def display_character_info_handler(self, event:tk.Event) -> None:
         """ Updates the character information frame of the statistics window when selecting a specific character.
 
@@ -658,9 +918,10 @@ class EncoderGUI():
                 return None
 
             # Get the data.
-            char = self.listbox.get(selection[0])
-            percentage = self.file_manager.encoder.char_percentages[char]
-            binary = self.file_manager.encoder.char_to_bin_index[char]
+            encoder = self.stats_encoder()
+            char = list(encoder.char_to_bin_index.keys())[selection[0]]
+            percentage = encoder.char_percentages.get(char, "Unknown")
+            binary = encoder.char_to_bin_index[char]
 
             # Update the displayed string text.
             self.info.config(text=f"Character: {char}\n Percentage of appearance: {percentage}\nBinary Encoding: {binary}")
@@ -670,6 +931,26 @@ class EncoderGUI():
                                  message="An UI error occured. Please see log files for more details.")
             logging.error(msg=str(e), exc_info=True)
 
+    def stats_encoder(self) -> Optional[Huffman]:
+        """ Returns the encoder whose codes are displayed by the statistics window: the current encoder, or the order-0 
+        table of a context encoder. Adaptive encoders have no fixed codes to display.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Optional[Huffman]
+            The encoder to display, None if there is none.
+        """
+
+        encoder = self.file_manager.encoder
+        if isinstance(encoder, ContextHuffman):
+            encoder = encoder.order0
+
+        return encoder if isinstance(encoder, Huffman) else None
+
     def reset_menu(self) -> None:
         """ Resets entries to all menus to none.  
 
@@ -700,3 +981,10 @@ class EncoderGUI():
 
     def run(self):
         self.root.mainloop()
+
+        # Drop the pending jobs and cancel the current one once the window is closed. The worker is waited for, so 
+        # that the cancelled job removes its partial output before the process exits.
+        self.shutdown_event.set()
+        self.cancel_event.set()
+        self.job_queue.put(None)
+        self.worker.join()
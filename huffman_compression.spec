@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets/icon.ico', 'assets'), ('saves/default.json', 'saves'), ('assets/help.txt', 'assets'), ('logs/error.log', 'logs')],
+    datas=[('assets/icon.ico', 'assets'), ('saves/default.json', 'saves'), ('saves/default.huf', 'saves'), ('assets/help.txt', 'assets'), ('logs/error.log', 'logs')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
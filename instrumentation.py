@@ -0,0 +1,443 @@
+import logging, time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+
+# Stages of the compression and extraction pipelines, in the order their events are emitted.
+#   load: reading the input file, in characters or bytes read.
+#   histogram: counting the symbols of the file, in characters or bytes counted.
+#   tree: building the code tables, in symbols coded. It includes the histogram when an encoder is trained from a
+#   whole file at once.
+#   encode: packing the symbols of every block into bits, in characters or bytes encoded.
+#   pack: framing the blocks into a container, in bytes of container.
+#   decode: unpacking the blocks of a container, in characters or bytes decoded.
+#   write: writing the output file, in bytes or characters written.
+STAGES = ("load", "histogram", "tree", "encode", "pack", "decode", "write")
+
+@dataclass
+class StageEvent:
+    """ Dataclass to represent the time spent and the data processed by a stage of a job.
+
+    Attributes
+    ----------
+    job : str
+        The kind of job, "train", "compress" or "extract".
+    path : Optional[str]
+        The path to the file processed by the job, None for streams.
+    stage : str
+        The stage, one of STAGES.
+    seconds : float
+        The time spent in the stage, excluding the time spent in the stages it pulls its input from.
+    size : int
+        The characters or bytes processed by the stage.
+    """
+
+    job: str
+    path: Optional[str]
+    stage: str
+    seconds: float
+    size: int
+
+class Profile:
+    """ Class to time the stages of a single job and count the data they process. Stages run as a pipeline of nested
+    iterators, so the time of each stage excludes the time spent in the stages it pulls from.
+
+    Attributes
+    ----------
+    job : str
+        The kind of job.
+    path : Optional[str]
+        The path to the file processed by the job.
+    seconds : Dict[str, float]
+        The time spent in each stage.
+    sizes : Dict[str, int]
+        The characters or bytes processed by each stage.
+
+    Methods
+    -------
+    stage(name:str) -> ContextManager
+        Times the code run in a context as a stage.
+    timed(name:str, chunks:Iterable, size:Callable = len) -> Iterator
+        Times the production of each chunk of an iterable as a stage.
+    add(name:str, size:int) -> None
+        Counts data processed by a stage.
+    size(name:str) -> int
+        Returns the data processed by a stage.
+    finish() -> None
+        Emits an event for every stage run.
+    """
+
+    def __init__(self, instrumentation:"Instrumentation", job:str, path:Optional[str] = None):
+        """ Initializes the Profile class.
+
+        Parameters
+        ----------
+        instrumentation : Instrumentation
+            The instrumentation to emit the events through.
+        job : str
+            The kind of job.
+        path : Optional[str]
+            The path to the file processed by the job.
+
+        Returns
+        -------
+        None
+        """
+
+        self.instrumentation = instrumentation
+        self.job = job
+        self.path = path
+        self.seconds = {}
+        self.sizes = {}
+        self._stack = []
+        self._mark = time.perf_counter()
+
+    def _enter(self, name:str) -> None:
+        """ Charges the time since the last switch to the current stage, then switches to a nested stage.
+        """
+
+        now = time.perf_counter()
+        if self._stack:
+            self.seconds[self._stack[-1]] += now - self._mark
+        self._stack.append(name)
+        self.seconds.setdefault(name, 0.0)
+        self.sizes.setdefault(name, 0)
+        self._mark = now
+
+    def _exit(self) -> None:
+        """ Charges the time since the last switch to the current stage, then switches back to the stage it is nested in.
+        """
+
+        now = time.perf_counter()
+        self.seconds[self._stack.pop()] += now - self._mark
+        self._mark = now
+
+    def stage(self, name:str) -> "_Stage":
+        """ Times the code run in a context as a stage.
+
+        Parameters
+        ----------
+        name : str
+            The stage.
+
+        Returns
+        -------
+        ContextManager
+            The context of the stage.
+        """
+
+        return _Stage(self, name)
+
+    def timed(self, name:str, chunks:Iterable, size:Callable = len) -> Iterator:
+        """ Times the production of each chunk of an iterable as a stage.
+
+        Parameters
+        ----------
+        name : str
+            The stage.
+        chunks : Iterable
+            The chunks produced by the stage.
+        size : Callable
+            Returns the characters or bytes of a chunk.
+
+        Returns
+        -------
+        Iterator
+            The chunks.
+        """
+
+        iterator = iter(chunks)
+        while True:
+            self._enter(name)
+            try:
+                chunk = next(iterator)
+
+            except StopIteration:
+                return
+
+            finally:
+                self._exit()
+
+            self.sizes[name] += size(chunk)
+            yield chunk
+
+    def add(self, name:str, size:int) -> None:
+        """ Counts data processed by a stage.
+
+        Parameters
+        ----------
+        name : str
+            The stage.
+        size : int
+            The characters or bytes processed.
+
+        Returns
+        -------
+        None
+        """
+
+        self.seconds.setdefault(name, 0.0)
+        self.sizes[name] = self.sizes.get(name, 0) + size
+
+    def size(self, name:str) -> int:
+        """ Returns the characters or bytes processed by a stage so far.
+
+        Parameters
+        ----------
+        name : str
+            The stage.
+
+        Returns
+        -------
+        int
+            The characters or bytes processed.
+        """
+
+        return self.sizes.get(name, 0)
+
+    def finish(self) -> None:
+        """ Emits an event for every stage run, in pipeline order.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        for name in sorted(self.seconds, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES)):
+            self.instrumentation.emit(StageEvent(self.job, self.path, name, self.seconds[name], self.sizes.get(name, 0)))
+
+class _Stage:
+    """ Context of a stage of a profile.
+    """
+
+    def __init__(self, profile:Profile, name:str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.profile._enter(self.name)
+        return self
+
+    def __exit__(self, *args):
+        self.profile._exit()
+
+class _DisabledProfile:
+    """ Profile returned while no listener is registered, doing nothing so that uninstrumented jobs run at full speed.
+    """
+
+    _context = nullcontext()
+
+    def stage(self, name:str) -> nullcontext:
+        return self._context
+
+    def timed(self, name:str, chunks:Iterable, size:Callable = len) -> Iterable:
+        return chunks
+
+    def add(self, name:str, size:int) -> None:
+        pass
+
+    def size(self, name:str) -> int:
+        return 0
+
+    def finish(self) -> None:
+        pass
+
+DISABLED_PROFILE = _DisabledProfile()
+
+class Instrumentation:
+    """ Class to dispatch the stage events of jobs to listeners. Jobs are only timed while a listener is registered.
+
+    Attributes
+    ----------
+    listeners : tuple
+        The callables the events are passed to.
+
+    Methods
+    -------
+    add_listener(listener:Callable[[StageEvent], None]) -> None
+        Registers a listener.
+    remove_listener(listener:Callable[[StageEvent], None]) -> None
+        Unregisters a listener.
+    enabled -> bool
+        Whether any listener is registered.
+    profile(job:str, path:Optional[str] = None) -> Profile
+        Returns the profile of a new job.
+    emit(event:StageEvent) -> None
+        Passes an event to every listener.
+    """
+
+    def __init__(self):
+        """ Initializes the Instrumentation class.
+        """
+
+        # Replaced rather than modified, so that jobs running in other threads can emit while listeners change.
+        self.listeners = ()
+
+    def add_listener(self, listener:Callable[[StageEvent], None]) -> None:
+        """ Registers a listener, called with every event of the jobs started from now on.
+
+        Parameters
+        ----------
+        listener : Callable[[StageEvent], None]
+            The listener, e.g. a LoggingListener or a StageTotals.
+
+        Returns
+        -------
+        None
+        """
+
+        self.listeners = self.listeners + (listener,)
+
+    def remove_listener(self, listener:Callable[[StageEvent], None]) -> None:
+        """ Unregisters a listener.
+
+        Parameters
+        ----------
+        listener : Callable[[StageEvent], None]
+            The listener.
+
+        Returns
+        -------
+        None
+        """
+
+        self.listeners = tuple(registered for registered in self.listeners if registered is not listener)
+
+    @property
+    def enabled(self) -> bool:
+        """ Whether any listener is registered.
+        """
+        return bool(self.listeners)
+
+    def profile(self, job:str, path:Optional[str] = None) -> Profile:
+        """ Returns the profile of a new job, or a profile doing nothing while no listener is registered.
+
+        Parameters
+        ----------
+        job : str
+            The kind of job.
+        path : Optional[str]
+            The path to the file processed by the job.
+
+        Returns
+        -------
+        Profile
+            The profile of the job.
+        """
+
+        if not self.listeners:
+            return DISABLED_PROFILE
+
+        return Profile(self, job, path)
+
+    def emit(self, event:StageEvent) -> None:
+        """ Passes an event to every listener.
+
+        Parameters
+        ----------
+        event : StageEvent
+            The event.
+
+        Returns
+        -------
+        None
+        """
+
+        for listener in self.listeners:
+            listener(event)
+
+class LoggingListener:
+    """ Class to log stage events, with their fields attached to the log records as an "event" dictionary for
+    structured handlers.
+
+    Attributes
+    ----------
+    logger : logging.Logger
+        The logger of the events.
+    level : int
+        The level of the events.
+
+    Methods
+    -------
+    None
+    """
+
+    def __init__(self, logger:Optional[logging.Logger] = None, level:int = logging.INFO):
+        """ Initializes the LoggingListener class.
+
+        Parameters
+        ----------
+        logger : Optional[logging.Logger]
+            The logger of the events, by default the "instrumentation" logger.
+        level : int
+            The level of the events.
+
+        Returns
+        -------
+        None
+        """
+
+        self.logger = logger or logging.getLogger("instrumentation")
+        self.level = level
+
+    def __call__(self, event:StageEvent) -> None:
+        self.logger.log(self.level, "%s %s %s: %.6f s, %d", event.job, event.path or '-', event.stage, event.seconds,
+                        event.size, extra={"event": asdict(event)})
+
+class StageTotals:
+    """ Class to sum the stage events of jobs, e.g. to report where the time of a batch went.
+
+    Attributes
+    ----------
+    seconds : Dict[str, float]
+        The time spent in each stage.
+    sizes : Dict[str, int]
+        The characters or bytes processed by each stage.
+
+    Methods
+    -------
+    report() -> str
+        Formats the totals as a table.
+    """
+
+    def __init__(self):
+        """ Initializes the StageTotals class.
+        """
+
+        self.seconds = {}
+        self.sizes = {}
+
+    def __call__(self, event:StageEvent) -> None:
+        self.seconds[event.stage] = self.seconds.get(event.stage, 0.0) + event.seconds
+        self.sizes[event.stage] = self.sizes.get(event.stage, 0) + event.size
+
+    def report(self) -> str:
+        """ Formats the totals as a table, a line per stage with its time, share of the total time, data processed and
+        throughput.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            The table.
+        """
+
+        total = sum(self.seconds.values()) or 1e-9
+        lines = []
+        for stage in sorted(self.seconds, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES)):
+            seconds, size = self.seconds[stage], self.sizes[stage]
+            throughput = f"{size / seconds / 1e6:8.2f} MB/s" if seconds else "       - MB/s"
+            lines.append(f"{stage:<10} {seconds * 1e3:10.2f} ms {seconds / total:7.1%} {size / 1e6:10.2f} MB {throughput}")
+
+        return '\n'.join(lines)
+
+# Instrumentation of the encoder interfaces, unless they are given their own.
+INSTRUMENTATION = Instrumentation()
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional
 
 @dataclass
 class Node():
@@ -7,9 +7,8 @@ class Node():
     """
 
     binary_id: Optional[bool] = field(default=None, init=False)
-    chars:List[str] = field(default_factory=list, init=False)
 
-    probability: float = field(default=0.0)
+    weight: int = field(default=0)
 
 @dataclass
 class Leaf(Node):
@@ -18,9 +17,6 @@ class Leaf(Node):
 
     char:Optional[str] = None
 
-    def __post_init__(self):
-        self.chars = [self.char]
-
 
 @dataclass
 class Inner(Node):
@@ -33,8 +29,7 @@ class Inner(Node):
     def __post_init__(self):
 
         if self.first_child_node and self.second_child_node:
-            self.probability = self.first_child_node.probability + self.second_child_node.probability
-            self.chars = self.first_child_node.chars + self.second_child_node.chars
+            self.weight = self.first_child_node.weight + self.second_child_node.weight
             self.first_child_node.binary_id = 0
             self.second_child_node.binary_id = 1
 
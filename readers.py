@@ -0,0 +1,259 @@
+import bisect, io
+from typing import Optional, Union
+
+from container import ContainerFormatError, ContainerReader
+from encoders import Encoder, load_encoder
+from registry import EncoderRegistry
+
+class HuffmanReader(io.RawIOBase):
+    """ Class to read any range of a compressed container without decoding the whole file.
+
+    The block index of the container is used as a sparse checkpoint index mapping uncompressed offsets to block
+    offsets: a read jumps to the block holding its start and only decodes up to its end. The last decoded block is
+    kept so that sequential reads, e.g. through io.BufferedReader, do not decode a block twice. Positions count
+    symbols, i.e. bytes for byte alphabets and characters for text alphabets, where they only match byte positions for
+    ASCII text.
+
+    Attributes
+    ----------
+    encoder : Encoder
+        The encoder that produced the container, built from the code embedded in its header if any.
+    length : int
+        The original length in symbols.
+    blocks : List[Block]
+        The index entries of the container blocks.
+    position : int
+        The current position in symbols.
+
+    Methods
+    -------
+    read_range(offset:int, length:int) -> Union[str, bytes]
+        Reads a range of the original file.
+    readinto(buffer) -> int
+        Reads from the current position into a writable buffer.
+    seek(offset:int, whence:int = io.SEEK_SET) -> int
+        Changes the current position.
+    tell() -> int
+        Returns the current position.
+    """
+
+    def __init__(self, path:str, encoder:Optional[Encoder] = None, registry:Optional[EncoderRegistry] = None):
+        """ Initializes the HuffmanReader class and reads the container block index.
+
+        Parameters
+        ----------
+        path : str
+            The path to the container file.
+        encoder : Optional[Encoder]
+            The encoder that produced the container, only needed when no code is embedded in its header.
+        registry : Optional[EncoderRegistry]
+            The cache of built encoders to take the embedded code from, if any.
+
+        Returns
+        -------
+        None
+        """
+
+        super().__init__()
+        self.file = open(path, "rb")
+
+        try:
+            self.container = ContainerReader(self.file)
+            if not self.container.table:
+                self.encoder = encoder
+            elif registry is not None:
+                self.encoder = registry.load(self.container.table)
+            else:
+                self.encoder = load_encoder(self.container.table)
+
+            if self.encoder is None or self.container.fingerprint != self.encoder.fingerprint():
+                raise ContainerFormatError("The compressed file was produced by another encoder.")
+
+            self.length, self.blocks = self.container.read_index()
+
+        except Exception as e:
+            self.file.close()
+            raise e
+
+        self.symbol_offsets = [block.symbol_offset for block in self.blocks]
+        self.position = 0
+
+        self._cached_index = None
+        self._cached_payload = None
+        self._cached_symbols = None
+
+    def readable(self) -> bool:
+        """ Returns True, the reader supports reading.
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """ Returns True, the reader supports random access.
+        """
+        return True
+
+    def tell(self) -> int:
+        """ Returns the current position.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        int
+            The current position in symbols.
+        """
+
+        return self.position
+
+    def seek(self, offset:int, whence:int = io.SEEK_SET) -> int:
+        """ Changes the current position.
+
+        Parameters
+        ----------
+        offset : int
+            The offset in symbols, relative to whence.
+        whence : int
+            io.SEEK_SET, io.SEEK_CUR or io.SEEK_END.
+
+        Returns
+        -------
+        int
+            The new position in symbols.
+        """
+
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.length + offset
+        else:
+            raise ValueError(f"Invalid whence value {whence}.")
+
+        if position < 0:
+            raise ValueError("Negative seek position.")
+
+        self.position = position
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        """ Reads from the current position into a writable buffer. Text is returned UTF-8 encoded, without splitting a
+        character.
+
+        Parameters
+        ----------
+        buffer
+            A writable bytes-like object.
+
+        Returns
+        -------
+        int
+            The number of bytes written into the buffer, 0 at the end of the file.
+        """
+
+        view = memoryview(buffer).cast('B')
+        symbols = self.read_range(self.position, len(view))
+
+        if isinstance(symbols, str):
+            data = symbols.encode("utf-8")
+            # Every character takes at least one byte, so dropping the excess converges to a fitting prefix.
+            while len(data) > len(view):
+                symbols = symbols[:len(symbols) - (len(data) - len(view))]
+                data = symbols.encode("utf-8")
+        else:
+            data = symbols
+
+        view[:len(data)] = data
+        self.position += len(symbols)
+        return len(data)
+
+    def read_range(self, offset:int, length:int) -> Union[str, bytes]:
+        """ Reads a range of the original file, decoding only the blocks it overlaps and within the last one only up to
+        its end.
+
+        Parameters
+        ----------
+        offset : int
+            The position of the first symbol to read.
+        length : int
+            The number of symbols to read.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The symbols read, fewer than length at the end of the file.
+        """
+
+        if self.closed:
+            raise ValueError("I/O operation on closed reader.")
+
+        end = min(offset + length, self.length)
+        parts = []
+
+        while offset < end:
+            index = bisect.bisect_right(self.symbol_offsets, offset) - 1
+            block = self.blocks[index]
+
+            start = offset - block.symbol_offset
+            stop = min(end - block.symbol_offset, block.symbol_count)
+            parts.append(self._decode_block(index, stop)[start:stop])
+            offset = block.symbol_offset + stop
+
+        # Joining no symbols gives the empty string or bytes of the alphabet.
+        return self.encoder.join([]).join(parts)
+
+    def _decode_block(self, index:int, stop:int) -> Union[str, bytes]:
+        """ Decodes a block at least up to a given symbol, reusing the last decoded block. When the same block is read
+        further, the decoded prefix at least doubles so that sequential reads stay linear.
+
+        Parameters
+        ----------
+        index : int
+            The index of the block.
+        stop : int
+            The number of symbols needed from the start of the block.
+
+        Returns
+        -------
+        Union[str, bytes]
+            The decoded start of the block.
+        """
+
+        block = self.blocks[index]
+
+        if self._cached_index == index:
+            if len(self._cached_symbols) >= stop:
+                return self._cached_symbols
+            count = min(block.symbol_count, max(stop, 2 * len(self._cached_symbols)))
+
+        else:
+            self._cached_index = None
+            self._cached_payload = self.container.read_block(block)
+            count = stop
+
+        # Token alphabets may decode past the count, up to the end of the last token.
+        symbols = self.encoder.join(self.encoder.unpack(self._cached_payload, count))
+        if len(symbols) < count:
+            raise ContainerFormatError("A compressed block holds fewer symbols than recorded.")
+
+        self._cached_index = index
+        self._cached_symbols = symbols
+        return self._cached_symbols
+
+    def close(self) -> None:
+        """ Closes the reader and its container file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        if not self.closed:
+            self.file.close()
+        super().close()
@@ -0,0 +1,256 @@
+import hashlib, json, sys, threading, time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from encoders import Encoder, Huffman, load_encoder
+
+@dataclass
+class RegistryStats:
+    """ Dataclass to represent the usage of an encoder registry.
+
+    Attributes
+    ----------
+    hits : int
+        The number of encoders found in the registry.
+    misses : int
+        The number of encoders built because they were not in the registry.
+    evictions : int
+        The number of encoders dropped to stay within the memory budget.
+    build_seconds : float
+        The time spent building the tables of the missed encoders.
+    entries : int
+        The number of encoders held.
+    memory : int
+        The estimated memory held by the encoders, in bytes.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    build_seconds: float = 0.0
+    entries: int = 0
+    memory: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ The share of lookups found in the registry.
+        """
+        return self.hits / max(self.hits + self.misses, 1)
+
+class EncoderRegistry:
+    """ Class to cache built encoders in process, keyed by a fingerprint of their code lengths, so that switching
+    between known encoders skips parsing and table construction. The least recently used encoders are evicted once the
+    estimated memory of the cached tables exceeds a budget. Lookups are thread-safe.
+
+    Encoders returned by the registry are shared between callers and must not be modified.
+
+    Attributes
+    ----------
+    max_memory : int
+        The memory budget in bytes. The last encoder added is always kept, even above the budget.
+
+    Methods
+    -------
+    key(data:bytes) -> bytes
+        Computes the fingerprint of serialized code lengths.
+    get(key:bytes, build:Callable[[], Encoder]) -> Encoder
+        Returns a cached encoder, building it on a miss.
+    load(data:bytes) -> Encoder
+        Returns the encoder of serialized code lengths.
+    load_json(data:list) -> Encoder
+        Returns the encoder of a legacy json save.
+    stats() -> RegistryStats
+        Returns the usage of the registry.
+    clear() -> None
+        Drops every cached encoder.
+    measure(encoder:Encoder) -> int
+        Estimates the memory held by an encoder.
+    """
+
+    # Default memory budget.
+    MAX_MEMORY = 64 << 20
+
+    def __init__(self, max_memory:int = MAX_MEMORY):
+        """ Initializes the EncoderRegistry class.
+
+        Parameters
+        ----------
+        max_memory : int
+            The memory budget in bytes.
+
+        Returns
+        -------
+        None
+        """
+
+        self.max_memory = max_memory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = RegistryStats()
+
+    @staticmethod
+    def key(data:bytes) -> bytes:
+        """ Computes the fingerprint of serialized code lengths, which identify an encoder.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        bytes
+            The first 8 bytes of the SHA-256 digest of the data.
+        """
+
+        return hashlib.sha256(data).digest()[:8]
+
+    def get(self, key:bytes, build:Callable[[], Encoder]) -> Encoder:
+        """ Returns the encoder cached under a key, building and caching it on a miss.
+
+        Parameters
+        ----------
+        key : bytes
+            The fingerprint of the encoder.
+        build : Callable[[], Encoder]
+            Builds the encoder on a miss.
+
+        Returns
+        -------
+        Encoder
+            The shared encoder.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry[0]
+
+            start = time.perf_counter()
+            encoder = build()
+            self._stats.build_seconds += time.perf_counter() - start
+            self._stats.misses += 1
+
+            memory = EncoderRegistry.measure(encoder)
+            self._entries[key] = (encoder, memory)
+            self._stats.memory += memory
+
+            while self._stats.memory > self.max_memory and len(self._entries) > 1:
+                _, (_, evicted_memory) = self._entries.popitem(last=False)
+                self._stats.memory -= evicted_memory
+                self._stats.evictions += 1
+
+            return encoder
+
+    def load(self, data:bytes) -> Encoder:
+        """ Returns the encoder of serialized code lengths, in any of the compact binary encoder formats.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized code lengths.
+
+        Returns
+        -------
+        Encoder
+            The shared encoder.
+        """
+
+        return self.get(EncoderRegistry.key(data), lambda: load_encoder(data))
+
+    def load_json(self, data:list) -> Encoder:
+        """ Returns the encoder of a legacy json save, fingerprinted by its binary index.
+
+        Parameters
+        ----------
+        data : list
+            The json save: name, binary index, reverse binary index and character percentages.
+
+        Returns
+        -------
+        Encoder
+            The shared encoder.
+        """
+
+        def build() -> Encoder:
+            encoder = Huffman()
+            encoder.char_to_bin_index = data[1]
+            encoder.bin_to_char_index = data[2]
+            encoder.char_percentages = data[3]
+            encoder.build_tables()
+            return encoder
+
+        return self.get(EncoderRegistry.key(json.dumps(data[1], sort_keys=True).encode("utf-8")), build)
+
+    def stats(self) -> RegistryStats:
+        """ Returns the usage of the registry.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        RegistryStats
+            A snapshot of the counters.
+        """
+
+        with self._lock:
+            return RegistryStats(self._stats.hits, self._stats.misses, self._stats.evictions, self._stats.build_seconds,
+                                 len(self._entries), self._stats.memory)
+
+    def clear(self) -> None:
+        """ Drops every cached encoder, keeping the counters.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._stats.memory = 0
+
+    @staticmethod
+    def measure(encoder:Encoder) -> int:
+        """ Estimates the memory held by an encoder by walking its attributes, tables and the objects they hold.
+        Objects shared with other encoders, e.g. interned characters, are counted for each.
+
+        Parameters
+        ----------
+        encoder : Encoder
+            The encoder to measure.
+
+        Returns
+        -------
+        int
+            The estimated memory in bytes.
+        """
+
+        seen = set()
+        stack = [encoder]
+        memory = 0
+
+        while stack:
+            item = stack.pop()
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            memory += sys.getsizeof(item)
+
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set)):
+                stack.extend(item)
+            elif hasattr(item, "__dict__"):
+                stack.append(item.__dict__)
+
+        return memory